@@ -2,6 +2,9 @@ from __future__ import absolute_import
 
 import hashlib
 import json
+import os
+import shutil
+import tempfile
 
 
 class Cache(object):
@@ -58,3 +61,179 @@ class Cache(object):
         """Save the content of the cache to a file."""
         with open(self.cache_file, 'w') as f:
             json.dump(self.db, f)
+
+
+class ContentCache(object):
+
+    """Persistent store for values that are expensive to compute.
+
+    Values are looked up by content: the key for an entry is the complete
+    description of the inputs used to compute its value, so that entries never
+    need to be invalidated. Each entry is stored as a JSON file in a dedicated
+    directory, named after the digest of its key.
+    """
+
+    def __init__(self, cache_dir):
+        """Open a cache that stores its entries in `cache_dir`.
+
+        :param str cache_dir: Directory for cache entries. It is created the
+            first time an entry is added.
+        """
+        self.cache_dir = cache_dir
+        self.used_entries = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key):
+        if isinstance(key, unicode):
+            key = key.encode('utf-8')
+        m = hashlib.sha1()
+        m.update(key)
+        entry = '{}.json'.format(m.hexdigest())
+        self.used_entries.add(entry)
+        return os.path.join(self.cache_dir, entry)
+
+    def get(self, key):
+        """Return the value for the `key` entry, or None if there is none.
+
+        :param str key: Key for the entry to look up.
+        """
+        try:
+            with open(self._entry(key)) as f:
+                result = json.load(f)
+        except (IOError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def set(self, key, value):
+        """Store `value` in the `key` entry.
+
+        :param str key: Key for the entry to create.
+        :param value: JSON-serializable value to store.
+        """
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        # Write to a temporary file first so that concurrent readers never see
+        # an incomplete entry.
+        entry = self._entry(key)
+        fd, temp_file = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(value, f)
+        os.rename(temp_file, entry)
+
+    def prune(self):
+        """Remove all entries that were not used since this cache was opened.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for entry in os.listdir(self.cache_dir):
+            if entry not in self.used_entries:
+                os.remove(os.path.join(self.cache_dir, entry))
+
+
+class FileCache(object):
+
+    """Persistent store for sets of files that are expensive to produce.
+
+    Like for ContentCache, entries are looked up by content. Each entry is a
+    directory that contains copies of the files, named after the digest of its
+    key. Entries are never removed, so several build trees can share the same
+    cache directory.
+    """
+
+    def __init__(self, cache_dir):
+        """Open a cache that stores its entries in `cache_dir`.
+
+        :param str cache_dir: Directory for cache entries. It is created the
+            first time an entry is added.
+        """
+        self.cache_dir = cache_dir
+
+    def _entry(self, key):
+        if isinstance(key, unicode):
+            key = key.encode('utf-8')
+        m = hashlib.sha1()
+        m.update(key)
+        return os.path.join(self.cache_dir, m.hexdigest())
+
+    def restore(self, key, dest_dir):
+        """Copy the files of the `key` entry to `dest_dir`.
+
+        Return whether there was such an entry.
+
+        :param str key: Key for the entry to look up.
+        :param str dest_dir: Directory in which to copy the files.
+        :rtype: bool
+        """
+        entry = self._entry(key)
+        if not os.path.isdir(entry):
+            return False
+        for filename in os.listdir(entry):
+            shutil.copy(os.path.join(entry, filename), dest_dir)
+        return True
+
+    def store(self, key, file_paths):
+        """Create the `key` entry with copies of the `file_paths` files.
+
+        :param str key: Key for the entry to create.
+        :param list[str] file_paths: Files to store in the entry.
+        """
+        entry = self._entry(key)
+        if os.path.isdir(entry):
+            return
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        # Fill a temporary directory first so that concurrent readers never
+        # see an incomplete entry.
+        temp_dir = tempfile.mkdtemp(dir=self.cache_dir)
+        for file_path in file_paths:
+            shutil.copy(file_path, temp_dir)
+        try:
+            os.rename(temp_dir, entry)
+        except OSError:
+            # Another process created the same entry in the meantime
+            shutil.rmtree(temp_dir)
+
+
+def user_cache_dir(name):
+    """Return the path to the `name` cache directory for the current user.
+
+    This honors the XDG_CACHE_HOME environment variable and defaults to
+    ~/.cache/langkit/`name`.
+
+    :param str name: Name of the cache.
+    :rtype: str
+    """
+    root = (os.environ.get('XDG_CACHE_HOME')
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(root, 'langkit', name)
+
+
+_langkit_fingerprint = None
+
+
+def langkit_fingerprint():
+    """Return a digest of all Langkit sources and templates.
+
+    Cached values that are computed by Langkit must be invalidated when Langkit
+    itself changes: including this digest in their key takes care of this.
+
+    :rtype: str
+    """
+    global _langkit_fingerprint
+    if _langkit_fingerprint is None:
+        root_dir = os.path.dirname(os.path.abspath(__file__))
+        m = hashlib.sha1()
+        for dirpath, dirnames, filenames in os.walk(root_dir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(('.py', '.mako')):
+                    m.update(filename)
+                    with open(os.path.join(dirpath, filename), 'rb') as f:
+                        m.update(f.read())
+        _langkit_fingerprint = m.hexdigest()
+    return _langkit_fingerprint
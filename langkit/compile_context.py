@@ -36,6 +36,7 @@ from langkit.diagnostics import (
 )
 import langkit.documentation
 from langkit.expressions import PropertyDef
+from langkit.profiling import null_section
 from langkit.utils import Colors, printcol
 
 compile_ctx = None
@@ -70,15 +71,35 @@ def global_context(ctx):
     compile_ctx = old_ctx
 
 
+def write_source_file(file_path, content):
+    """
+    Helper to write a source file. If the file already exists with the same
+    content, leave it untouched so that build tools can see it did not change.
+
+    :param str file_path: Path of the file to write.
+    :param str content: The source content to write to the file.
+    :return: Whether the file was written.
+    :rtype: bool
+    """
+    try:
+        with open(file_path, "rb") as f:
+            if f.read() == content:
+                return False
+    except IOError:
+        pass
+
+    with open(file_path, "wb") as f:
+        f.write(content)
+    return True
+
+
 def write_cpp_file(file_path, source):
-    with open(file_path, "wb") as out_file:
-        if find_executable("clang-format"):
-            p = subprocess.Popen(["clang-format"], stdin=subprocess.PIPE,
-                                 stdout=out_file)
-            p.communicate(source)
-            assert p.returncode == 0
-        else:
-            out_file.write(source)
+    if find_executable("clang-format"):
+        p = subprocess.Popen(["clang-format"], stdin=subprocess.PIPE,
+                             stdout=subprocess.PIPE)
+        source, _ = p.communicate(source)
+        assert p.returncode == 0
+    write_source_file(file_path, source)
 
 
 ADA_SPEC = "spec"
@@ -103,8 +124,53 @@ def write_ada_file(out_dir, source_kind, qual_name, content):
     file_path = os.path.join(out_dir, file_name)
 
     # TODO: no tool is able to pretty-print a single Ada source file
-    with open(file_path, "wb") as out_file:
-            out_file.write(content)
+    write_source_file(file_path, content)
+
+
+_pending_renderings = []
+"""
+Rendering functions that worker processes call in `render_all`. Worker
+processes are forked after this list is filled, so they inherit it, and thus
+only indexes need to be sent to them.
+"""
+
+
+def _run_rendering(index):
+    return _pending_renderings[index]()
+
+
+def render_all(render_fns, jobs=1):
+    """
+    Call all functions in `render_fns` and return the list of their results.
+
+    If `jobs` is greater than 1, the functions are called in a pool of forked
+    processes, so they must not have any side effect that is meant to be seen
+    by the caller, and their results must be picklable. Rendering functions
+    are closures that cannot be sent to processes that are not forked, so on
+    systems without `os.fork`, they are all called in the current process.
+
+    :param list[() -> str] render_fns: Functions that render templates.
+    :param int jobs: Maximum number of processes to use.
+    :rtype: list[str]
+    """
+    global _pending_renderings
+
+    if jobs <= 1 or len(render_fns) < 2 or not hasattr(os, 'fork'):
+        return [fn() for fn in render_fns]
+
+    try:
+        import multiprocessing
+    except ImportError:
+        return [fn() for fn in render_fns]
+
+    _pending_renderings = render_fns
+    pool = multiprocessing.Pool(min(jobs, len(render_fns)))
+    try:
+        return pool.map(_run_rendering, range(len(render_fns)), 1)
+    finally:
+        pool.terminate()
+        pool.join()
+        _pending_renderings = []
 
 
 class Verbosity(object):
@@ -352,6 +418,32 @@ class CompileCtx(object):
         :type: bool
         """
 
+        self.property_cache = None
+        """
+        If not None, persistent cache for the code generated for properties.
+        It is used to avoid rendering again properties that did not change
+        since the previous run.
+
+        :type: langkit.caching.ContentCache|None
+        """
+
+        self.quex_cache = None
+        """
+        If not None, cache for the lexer sources that Quex generates. It is
+        meant to be shared between build trees, so that Quex runs only once
+        for a given lexer.
+
+        :type: langkit.caching.FileCache|None
+        """
+
+        self.profiler = None
+        """
+        If not None, object that collects time and memory measurements for
+        the various steps of code generation.
+
+        :type: langkit.profiling.PassProfiler|None
+        """
+
         self.lexer = lexer
         self.lexer.prefix = "{}_TKN_".format(self.lang_name.lower.upper())
         ":type: langkit.lexer.Lexer"
@@ -519,6 +611,74 @@ class CompileCtx(object):
         Whether to run the 2to3 field annotation pass.
         """
 
+        self.jobs = 1
+        """
+        Number of processes to use in order to render templates during code
+        emission.
+
+        :type: int
+        """
+
+        self.separate_properties = False
+        """
+        Whether to emit property bodies in child units of $.Analysis (one per
+        AST node type) rather than in the body of $.Analysis itself. This lets
+        the Ada compiler process them in parallel, and makes it recompile less
+        code when only a few properties change.
+
+        :type: bool
+        """
+
+        self.dead_code_elimination = False
+        """
+        Whether to skip code emission for private properties that nothing can
+        call, and for the array and struct types that only these properties
+        use. See CompileCtx.eliminate_dead_code.
+
+        :type: bool
+        """
+
+        self.dead_properties = []
+        """
+        List of properties that dead code elimination removed.
+
+        :type: list[PropertyDef]
+        """
+
+        self.dead_types = set()
+        """
+        Set of array and struct types that dead code elimination removed.
+
+        :type: set[langkit.compiled_types.CompiledType]
+        """
+
+        self.removed_null_checks = 0
+        """
+        Number of null checks that the generated code does not perform because
+        they cannot fail. See
+        langkit.expressions.structs.eliminate_safety_checks.
+
+        :type: int
+        """
+
+        self.removed_type_checks = 0
+        """
+        Number of node kind checks that the generated code does not perform
+        because they cannot fail. See
+        langkit.expressions.structs.eliminate_safety_checks.
+
+        :type: int
+        """
+
+        self.unbound_type_uses = set()
+        """
+        Set of array and struct types that were added to the context outside
+        of the compilation of a property. Dead code elimination must keep
+        them.
+
+        :type: set[langkit.compiled_types.CompiledType]
+        """
+
         self.template_lookup_extra_dirs = template_lookup_extra_dirs or []
 
         self.additional_source_files = []
@@ -550,7 +710,7 @@ class CompileCtx(object):
         Documentation database. Associate a Mako template for each entity to
         document in the generated library.
 
-        :type: dict[str, mako.template.Template]
+        :type: langkit.documentation.TemplateDatabase
         """
 
     def sorted_types(self, type_set):
@@ -648,14 +808,42 @@ class CompileCtx(object):
         """
 
         for pass_fn in PropertyDef.compilation_passes(compile_only):
-            for astnode in self.astnode_types:
+            # Remove dead code before rendering, so that no time is spent
+            # rendering it.
+            if (pass_fn == PropertyDef.render_property
+                    and self.dead_code_elimination):
+                errors_checkpoint()
+                with self.profile('passes', 'eliminate_dead_code'):
+                    self.eliminate_dead_code()
+
+            with self.profile('passes', pass_fn.__name__):
+                self._run_property_pass(pass_fn)
+
+        # All properties went through the cache: entries that were not used
+        # are obsolete.
+        if self.property_cache and not compile_only:
+            if self.verbosity.debug:
+                print 'Property cache: {} hits, {} misses'.format(
+                    self.property_cache.hits, self.property_cache.misses
+                )
+            self.property_cache.prune()
+
+    def _run_property_pass(self, pass_fn):
+        """
+        Run the "pass_fn" compilation pass on all properties.
+
+        :param (PropertyDef) -> None pass_fn: Compilation pass to run.
+        """
+        for astnode in self.astnode_types:
+            with self.profile('nodes', astnode.name().camel):
                 for prop in astnode.get_properties(include_inherited=False):
                     if self.verbosity.debug:
                         print 'Running {} on {}'.format(
                             pass_fn.__name__,
                             prop.qualname,
                         )
-                    with prop.diagnostic_context():
+                    with prop.diagnostic_context(), \
+                            self.profile('properties', prop.qualname):
                         pass_fn(prop)
 
                 # Env specs generate properties, and have some invariants to
@@ -665,6 +853,188 @@ class CompileCtx(object):
                         astnode.env_spec):
                     astnode.env_spec.check_properties()
 
+    def register_type_use(self, typ):
+        """
+        Record that "typ" is needed by the property that is being compiled, or
+        unconditionally if there is no such property. This is used to find the
+        types that only dead properties need.
+
+        :param langkit.compiled_types.CompiledType typ: The needed type.
+        """
+        prop = PropertyDef.get()
+        if prop:
+            prop.used_types.add(typ)
+        else:
+            self.unbound_type_uses.add(typ)
+
+    def extension_identifiers(self):
+        """
+        Return the set of all identifiers (lower-cased) that appear in files
+        from the extensions directory. This is a conservative way to know which
+        properties hand-written code may call.
+
+        :rtype: set[str]
+        """
+        result = set()
+        if not self.extensions_dir:
+            return result
+
+        identifier_re = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+        for dirpath, _, filenames in os.walk(self.extensions_dir):
+            for filename in filenames:
+                with open(path.join(dirpath, filename)) as f:
+                    result.update(ident.lower()
+                                  for ident in identifier_re.findall(f.read()))
+        return result
+
+    def eliminate_dead_code(self):
+        """
+        Remove from AST node types all properties that generated code can never
+        call, and remove from the context all array and struct types that only
+        these properties need. Removed entities are stored in
+        self.dead_properties and self.dead_types.
+
+        Properties are alive when they are reachable, in the property call
+        graph, from the following roots: public properties, internal properties
+        (used by env specs), external properties, properties used in logic
+        binders and predicates, and properties that hand-written code in the
+        extensions directory references. As dispatching properties can be
+        called through any of their base properties, all properties that
+        override each other are either all alive or all dead.
+        """
+        from langkit.compiled_types import (
+            ArrayType, LexicalEnvType, Struct, StructMetaclass, T,
+            library_public_field
+        )
+
+        all_props = [p for astnode in self.astnode_types
+                     for p in astnode.get_properties(include_inherited=False)]
+
+        # Group properties in families of properties that override each other
+        def family_root(prop):
+            base = prop.base_property()
+            while base:
+                prop, base = base, base.base_property()
+            return prop
+
+        families = {}
+        prop_family = {}
+        for p in all_props:
+            family = families.setdefault(family_root(p), [])
+            family.append(p)
+            prop_family[p] = family
+
+        ext_identifiers = self.extension_identifiers()
+        logic_props = set(p for binder in self.logic_binders for p in binder)
+
+        def is_root(prop):
+            return (library_public_field(prop)
+                    or prop.is_internal
+                    or prop.external
+                    or prop.logic_predicates
+                    or prop in logic_props
+                    or prop.name.lower in ext_identifiers)
+
+        # Compute the set of reachable properties
+        alive = set()
+        queue = [p for p in all_props if is_root(p)]
+        while queue:
+            family = prop_family.get(queue.pop())
+            if not family or family[0] in alive:
+                continue
+            alive.update(family)
+            for p in family:
+                queue.extend(p.called_properties)
+
+        self.dead_properties = [p for p in all_props if p not in alive]
+        if not self.dead_properties:
+            return
+
+        # Compute the set of types that code generation still needs: builtin
+        # ones, the ones AST node fields need, and the ones alive properties
+        # need.
+        needed_types = set()
+
+        def add_needed_type(typ):
+            if typ is None or typ in needed_types:
+                return
+            needed_types.add(typ)
+            if issubclass(typ, ArrayType):
+                add_needed_type(typ.element_type())
+            elif issubclass(typ, Struct) and not typ.is_ast_node():
+                for f in typ.get_fields():
+                    add_needed_type(f.type)
+
+        env_element = self.root_grammar_class.env_el()
+        roots = [T.root_node.array_type(), LexicalEnvType.array_type(),
+                 env_element.array_type(), env_element, self.env_metadata]
+        roots.extend(self.unbound_type_uses)
+        for astnode in self.astnode_types:
+            roots.extend(f.type for f in astnode.get_fields())
+        for p in alive:
+            roots.extend(p.used_types)
+            roots.append(p.type)
+            roots.extend(arg.type for arg in p.arguments)
+        for typ in roots:
+            add_needed_type(typ)
+
+        dead_types = set()
+        for p in self.dead_properties:
+            dead_types.update(p.used_types)
+        self.dead_types = set(
+            t for t in dead_types - needed_types
+            if t in self.array_types or t in StructMetaclass.struct_types
+        )
+
+        # Finally remove dead entities
+        for p in self.dead_properties:
+            del p.struct._fields[p._name.lower]
+        for astnode in self.astnode_types:
+            astnode._abstract_fields_dict_cache.clear()
+        self.array_types.difference_update(self.dead_types)
+        self.types.difference_update(self.dead_types)
+
+    def dead_code_report(self):
+        """
+        Return a human readable report for the properties and types that dead
+        code elimination removed.
+
+        :rtype: str
+        """
+        lines = ['Dead code elimination removed {} properties and {}'
+                 ' types'.format(len(self.dead_properties),
+                                 len(self.dead_types))]
+        lines.extend('  property {}'.format(p.qualname)
+                     for p in sorted(self.dead_properties,
+                                     key=lambda p: p.qualname))
+        lines.extend('  type {}'.format(t.name().camel)
+                     for t in self.sorted_types(self.dead_types))
+        return '\n'.join(lines)
+
+    def safety_checks_report(self):
+        """
+        Return a human readable report for the run-time checks that safety
+        check elimination removed.
+
+        :rtype: str
+        """
+        return ('Safety check elimination removed {} null checks and {} type'
+                ' checks'.format(self.removed_null_checks,
+                                 self.removed_type_checks))
+
+    def profile(self, category, name):
+        """
+        Return a context manager that measures the time and memory spent in a
+        section of code generation, if profiling is enabled.
+
+        :param str category: Kind of section. See
+            langkit.profiling.PassProfiler.CATEGORIES.
+        :param str name: Name for the section.
+        """
+        if self.profiler is None:
+            return null_section
+        return self.profiler.section(category, name)
+
     def render_template(self, *args, **kwargs):
         # Kludge: to avoid circular dependency issues, do not import parsers
         # until needed.
@@ -676,7 +1046,8 @@ class CompileCtx(object):
 
     def emit(self, file_root='.', generate_lexer=True, main_programs=set(),
              annotate_fields_types=False, compile_only=False,
-             no_property_checks=False):
+             no_property_checks=False, jobs=1, separate_properties=False,
+             quex_cache_dir=None, dead_code_elimination=False):
         """
         Generate sources for the analysis library. Also emit a tiny program
         useful for testing purposes.
@@ -696,17 +1067,39 @@ class CompileCtx(object):
             type of fields in the grammar. If this is True, this will
             actually modify the file in which ASTNode subclasses are
             defined, and annotate empty field definitions.
+
+        :param int jobs: (optional) Number of processes to use in order to
+            render the templates for the generated sources.
+
+        :param bool separate_properties: (optional) Whether to emit property
+            bodies in separate units. See CompileCtx.separate_properties.
+
+        :param str|None quex_cache_dir: (optional) Directory for the shared
+            cache of lexer sources that Quex generates. If None, always run
+            Quex when the lexer specification changed.
+
+        :param bool dead_code_elimination: (optional) Whether to skip code
+            emission for dead properties and types. See
+            CompileCtx.eliminate_dead_code.
         """
         dir_path = path.join(
             path.dirname(path.realpath(__file__)), "templates"
         )
+        # Compiling templates to Python modules takes time, so keep the result
+        # across runs.
         template_utils.template_lookup = TemplateLookup(
             directories=keep([dir_path, self.extensions_dir]
                              + self.template_lookup_extra_dirs),
-            strict_undefined=True
+            strict_undefined=True,
+            modulename_callable=template_utils.compiled_template_namer(
+                path.join(file_root, 'obj', 'mako')
+            )
         )
 
         self.no_property_checks = no_property_checks
+        self.jobs = jobs
+        self.separate_properties = separate_properties
+        self.dead_code_elimination = dead_code_elimination
 
         # Automatically add all source files in the "extensions/src" directory
         # to the generated library project.
@@ -719,6 +1112,11 @@ class CompileCtx(object):
                         self.additional_source_files.append(filepath)
 
         self.annotate_fields_types = annotate_fields_types
+        self.property_cache = caching.ContentCache(
+            path.join(file_root, 'obj', 'property_cache')
+        )
+        if quex_cache_dir:
+            self.quex_cache = caching.FileCache(quex_cache_dir)
         self.compile(compile_only=compile_only)
         if compile_only:
             return
@@ -748,23 +1146,128 @@ class CompileCtx(object):
 
         :param bool has_body: If true, generate a body for this unit.
         """
-        for kind in [ADA_SPEC] + ([ADA_BODY] if has_body else []):
-            with names.camel_with_underscores:
+        self.run_renderings(self.ada_module_renderings(
+            out_dir, template_base_name, qual_name, has_body
+        ))
+
+    def ada_module_renderings(self, out_dir, template_base_name, qual_name,
+                              has_body=True):
+        """
+        Return the renderings for an Ada module. See `write_ada_module` for the
+        meaning of parameters and `run_renderings` for the result.
+
+        :rtype: list[(() -> str, (str) -> None)]
+        """
+        def rendering(kind):
+            template_name = "{}{}_ada".format(
+                template_base_name +
+                # If the base name ends with a /, we don't put a "_"
+                # separator.
+                ("" if template_base_name.endswith("/") else "_"),
+                kind
+            )
+
+            def render():
+                with names.camel_with_underscores:
+                    return self.render_template(template_name)
+
+            def write(content):
                 write_ada_file(
                     out_dir=out_dir,
                     source_kind=kind,
                     qual_name=[self.ada_api_settings.lib_name] + qual_name,
-                    content=self.render_template(
-                        "{}{}_ada".format(
-                            template_base_name +
-                            # If the base name ends with a /, we don't
-                            # put a "_" separator.
-                            ("" if template_base_name.endswith("/") else "_"),
-                            kind
-                        ),
-                    )
+                    content=content
                 )
 
+            return (render, write)
+
+        return [rendering(kind)
+                for kind in [ADA_SPEC] + ([ADA_BODY] if has_body else [])]
+
+    def separate_property_unit_renderings(self, out_dir):
+        """
+        Return the renderings for the child units of $.Analysis that contain
+        separate bodies for properties. Also remove such units that previous
+        runs generated in "out_dir" and that are now obsolete.
+
+        :param str out_dir: The out directory for the generated units.
+        :rtype: list[(() -> str, (str) -> None)]
+        """
+        lib_name = self.ada_api_settings.lib_name
+        result = []
+        generated = set()
+
+        def rendering(kind, unit_name, astnode, props):
+            template_name = 'pkg_analysis_properties_{}_ada'.format(kind)
+            qual_name = [lib_name, 'Analysis',
+                         unit_name.camel_with_underscores]
+
+            def render():
+                with names.camel_with_underscores:
+                    return self.render_template(template_name,
+                                                unit_name=unit_name,
+                                                astnode=astnode,
+                                                props=props)
+
+            def write(content):
+                write_ada_file(out_dir, kind, qual_name, content)
+
+            generated.add('{}.{}'.format(
+                '-'.join(qual_name).lower(),
+                'ads' if kind == ADA_SPEC else 'adb'
+            ))
+            return (render, write)
+
+        for unit_name, astnode, props in self.separate_property_units():
+            for kind in (ADA_SPEC, ADA_BODY):
+                result.append(rendering(kind, unit_name, astnode, props))
+
+        # Files for units that are not generated anymore would still be part
+        # of the library project, and would not compile.
+        user_files = set(path.basename(f)
+                         for f in self.additional_source_files)
+        for filepath in glob(path.join(
+            out_dir, '{}-analysis-*_properties.ad[sb]'.format(lib_name.lower())
+        )):
+            filename = path.basename(filepath)
+            if filename not in generated and filename not in user_files:
+                os.remove(filepath)
+
+        return result
+
+    def run_renderings(self, renderings):
+        """
+        Render templates and write the results. Rendering is distributed over
+        `self.jobs` processes, but writing is always done by the current
+        process, in order.
+
+        :param list[(() -> str, (str) -> None)] renderings: List of (render,
+            write) couples. Each render function returns source code, which is
+            then passed to the corresponding write function.
+        """
+        # Measurements made in worker processes would be lost, so render in
+        # this process when profiling.
+        jobs = 1 if self.profiler else self.jobs
+        results = render_all([render for render, _ in renderings], jobs)
+        for (_, write), content in zip(renderings, results):
+            write(content)
+
+    def separate_property_units(self):
+        """
+        Return the list of child units of $.Analysis that contain separate
+        bodies for properties (see PropertyDef.has_separate_body), in the
+        order of AST node types.
+
+        :rtype: list[(names.Name, ASTNode, list[PropertyDef])]
+        """
+        result = []
+        for astnode in self.astnode_types:
+            props = [p for p in astnode.get_properties(include_inherited=False)
+                     if p.has_separate_body]
+            if props:
+                result.append((props[0].separate_unit_name, astnode, props))
+        return result
+
     @property
     def struct_types(self):
         # Here we're skipping Struct because it's not a real type in
@@ -795,6 +1298,8 @@ class CompileCtx(object):
             self._struct_types.insert(0, env_element)
             self._struct_types.insert(0, T.env_md)
 
+        if self.dead_types:
+            return [t for t in self._struct_types if t not in self.dead_types]
         return self._struct_types
 
     def _compile(self, compile_only=False):
@@ -836,7 +1341,8 @@ class CompileCtx(object):
         if self.verbosity.info:
             printcol("Compiling the grammar...", Colors.OKBLUE)
 
-        with names.camel_with_underscores:
+        with names.camel_with_underscores, \
+                self.profile('passes', 'compute_fields_types'):
             # Compute the type of fields for types used in the grammar. Also
             # register its symbol literals.
             for r_name, r in self.grammar.rules.items():
@@ -847,7 +1353,8 @@ class CompileCtx(object):
 
         # Compute type information, so that it is available for further
         # compilation stages.
-        self.compute_types()
+        with self.profile('passes', 'compute_types'):
+            self.compute_types()
         errors_checkpoint()
 
         with names.camel_with_underscores:
@@ -875,7 +1382,8 @@ class CompileCtx(object):
         if compile_only:
             return
 
-        with names.camel_with_underscores:
+        with names.camel_with_underscores, \
+                self.profile('passes', 'compile_parsers'):
             for r_name, r in self.grammar.rules.items():
                 with r.error_context():
                     r.compile()
@@ -950,13 +1458,12 @@ class CompileCtx(object):
             lib_path, "gnat",
             "{}.gpr".format(self.ada_api_settings.lib_name.lower()),
         )
-        with open(main_project_file, "w") as f:
-            f.write(self.render_template(
-                "project_file",
-                lib_name=self.ada_api_settings.lib_name,
-                os_path=os.path,
-                quex_path=os.environ['QUEX_PATH'],
-            ))
+        write_source_file(main_project_file, self.render_template(
+            "project_file",
+            lib_name=self.ada_api_settings.lib_name,
+            os_path=os.path,
+            quex_path=os.environ['QUEX_PATH'],
+        ))
 
         # Copy langkit_support sources files to the include prefix and
         # create its own project file.
@@ -1003,41 +1510,59 @@ class CompileCtx(object):
             ("pkg_debug",        ["debug"], True),
         ]
 
+        # Rendering templates is what takes most of the time here: collect
+        # all of them so that they can be rendered in parallel.
+        renderings = []
+
         for template_base_name, qual_name, has_body in ada_modules:
-            self.write_ada_module(src_path, template_base_name, qual_name,
-                                  has_body)
+            renderings.extend(self.ada_module_renderings(
+                src_path, template_base_name, qual_name, has_body
+            ))
 
-        with names.camel_with_underscores:
-            write_ada_file(
-                path.join(file_root, "src"), ADA_BODY, ["parse"],
-                self.render_template("interactive_main_ada", _self=self)
-            )
+        # Child units that contain separate bodies for properties
+        renderings.extend(self.separate_property_unit_renderings(src_path))
 
-        with names.lower:
-            # ... and the Quex C interface
-            write_cpp_file(path.join(src_path, "quex_interface.h"),
-                           self.render_template(
-                               "lexer/quex_interface_header_c",
-                               _self=self))
-            write_cpp_file(path.join(src_path, "quex_interface.c"),
-                           self.render_template(
-                               "lexer/quex_interface_body_c",
-                               _self=self))
+        def render_main():
+            with names.camel_with_underscores:
+                return self.render_template("interactive_main_ada",
+                                            _self=self)
+
+        renderings.append((render_main, lambda content: write_ada_file(
+            path.join(file_root, "src"), ADA_BODY, ["parse"], content
+        )))
+
+        # ... and the Quex C interface
+        for template_name, filename in [
+            ("lexer/quex_interface_header_c", "quex_interface.h"),
+            ("lexer/quex_interface_body_c", "quex_interface.c"),
+        ]:
+            renderings.append(self._cpp_file_rendering(
+                template_name, path.join(src_path, filename)
+            ))
 
         imain_project_file = os.path.join(file_root, "src", "mains.gpr")
-        with open(imain_project_file, "w") as f:
-            f.write(self.render_template(
+
+        def write_mains_project(content):
+            write_source_file(imain_project_file, content)
+
+        renderings.append((
+            lambda: self.render_template(
                 "mains_project_file",
                 lib_name=self.ada_api_settings.lib_name,
                 main_programs=main_programs
-            ))
+            ),
+            write_mains_project
+        ))
 
-        self.emit_c_api(src_path, include_path)
+        renderings.extend(self.c_api_renderings(src_path, include_path))
         if self.python_api_settings:
             python_path = path.join(file_root, "python")
             if not path.exists(python_path):
                 os.mkdir(python_path)
-            self.emit_python_api(python_path)
+            renderings.extend(self.python_api_renderings(python_path))
+
+        with self.profile('passes', 'render_templates'):
+            self.run_renderings(renderings)
 
         # Add any sources in $lang_path/extensions/support if it exists
         if self.ext('support'):
@@ -1049,7 +1574,8 @@ class CompileCtx(object):
 
         quex_file = os.path.join(src_path,
                                  "{}.qx".format(self.lang_name.lower))
-        quex_spec = self.lexer.emit()
+        with self.profile('passes', 'emit_lexer'):
+            quex_spec = self.lexer.emit()
         with open(quex_file, 'w') as f:
             f.write(quex_spec)
 
@@ -1057,22 +1583,71 @@ class CompileCtx(object):
         # the Quex specification changed from last build.
         if generate_lexer and self.cache.is_stale('quex_specification',
                                                   quex_spec):
-            quex_py_file = path.join(os.environ["QUEX_PATH"], "quex-exe.py")
-            subprocess.check_call([sys.executable, quex_py_file, "-i",
-                                   quex_file,
-                                   "-o", "quex_lexer",
-                                   "--buffer-element-size", "4",
-                                   "--token-id-offset",  "0x1000",
-                                   "--language", "C",
-                                   "--no-mode-transition-check",
-                                   "--single-mode-analyzer",
-                                   "--token-memory-management-by-user",
-                                   "--token-policy", "single",
-                                   "--token-id-prefix", self.lexer.prefix],
-                                  cwd=src_path)
+            with self.profile('passes', 'run_quex'):
+                self.run_quex(quex_file, quex_spec, src_path)
 
         self.cache.save()
 
+    def run_quex(self, quex_file, quex_spec, out_dir):
+        """
+        Generate the C sources for the lexer in "out_dir". If possible, copy
+        them from the shared Quex cache instead of running Quex.
+
+        :param str quex_file: Path to the Quex specification file.
+        :param str quex_spec: Content of this file.
+        :param str out_dir: Directory in which to generate the sources.
+        """
+        quex_py_file = path.join(os.environ["QUEX_PATH"], "quex-exe.py")
+        output_name = "quex_lexer"
+        quex_args = ["-o", output_name,
+                     "--buffer-element-size", "4",
+                     "--token-id-offset",  "0x1000",
+                     "--language", "C",
+                     "--no-mode-transition-check",
+                     "--single-mode-analyzer",
+                     "--token-memory-management-by-user",
+                     "--token-policy", "single",
+                     "--token-id-prefix", self.lexer.prefix]
+
+        cache_key = None
+        if self.quex_cache:
+            # The generated sources depend only on the specification, on the
+            # version of Quex and on its command-line arguments.
+            quex_version = subprocess.check_output(
+                [sys.executable, quex_py_file, "--version"]
+            )
+            cache_key = "\0".join([quex_spec, quex_version] + quex_args)
+            if self.quex_cache.restore(cache_key, out_dir):
+                if self.verbosity.info:
+                    print "Reused the lexer sources from {}".format(
+                        self.quex_cache.cache_dir
+                    )
+                return
+
+        subprocess.check_call(
+            [sys.executable, quex_py_file, "-i", quex_file] + quex_args,
+            cwd=out_dir
+        )
+
+        if cache_key:
+            self.quex_cache.store(
+                cache_key, glob(path.join(out_dir, output_name + "*"))
+            )
+
+    def _cpp_file_rendering(self, template_name, file_path):
+        """
+        Return the rendering for a C source file. See `run_renderings`.
+
+        :param str template_name: Name of the template to render.
+        :param str file_path: Path of the file to write.
+        :rtype: (() -> str, (str) -> None)
+        """
+        def render():
+            with names.lower:
+                return self.render_template(template_name, _self=self)
+
+        return (render, lambda content: write_cpp_file(file_path, content))
+
     def emit_c_api(self, src_path, include_path):
         """
         Generate header and binding body for the external C API.
@@ -1080,35 +1655,61 @@ class CompileCtx(object):
         :param str include_path: The include path.
         :param str src_path: The source path.
         """
-        def render(template_name):
-            return self.render_template(template_name, _self=self)
+        self.run_renderings(self.c_api_renderings(src_path, include_path))
 
-        with names.lower:
-            write_cpp_file(
-                path.join(include_path,
-                          "{}.h".format(self.c_api_settings.lib_name)),
-                render("c_api/header_c")
-            )
+    def c_api_renderings(self, src_path, include_path):
+        """
+        Return the renderings for the external C API. See `emit_c_api` for the
+        meaning of parameters and `run_renderings` for the result.
 
-        self.write_ada_module(src_path, "c_api/pkg_analysis",
-                              ["Analysis", "C"])
+        :rtype: list[(() -> str, (str) -> None)]
+        """
+        return [self._cpp_file_rendering(
+            "c_api/header_c",
+            path.join(include_path,
+                      "{}.h".format(self.c_api_settings.lib_name))
+        )] + self.ada_module_renderings(src_path, "c_api/pkg_analysis",
+                                        ["Analysis", "C"])
 
     def emit_python_api(self, python_path):
         """
-        Generate the Python binding module.
+        Generate the Python binding module, and the companion module for batch
+        analysis on a pool of processes.
 
-        :param str python_path: The directory in which the Python module will
+        :param str python_path: The directory in which the Python modules will
             be generated.
         """
-        module_filename = "{}.py".format(self.python_api_settings.module_name)
+        self.run_renderings(self.python_api_renderings(python_path))
 
-        with names.camel:
-            with open(os.path.join(python_path, module_filename), "w") as f:
-                f.write(self.render_template(
-                    "python_api/module_py", _self=self,
-                    c_api=self.c_api_settings,
-                    pyapi=self.python_api_settings,
-                ))
+    def python_api_renderings(self, python_path):
+        """
+        Return the renderings for the Python API. See `emit_python_api` for the
+        meaning of parameters and `run_renderings` for the result.
+
+        :rtype: list[(() -> str, (str) -> None)]
+        """
+        module_name = self.python_api_settings.module_name
+
+        def rendering(template, filename):
+            def render():
+                with names.camel:
+                    return self.render_template(
+                        template, _self=self,
+                        c_api=self.c_api_settings,
+                        pyapi=self.python_api_settings,
+                    )
+
+            def write(content):
+                write_source_file(os.path.join(python_path, filename),
+                                  content)
+
+            return (render, write)
+
+        return [
+            rendering("python_api/module_py", "{}.py".format(module_name)),
+            rendering("python_api/batch_py",
+                      "{}_batch.py".format(module_name)),
+        ]
 
     @property
     def extensions_dir(self):
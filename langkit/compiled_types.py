@@ -1909,6 +1909,7 @@ class Struct(CompiledType):
         assert cls.is_typed, (
             "Trying to generate code for a type before typing is complete"
         )
+        get_context().register_type_use(cls)
 
         if cls not in get_context().types and cls != ASTNode:
             base_class = cls.__bases__[0]
@@ -2241,6 +2242,7 @@ class ArrayType(CompiledType):
 
     @classmethod
     def add_to_context(cls):
+        get_context().register_type_use(cls)
         if cls in get_context().types:
             return
         get_context().types.add(cls)
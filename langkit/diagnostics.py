@@ -1,7 +1,8 @@
 import enum
+import linecache
 from os import path
 import os.path
-import traceback
+import sys
 
 from langkit.utils import Colors, assert_type, col
 
@@ -46,10 +47,27 @@ class Location(object):
     Holder for a location in the source code.
     """
 
-    def __init__(self, file, line, text):
+    def __init__(self, file, line, text=None):
+        """
+        :param str file: Name of the source file.
+        :param int line: Line number in the source file.
+        :param str|None text: Text for this line of code. If None, it is read
+            from the source file on the first access to the "text" attribute.
+        """
         self.file = file
         self.line = line
-        self.text = text
+        self._text = text
+
+    @property
+    def text(self):
+        """
+        Text for this line of code, without leading and trailing whitespaces.
+
+        :rtype: str
+        """
+        if self._text is None:
+            self._text = linecache.getline(self.file, self.line).strip()
+        return self._text
 
     def __repr__(self):
         return "<Location {} {}>".format(self.file, self.line)
@@ -60,17 +78,24 @@ class Location(object):
 
 def extract_library_location():
     """
-    Use traceback to extract the location of the definition of an entity in
-    the language definition using langkit. This relies on
+    Walk the call stack to extract the location of the definition of an entity
+    in the language definition using langkit. This relies on
     LangSourceDir.lang_source_dir being set.
 
+    This is called for every parser, node type, etc. that the language
+    definition creates, so it must be cheap: only the file name and the line
+    number are recorded, and the line text is read only if needed.
+
     :rtype: Location
     """
-    l = [Location(t[0], t[1], t[3])
-         for t in traceback.extract_stack()
-         if Diagnostics.is_under_langkit(t[0])
-         and "manage.py" not in t[0]]
-    return l[-1] if l else None
+    frame = sys._getframe()
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (Diagnostics.is_under_langkit(filename)
+                and "manage.py" not in filename):
+            return Location(filename, frame.f_lineno)
+        frame = frame.f_back
+    return None
 
 
 context_stack = []
@@ -23,11 +23,43 @@ All templates can use the "lang" parameter, which contains "ada", "c" or
 
 from __future__ import absolute_import
 
+import collections
 import textwrap
 
 from mako.template import Template
 
 
+class TemplateDatabase(collections.Mapping):
+    """
+    Read-only mapping from entity names to documentation templates.
+
+    Most entries are not used in a given run, so templates are compiled only
+    the first time they are looked up.
+    """
+
+    def __init__(self, doc_dict):
+        """
+        :param doc_dict: Documentation database to wrap.
+        :type doc_dict: dict[str, str]
+        """
+        self.doc_dict = doc_dict
+        self.templates = {}
+
+    def __getitem__(self, key):
+        try:
+            return self.templates[key]
+        except KeyError:
+            result = Template(self.doc_dict[key])
+            self.templates[key] = result
+            return result
+
+    def __iter__(self):
+        return iter(self.doc_dict)
+
+    def __len__(self):
+        return len(self.doc_dict)
+
+
 def instantiate_templates(doc_dict):
     """
     Turn a pure text documentation database into a Mako template one.
@@ -35,9 +67,9 @@ def instantiate_templates(doc_dict):
     :param doc_dict: Documentation database to convert.
     :type doc_dict: dict[str, str]
 
-    :rtype: dict[str, mako.template.Template]
+    :rtype: TemplateDatabase
     """
-    return {key: Template(val) for key, val in doc_dict.items()}
+    return TemplateDatabase(doc_dict)
 
 
 base_langkit_docs = {
@@ -202,6 +234,17 @@ base_langkit_docs = {
         any. Whether the analysis unit already exists or not, (re)parse it from
         the source code in Buffer.
 
+        % if lang == 'python':
+            Buffer can be any object that implements the buffer interface,
+            such as str, bytearray or mmap.mmap objects. Objects that
+            implement the new buffer interface (str, bytearray, memoryview,
+            ...) are read in place, without being copied. The content of the
+            other ones (mmap.mmap, array.array, ...) is copied first.
+        % elif lang == 'c':
+            Buffer is read in place, without being copied: the caller keeps
+            its ownership and it needs to stay valid only during the call.
+        % endif
+
         % if lang != 'python':
             The result is owned by the context: the caller must increase its
             ref-count in order to keep a reference to it.
@@ -219,6 +262,28 @@ base_langkit_docs = {
         When With_Trivia is true, the parsed analysis unit will contain
         trivias. Already existing analysis units are reparsed if needed.
     """,
+    'langkit.get_units_from_files': """
+        Get the analysis units for all the files in Filenames, as if
+        Get_From_File was called on each of them in order, and return them in
+        the same order.
+
+        % if lang == 'c':
+            Filenames must contain Count pointers to null-terminated strings,
+            and Units must have room for Count analysis units. The results are
+            owned by the context: the caller must increase their ref-count in
+            order to keep references to them.
+        % endif
+
+        Up to Jobs units are lexed and parsed concurrently, by a pool of
+        native tasks: the results do not depend on Jobs. Creating units and
+        updating lexical environments after reparsings are still done
+        sequentially. Errors are described as diagnostics of each unit.
+
+        % if lang == 'python':
+            The GIL is released during the whole batch, so other Python
+            threads can run in the meantime.
+        % endif
+    """,
     'langkit.get_unit_from_provider': """
         Create a new analysis unit for Name/Kind or return the existing one if
         any. If Reparse is true and the analysis unit already exists, reparse
@@ -387,6 +452,17 @@ base_langkit_docs = {
     'langkit.node_short_image': """
         Return a representation of NODE as a string.
     """,
+    'langkit.node_to_json': """
+        Return a JSON representation of NODE and all its children. Nodes are
+        objects that map the names of their non-null parsing fields to their
+        values, list nodes are arrays of their non-null items and tokens are
+        objects with "kind", "token_kind" and "text" members.
+
+        % if lang == 'c':
+            The returned string is dynamically allocated and the caller must
+            free it when done with it.
+        % endif
+    """,
 
     'langkit.token_text': """
         Get the text of the given token.
@@ -38,7 +38,8 @@ class AnalysisUnitRoot(ResolvedExpression):
             render(
                 'properties/null_safety_check_ada',
                 expr=self.unit_expr,
-                result_var=self.prefix_var
+                result_var=self.prefix_var,
+                check=True
             ) if not get_context().no_property_checks else ''
         )
 
@@ -7,16 +7,16 @@ from itertools import count
 from enum import Enum
 import funcy
 
-from langkit import names
+from langkit import caching, names
 from langkit.common import string_repr
 from langkit.compiled_types import (
     AbstractNodeData, Argument, ASTNode, BoolType, CompiledType,
-    LexicalEnvType, LongType, Symbol, T, Token, get_context,
-    render as ct_render, resolve_type
+    EquationType, LexicalEnvType, LogicVarType, LongType, Symbol, T, Token,
+    get_context, render as ct_render, resolve_type
 )
 from langkit.diagnostics import (
-    Context, DiagnosticError, Severity, check_multiple, check_source_language,
-    check_type, extract_library_location, warn_if
+    Context, DiagnosticError, Location, Severity, check_multiple,
+    check_source_language, check_type, extract_library_location, warn_if
 )
 from langkit.utils import TypeSet, assert_type, dispatch_on_type, memoized
 
@@ -729,21 +729,56 @@ class ResolvedExpression(object):
             None
         )
 
+    _reused_expr = None
+    """
+    If not None, expression that computes the same value as this one and whose
+    evaluation always precedes the evaluation of this one, so that this one
+    does not need to compute anything. See eliminate_common_subexprs.
+
+    :type: ResolvedExpression|None
+    """
+
+    _cache_flag = None
+    """
+    If not None, boolean local variable that tells whether this expression
+    already computed its result. In this case, this expression computes its
+    result only the first time it is evaluated. See eliminate_common_subexprs.
+
+    :type: LocalVars.LocalVar|None
+    """
+
+    _transfer_ownership = False
+    """
+    Whether code that evaluates this expression can take over the reference
+    that the variable for its result owns, i.e. whether nothing else reads this
+    variable. See elide_refcount_transfers.
+    """
+
     def render_pre(self):
         """
         Render initial statements that might be needed to the expression.
 
         :rtype: str
         """
+        if self._reused_expr:
+            return ''
+
         result = self._render_pre()
         if self._result_var:
-            return '{}\n{} := {};'.format(
+            result = '{}\n{} := {};'.format(
                 result,
                 self._result_var.name.camel_with_underscores,
                 self._render_expr()
             )
-        else:
-            return result
+        if self._cache_flag:
+            result = ('if not {flag} then\n'
+                      '{}\n'
+                      '{flag} := True;\n'
+                      'end if;'.format(
+                          result,
+                          flag=self._cache_flag.name.camel_with_underscores
+                      ))
+        return result
 
     def render_expr(self):
         """
@@ -751,10 +786,60 @@ class ResolvedExpression(object):
 
         :rtype: str
         """
+        if self._reused_expr:
+            return self._reused_expr.render_expr()
+
         return (self._result_var.name.camel_with_underscores
                 if self._result_var else
                 self._render_expr())
 
+    def render_store(self, dest):
+        """
+        Render statements that store the value of this expression into the
+        "dest" variable, so that "dest" owns a reference to this value. The
+        statements from render_pre must come first.
+
+        When the variable that holds the result of this expression can give
+        its reference to "dest", reset it instead of creating a new reference:
+        the finalization of its scope then has nothing to release.
+
+        :param str|names.Name dest: Name of the destination variable.
+        :rtype: str
+        """
+        result = '{} := {};'.format(dest, self.render_expr())
+        if self.type.is_refcounted():
+            owned_var = self.owned_result_var
+            result += ('\n{} := {};'.format(owned_var.name,
+                                            owned_var.type.nullexpr())
+                       if owned_var else
+                       '\nInc_Ref ({});'.format(dest))
+        return result
+
+    @property
+    def owned_result_var(self):
+        """
+        If code that evaluates this expression can take over the reference
+        that a local variable owns for its result, return this variable.
+        Return None otherwise.
+
+        :rtype: LocalVars.LocalVar|None
+        """
+        return self._owned_var() if self._transfer_ownership else None
+
+    def _owned_var(self):
+        """
+        Per-expression kind implementation for owned_result_var: return the
+        local variable that holds the result of this expression and that owns
+        a reference to it, if any. The default implementation returns the
+        variable that render_pre assigns.
+
+        :rtype: LocalVars.LocalVar|None
+        """
+        if (self._result_var and self._result_var.type.is_refcounted()
+                and not self._reused_expr and not self._cache_flag):
+            return self._result_var
+        return None
+
     def _render_pre(self):
         """
         Per-expression kind implementation for render_pre. The default
@@ -876,6 +961,50 @@ class ResolvedExpression(object):
 
         return result
 
+    @property
+    def cse_key(self):
+        """
+        If this expression is free of side effects and if all expressions that
+        have the same key always compute the same value when evaluated in the
+        same property call and with the same variable values, return this key.
+        Return None otherwise.
+
+        Subclasses must override the "_cse_key" method to compute this key.
+
+        :rtype: None|tuple
+        """
+        t = self.static_type
+        if (t is None or t.is_refcounted()
+                or t in (EquationType, LogicVarType)):
+            return None
+        return self._cse_key()
+
+    def _cse_key(self):
+        """
+        Per-expression kind implementation for cse_key. The default
+        implementation returns None.
+
+        :rtype: None|tuple
+        """
+        return None
+
+    @property
+    def sequential_subexprs(self):
+        """
+        Return the list of operands that evaluating this expression always
+        evaluates, in evaluation order, before evaluating the other operands.
+        The default implementation returns an empty list.
+
+        :rtype: list[ResolvedExpression]
+        """
+        return []
+
+    is_loop = False
+    """
+    Whether evaluating this expression can evaluate some of its operands
+    several times (not counting the ones in "sequential_subexprs").
+    """
+
     @property
     def subexprs(self):
         """
@@ -979,6 +1108,9 @@ class AbstractVariable(AbstractExpression):
         def _render_expr(self):
             return self.name.camel_with_underscores
 
+        def _cse_key(self):
+            return (AbstractVariable.Expr, self.name)
+
         @property
         def source_name(self):
             """
@@ -1189,6 +1321,15 @@ class BindingScope(ResolvedExpression):
     def _render_expr(self):
         return self.expr._render_expr()
 
+    def _owned_var(self):
+        # Rendering bypasses the result variable of the wrapped expression
+        owned_var = self.expr.owned_result_var
+        return None if owned_var is self.expr._result_var else owned_var
+
+    @property
+    def sequential_subexprs(self):
+        return [self.expr]
+
     @property
     def subexprs(self):
         return {'0-bindings': self.expr_bindings,
@@ -1225,15 +1366,20 @@ class Let(AbstractExpression):
             result = []
             for var, expr in zip(self.vars, self.var_exprs):
                 result.append(expr.render_pre())
-                result.append('{} := {};'.format(var.name, expr.render_expr()))
-                if var.type.is_refcounted():
-                    result.append('Inc_Ref ({});'.format(var.name))
+                result.append(expr.render_store(var.name))
             result.append(self.expr.render_pre())
             return '\n'.join(result)
 
         def _render_expr(self):
             return self.expr.render_expr()
 
+        def _owned_var(self):
+            return self.expr.owned_result_var
+
+        @property
+        def sequential_subexprs(self):
+            return self.var_exprs + [self.expr]
+
         @property
         def subexprs(self):
             return {'vars': {v.name: e
@@ -1436,6 +1582,137 @@ def render(*args, **kwargs):
     return ct_render(*args, property=PropertyDef.get(), Self=Self, **kwargs)
 
 
+def structural_key(obj):
+    """
+    Return a string that describes "obj" and everything it references, in a
+    way that does not depend on object addresses.
+
+    This is meant to be used as a cache key for code generated from "obj":
+    compiled types, properties and fields are described by their names and
+    the attributes that affect the code that refers to them. Other objects are
+    described by their class and all their attributes, recursively. Source
+    locations are ignored.
+
+    :rtype: str
+    """
+    result = []
+    visited = {}
+
+    def helper(obj):
+        if obj is None or isinstance(obj, (bool, int, long, float)):
+            result.append(repr(obj))
+
+        elif isinstance(obj, basestring):
+            result.append(repr(obj))
+
+        elif isinstance(obj, names.Name):
+            result.append('Name({})'.format(obj.camel_with_underscores))
+
+        elif isinstance(obj, type) and issubclass(obj, CompiledType):
+            result.append('Type({}, {}, {}, {})'.format(
+                obj.name().camel_with_underscores, obj.is_refcounted(),
+                obj.has_special_storage, obj.storage_type_name()
+            ))
+
+        # Code that refers to a field or a property depends on its signature,
+        # so describe it in the key.
+        elif isinstance(obj, AbstractNodeData):
+            result.append('Data({}, '.format(obj.qualname))
+            helper(node_data_signature(obj))
+            result.append(')')
+
+        elif isinstance(obj, (list, tuple)):
+            result.append('[')
+            for item in obj:
+                helper(item)
+                result.append(',')
+            result.append(']')
+
+        # Sets and dicts have no stable iteration order: sort their items so
+        # that keys do not depend on hashes.
+        elif isinstance(obj, (set, frozenset)):
+            result.append('{')
+            for item in sorted(obj, key=structural_key):
+                helper(item)
+                result.append(',')
+            result.append('}')
+
+        elif isinstance(obj, dict):
+            result.append('{')
+            for key in sorted(obj, key=structural_key):
+                helper(key)
+                result.append(': ')
+                helper(obj[key])
+                result.append(',')
+            result.append('}')
+
+        elif isinstance(obj, Enum):
+            result.append('{}.{}'.format(type(obj).__name__, obj.name))
+
+        elif isinstance(obj, Location):
+            result.append('Location')
+
+        elif isinstance(obj, partial):
+            result.append('partial(')
+            helper([obj.func, obj.args, obj.keywords])
+            result.append(')')
+
+        elif inspect.isroutine(obj) or inspect.isclass(obj):
+            result.append('{}.{}'.format(obj.__module__, obj.__name__))
+
+        elif id(obj) in visited:
+            result.append('Ref({})'.format(visited[id(obj)]))
+
+        else:
+            visited[id(obj)] = len(visited)
+            result.append('{}.{}('.format(type(obj).__module__,
+                                          type(obj).__name__))
+            for key, value in sorted(getattr(obj, '__dict__', {}).items()):
+                result.append('{}='.format(key))
+                helper(value)
+                result.append(',')
+            result.append(')')
+
+    helper(obj)
+    return ''.join(result)
+
+
+def node_data_signature(node_data):
+    """
+    Return a list of values that describe what code that refers to
+    "node_data" (a field or a property) depends on.
+
+    :param AbstractNodeData node_data: Field or property to describe.
+    :rtype: list
+    """
+    if not node_data.is_property:
+        return [node_data.type]
+
+    def overriding_properties(node_type):
+        result = []
+        for subcls in node_type.subclasses:
+            result.extend(
+                p.qualname
+                for p in subcls.get_properties(include_inherited=False)
+                if p._name == node_data._name
+            )
+            result.extend(overriding_properties(subcls))
+        return result
+
+    return [
+        node_data.uid,
+        node_data.type,
+        [(arg.name, arg.type, arg.default_value)
+         for arg in node_data.explicit_arguments],
+        node_data.has_implicit_env,
+        node_data.dispatching,
+        node_data.abstract,
+        (overriding_properties(node_data.struct)
+         if issubclass(node_data.struct, ASTNode) else
+         [])
+    ]
+
+
 class PropertyDef(AbstractNodeData):
     """
     This is the underlying class that is used to represent properties in the
@@ -1466,7 +1743,8 @@ class PropertyDef(AbstractNodeData):
 
     def __init__(self, expr, prefix, name=None, doc=None, private=None,
                  abstract=False, type=None, abstract_runtime_check=False,
-                 has_implicit_env=None, memoized=False, external=False):
+                 has_implicit_env=None, memoized=False, external=False,
+                 pure=None):
         """
         :param expr: The expression for the property. It can be either:
             * An expression.
@@ -1520,6 +1798,15 @@ class PropertyDef(AbstractNodeData):
             None and the implementation must be provided in the
             extensions/nodes/{node_name}/bodies extension file. Note that the
             engines always generate the public declaration part.
+
+        :param bool|None pure: Whether this property has no side effect and
+            always returns the same result for the same node and arguments.
+            This enables optimizations for calls to it. Pure properties cannot
+            bind logic variables, synthesize nodes nor call properties that
+            are not pure (this is not checked for external properties). If
+            None, inherit from the overriden property, or False if there is no
+            property to override. Just like `private`, it must always be
+            consistent with base classes.
         """
 
         super(PropertyDef, self).__init__(name=name, private=private)
@@ -1577,11 +1864,57 @@ class PropertyDef(AbstractNodeData):
         :type: str
         """
 
+        self.prop_separate_decl = None
+        """
+        When this property has a separate body, the emitted code for its
+        declaration in the separate unit.
+        :type: str|None
+        """
+
+        self.prop_separate_def = None
+        """
+        When this property has a separate body, the emitted code for its
+        definition in the separate unit.
+        :type: str|None
+        """
+
+        self.uses_body_helpers = False
+        """
+        Whether the code emitted for this property uses helpers that only the
+        body of the $.Analysis package declares: logic binders, logic
+        predicates or helpers for synthetized nodes. Such properties cannot
+        have a separate body.
+        :type: bool
+        """
+
+        self.inline = False
+        """
+        Whether the declaration of this property asks the Ada compiler to
+        inline its body. This is computed during the optimize pass.
+        :type: bool
+        """
+
+        self.called_properties = set()
+        """
+        Set of properties that the expression for this property calls. This is
+        computed during the construct pass, and used to find properties that
+        can never be called (see CompileCtx.eliminate_dead_code).
+        :type: set[PropertyDef]
+        """
+
+        self.used_types = set()
+        """
+        Set of array and struct types that the code generated for this
+        property needs. This is computed during the construct pass.
+        :type: set[langkit.compiled_types.CompiledType]
+        """
+
         self._doc = doc
         ":type: str|None"
 
         self.memoized = memoized
         self.external = external
+        self._pure = pure
 
     @property
     def uid(self):
@@ -1721,6 +2054,31 @@ class PropertyDef(AbstractNodeData):
         assert self._has_implicit_env is not None
         return self._has_implicit_env
 
+    @property
+    def pure(self):
+        """
+        Return whether this property is pure. See the constructor.
+
+        :rtype: bool
+        """
+        assert self._pure is not None
+        return self._pure
+
+    @classmethod
+    def forbid_in_pure(cls, operation):
+        """
+        Emit an error if the property that is being constructed is pure, as it
+        performs an operation that pure properties cannot perform.
+
+        :param str operation: Description of this operation, for the error
+            message.
+        """
+        prop = cls.get()
+        check_source_language(
+            prop is None or not prop.pure,
+            'Pure properties cannot {}'.format(operation)
+        )
+
     def prepare_abstract_expression(self):
         """
         Run the "prepare" pass on the expression associated to this property.
@@ -1867,6 +2225,19 @@ class PropertyDef(AbstractNodeData):
                     )
                 )
 
+            # Likewise for purity
+            if self._pure is None:
+                self._pure = base_prop._pure
+            else:
+                check_source_language(
+                    self._pure == base_prop.pure,
+                    '{} is {}pure, so should be {}'.format(
+                        base_prop.qualname,
+                        '' if base_prop.pure else 'not ',
+                        self.qualname,
+                    )
+                )
+
             # We then want to check the consistency of type annotations if they
             # exist.
             if base_prop.expected_type:
@@ -1892,6 +2263,7 @@ class PropertyDef(AbstractNodeData):
             self._has_implicit_env = with_default(
                 self._has_implicit_env, False
             )
+            self._pure = with_default(self._pure, False)
 
         if self.memoized:
             check_source_language(
@@ -1984,19 +2356,149 @@ class PropertyDef(AbstractNodeData):
         # scope.
         self.vars.check_scopes()
 
+        # Equations keep the state of their resolution, so sharing the same
+        # equation between callers would make them interfere.
+        check_source_language(
+            not self.memoized or not self.type.matches(EquationType),
+            'A memoized property cannot return an equation'
+        )
+
         # Warn on unused bindings
         self.warn_on_unused_bindings()
 
+    def optimize_expression(self):
+        """
+        This pass will rewrite the resolved expression so that the generated
+        code does less work at run time.
+        """
+        from langkit.expressions.collections import fuse_collection_pipelines
+        from langkit.expressions.structs import (
+            devirtualize_property_calls, eliminate_safety_checks
+        )
+
+        if not self.constructed_expr:
+            return
+
+        with self.bind():
+            fuse_collection_pipelines(self.constructed_expr)
+            eliminate_common_subexprs(self.constructed_expr)
+            elide_refcount_transfers(self.constructed_expr)
+            devirtualize_property_calls(self.constructed_expr)
+            eliminate_safety_checks(self.constructed_expr)
+
+        # Let the Ada compiler inline calls to tiny properties, such as the
+        # ones that just return a field or call another property. Their body
+        # must be in the same unit as their callers and must not need
+        # finalization.
+        operations = set()
+
+        def collect_operations(e):
+            if e not in operations:
+                if not isinstance(e, (AbstractVariable.Expr, LiteralExpr)):
+                    operations.add(e)
+                for sub in e.flat_subexprs:
+                    collect_operations(sub)
+
+        collect_operations(self.constructed_expr)
+        self.inline = (
+            len(operations) <= self.inline_max_operations
+            and not self.memoized
+            and not self.has_separate_body
+            and not self.vars.root_scope.has_refcounted_vars(True)
+        )
+
+    inline_max_operations = 3
+    """
+    Maximum number of operations in the expression of a property whose body
+    can be inlined (see optimize_expression).
+    """
+
+    def rendering_key(self):
+        """
+        Return a key that describes all the inputs used to render this
+        property, suitable for lookups in a caching.ContentCache instance.
+
+        :rtype: str
+        """
+        ctx = get_context()
+        return structural_key([
+            caching.langkit_fingerprint(),
+            ctx.no_property_checks,
+            ctx.separate_properties,
+
+            # The location only matters for diagnostics and the index is not
+            # used when rendering the property itself. Leaving them out avoids
+            # invalidating properties that are just moved around.
+            {key: value for key, value in vars(self).items()
+             if key not in ('location', '_index', 'in_type', 'expr',
+                            'prop_decl', 'prop_def', 'prop_separate_decl',
+                            'prop_separate_def', 'called_properties',
+                            'used_types')}
+        ])
+
+    @property
+    def has_separate_body(self):
+        """
+        Return whether the body of this property is emitted in a child unit of
+        $.Analysis rather than in the body of $.Analysis itself. See
+        CompileCtx.separate_properties.
+
+        :rtype: bool
+        """
+        return (get_context().separate_properties
+                and self.struct.is_ast_node()
+                and not self.abstract
+                and not self.external
+                and not self.uses_body_helpers)
+
+    @property
+    def separate_unit_name(self):
+        """
+        Return the name of the child unit of $.Analysis that contains the body
+        of this property, if it has a separate body.
+
+        :rtype: names.Name
+        """
+        return self.struct.name() + names.Name('Properties')
+
     def render_property(self):
         """
         Render the given property to generated code.
 
+        If the context has a property cache, reuse the code that a previous
+        run generated for the same inputs, if any.
+
         :rtype: basestring
         """
-        with self.bind(), Self.bind_type(self.struct):
-            with names.camel_with_underscores:
-                self.prop_decl = render('properties/decl_ada')
-                self.prop_def = render('properties/def_ada')
+        cache = get_context().property_cache
+        key = self.rendering_key() if cache else None
+        cached = cache.get(key) if cache else None
+
+        if cached:
+            (self.prop_decl, self.prop_def,
+             self.prop_separate_decl, self.prop_separate_def) = cached
+        else:
+            with self.bind(), Self.bind_type(self.struct):
+                with names.camel_with_underscores:
+                    self.prop_decl = render('properties/decl_ada')
+                    if self.has_separate_body:
+                        # The body in $.Analysis just renames the one in the
+                        # separate unit.
+                        self.prop_def = render('properties/def_ada',
+                                               unit='main')
+                        self.prop_separate_decl = render(
+                            'properties/separate_decl_ada'
+                        )
+                        self.prop_separate_def = render(
+                            'properties/def_ada', unit='separate'
+                        )
+                    else:
+                        self.prop_def = render('properties/def_ada',
+                                               unit='inline')
+            if cache:
+                cache.set(key, [self.prop_decl, self.prop_def,
+                                self.prop_separate_decl,
+                                self.prop_separate_def])
 
         base_prop = self.base_property()
         if base_prop and base_prop.type:
@@ -2068,7 +2570,8 @@ class PropertyDef(AbstractNodeData):
         ret = [cls.prepare_abstract_expression,
                cls.freeze_abstract_expression,
                cls.compute_property_attributes,
-               cls.construct_and_type_expression]
+               cls.construct_and_type_expression,
+               cls.optimize_expression]
 
         if not compile_only:
             ret.append(cls.render_property)
@@ -2224,7 +2727,7 @@ def AbstractProperty(type, doc="", runtime_check=False, **kwargs):
 
 # noinspection PyPep8Naming
 def Property(expr, doc=None, private=None, type=None, has_implicit_env=None,
-             memoized=False):
+             memoized=False, pure=None):
     """
     Public constructor for concrete properties. You can declare your properties
     on your ast node subclasses directly, like this::
@@ -2239,11 +2742,13 @@ def Property(expr, doc=None, private=None, type=None, has_implicit_env=None,
     :type type: CompiledType
     :type doc: str
     :type private: bool|None
+    :type pure: bool|None
     :rtype: PropertyDef
     """
     return PropertyDef(expr, AbstractNodeData.PREFIX_PROPERTY, doc=doc,
                        private=private, type=type,
-                       has_implicit_env=has_implicit_env, memoized=memoized)
+                       has_implicit_env=has_implicit_env, memoized=memoized,
+                       pure=pure)
 
 
 class AbstractKind(Enum):
@@ -2254,7 +2759,7 @@ class AbstractKind(Enum):
 
 def langkit_property(private=None, return_type=None,
                      kind=AbstractKind.concrete, has_implicit_env=None,
-                     memoized=False, external=False):
+                     memoized=False, external=False, pure=None):
     """
     Decorator to create properties from real Python methods. See Property for
     more details.
@@ -2262,6 +2767,7 @@ def langkit_property(private=None, return_type=None,
     :type private: bool|None
     :type return_type: CompiledType
     :type kind: int
+    :type pure: bool|None
     """
     def decorator(expr_fn):
         return PropertyDef(
@@ -2275,6 +2781,7 @@ def langkit_property(private=None, return_type=None,
             has_implicit_env=has_implicit_env,
             memoized=memoized,
             external=external,
+            pure=pure,
         )
     return decorator
 
@@ -2329,6 +2836,23 @@ class BasicExpr(ResolvedExpression):
                          for expr in self.operands
                          if not isinstance(expr, basestring))
 
+    def _cse_key(self):
+        # Subclasses can have more semantics than their template, so only
+        # handle plain basic expressions here.
+        if type(self) is not BasicExpr:
+            return None
+
+        keys = [op if isinstance(op, basestring) else op.cse_key
+                for op in self.operands]
+        if any(k is None for k in keys):
+            return None
+        return (BasicExpr, self.template, self.static_type) + tuple(keys)
+
+    @property
+    def sequential_subexprs(self):
+        return [op for op in self.operands
+                if isinstance(op, ResolvedExpression)]
+
     @property
     def subexprs(self):
         return [op for op in self.operands
@@ -2349,6 +2873,9 @@ class LiteralExpr(BasicExpr):
         super(LiteralExpr, self).__init__(literal, type, [], result_var_name)
         self.literal = literal
 
+    def _cse_key(self):
+        return (LiteralExpr, self.literal, self.static_type)
+
     @property
     def subexprs(self):
         return {'0-type': self.static_type,
@@ -2393,13 +2920,20 @@ class FieldAccessExpr(BasicExpr):
                 base,
                 render('properties/null_safety_check_ada',
                        expr=self.prefix_expr,
-                       result_var=self.prefix_var)
+                       result_var=self.prefix_var,
+                       check=True)
                 if not get_context().no_property_checks
                 else ''
             )
         else:
             return base
 
+    def _cse_key(self):
+        prefix_key = self.prefix_expr.cse_key
+        return (None
+                if prefix_key is None else
+                (FieldAccessExpr, self.field_name, prefix_key))
+
     @property
     def subexprs(self):
         return {'prefix': self.prefix_expr, 'field': self.field_name}
@@ -2606,7 +3140,7 @@ class LocalVars(object):
         """
         Represents one local variable in a property definition.
         """
-        def __init__(self, vars, name, type=None):
+        def __init__(self, vars, name, type=None, default_value=None):
             """
 
             :param LocalVars vars: The LocalVars instance to which this
@@ -2614,10 +3148,13 @@ class LocalVars(object):
             :param langkit.names.Name name: The name of this local variable.
             :param langkit.compiled_types.CompiledType type: Type parameter.
                 The type of this local variable.
+            :param str|None default_value: If provided, Ada expression to
+                initialize this variable in its declaration.
             """
             self.vars = vars
             self.name = name
             self.type = type
+            self.default_value = default_value
 
             self._scope = None
             """
@@ -2630,9 +3167,11 @@ class LocalVars(object):
 
         def render(self):
             assert self.type, "Local var must have type before it is rendered"
-            return "{} : {};".format(
+            return "{} : {}{};".format(
                 self.name.camel_with_underscores,
-                self.type.name().camel_with_underscores
+                self.type.name().camel_with_underscores,
+                (' := {}'.format(self.default_value)
+                 if self.default_value else '')
             )
 
         def __repr__(self):
@@ -2641,7 +3180,7 @@ class LocalVars(object):
                 self.type.name().camel if self.type else '<none>'
             )
 
-    def create(self, name, type):
+    def create(self, name, type, default_value=None):
         """
         Create a local variables in templates::
 
@@ -2659,12 +3198,13 @@ class LocalVars(object):
         :param str|names.Name name: The name of the variable.
         :param langkit.compiled_types.CompiledType type: Type parameter. The
             type of the local variable.
+        :param str|None default_value: See LocalVars.LocalVar's constructor.
         """
-        result = self.create_scopeless(name, type)
+        result = self.create_scopeless(name, type, default_value)
         PropertyDef.get_scope().add(result)
         return result
 
-    def create_scopeless(self, name, type):
+    def create_scopeless(self, name, type, default_value=None):
         """
         Like "create", but do not assign a scope for the new local variable.
         The scope will have to be initialized later.
@@ -2672,6 +3212,7 @@ class LocalVars(object):
         :param str|names.Name name: The name of the variable.
         :param langkit.compiled_types.CompiledType type: Type parameter. The
             type of the local variable.
+        :param str|None default_value: See LocalVars.LocalVar's constructor.
         """
         name = names.Name.get(name)
 
@@ -2680,10 +3221,22 @@ class LocalVars(object):
         while name in self.local_vars:
             i += 1
             name = orig_name + names.Name(str(i))
-        ret = LocalVars.LocalVar(self, name, type)
+        ret = LocalVars.LocalVar(self, name, type, default_value)
         self.local_vars[name] = ret
         return ret
 
+    def remove(self, var):
+        """
+        Remove a local variable that the generated code does not need anymore,
+        for instance after an optimization.
+
+        :param LocalVars.LocalVar var: The variable to remove.
+        """
+        del self.local_vars[var.name]
+        if var._scope:
+            var._scope.variables.remove(var)
+            var._scope = None
+
     def check_scopes(self):
         """
         Check that all variables are associated to a scope. Raise an
@@ -2718,6 +3271,164 @@ class LocalVars(object):
         return new
 
 
+def count_references(expr):
+    """
+    Count how many times each expression appears in the "expr" resolved
+    expression tree. Optimization passes must leave alone the expressions that
+    appear several times, as they can be rendered in several places.
+
+    :param ResolvedExpression expr: Root of the tree to inspect.
+    :rtype: dict[ResolvedExpression, int]
+    """
+    result = {}
+
+    def visit(e):
+        result[e] = result.get(e, 0) + 1
+        if result[e] == 1:
+            for sub in e.flat_subexprs:
+                visit(sub)
+
+    visit(expr)
+    return result
+
+
+def eliminate_common_subexprs(expr):
+    """
+    Optimization pass for the "expr" resolved expression tree: make
+    expressions that are free of side effects reuse the value that an
+    equivalent expression computed earlier instead of computing it again (see
+    ResolvedExpression.cse_key).
+
+    An expression can reuse the value of another one only if evaluating the
+    former always comes after evaluating the latter. In addition, expressions
+    inside loops whose value does not depend on the iteration compute it only
+    the first time they are evaluated: later evaluations reuse it.
+
+    This pass must run while the property that owns "expr" is bound.
+
+    :param ResolvedExpression expr: Root of the tree to optimize.
+    """
+    vars = PropertyDef.get().vars
+
+    # Expressions that appear several times in the tree can be rendered in
+    # several places, so leave them alone.
+    ref_counts = count_references(expr)
+
+    def key_vars(key):
+        """
+        Return the set of names for the variables that "key" references.
+        """
+        if not isinstance(key, tuple):
+            return set()
+        elif key[0] is AbstractVariable.Expr:
+            return {key[1]}
+        else:
+            return set().union(*[key_vars(k) for k in key[1:]])
+
+    def key_depth(key):
+        """
+        Return the number of nested operations that "key" describes.
+        """
+        if (not isinstance(key, tuple)
+                or key[0] in (AbstractVariable.Expr, LiteralExpr)):
+            return 0
+        else:
+            return 1 + max([key_depth(k) for k in key[1:]] or [0])
+
+    def create_var(name, type, default_value=None):
+        result = vars.create_scopeless(name, type, default_value)
+        vars.root_scope.add(result)
+        return result
+
+    def set_result_var(e, var):
+        if e._result_var and e._result_var is not var:
+            vars.remove(e._result_var)
+        e._result_var = var
+
+    def visit(e, available, loop, in_cached=False):
+        """
+        :param dict available: For all expressions whose value is always
+            computed when the evaluation of "e" starts, map their keys to
+            them.
+        :param loop: If "e" is inside a loop, set of names for the variables
+            that the outermost loop binds, and mapping from keys to result
+            variables and flags for the loop-invariant expressions it
+            contains. None otherwise.
+        :param bool in_cached: Whether "e" is an operand of a cached
+            loop-invariant expression. If so, it is evaluated at most once
+            already, so caching it too would only add a redundant flag.
+        """
+        if ref_counts[e] > 1:
+            return
+
+        # There is no point in caching variables and literals
+        key = (None
+               if isinstance(e, (AbstractVariable.Expr, LiteralExpr)) else
+               e.cse_key)
+
+        if key is not None and key in available:
+            origin = available[key]
+            if not origin._result_var:
+                set_result_var(origin, create_var('Reused_Value', e.type))
+            e._reused_expr = origin
+            return
+
+        # Checking a flag for loop-invariant expressions that consist of a
+        # single operation would cost as much as the operation itself.
+        is_cached = False
+        if (key is not None and loop is not None and not in_cached
+                and key_depth(key) > 1):
+            loop_vars, cached_values = loop
+            if not (key_vars(key) & loop_vars):
+                if key not in cached_values:
+                    cached_values[key] = (
+                        e._result_var or create_var('Cached_Value', e.type),
+                        create_var('Is_Cached', BoolType, 'False')
+                    )
+                result_var, e._cache_flag = cached_values[key]
+                set_result_var(e, result_var)
+                is_cached = True
+
+        # Operands of cached expressions are evaluated at most once, so values
+        # they compute are not available to the rest of the iteration.
+        sub_available = dict(available) if is_cached else available
+        sub_in_cached = in_cached or is_cached
+        sequential = e.sequential_subexprs
+        for sub in sequential:
+            visit(sub, sub_available, loop, sub_in_cached)
+
+        if e.is_loop and loop is None:
+            loop = (set(var.name for var in e.bindings), {})
+        for sub in e.flat_subexprs:
+            if not any(sub is s for s in sequential):
+                visit(sub, dict(sub_available), loop, sub_in_cached)
+
+        if key is not None:
+            available[key] = e
+
+    visit(expr, {}, None)
+
+
+def elide_refcount_transfers(expr):
+    """
+    Optimization pass for the "expr" resolved expression tree: let the code
+    that stores the value of an expression into another variable take over the
+    reference that the variable for the result of this expression owns, rather
+    than creating a new reference and later releasing the original one (see
+    ResolvedExpression.render_store).
+
+    This is valid only for expressions that appear once in the tree: other
+    ones can be rendered in several places, and thus their result variable can
+    be read again after the transfer.
+
+    :param ResolvedExpression expr: Root of the tree to optimize.
+    """
+    ref_counts = count_references(expr)
+
+    for e, n_refs in ref_counts.items():
+        e._transfer_ownership = n_refs == 1
+
+
 class BuiltinCallExpr(BasicExpr):
     """
     Convenience resolved expression that models a call to a function on the
@@ -14,6 +14,40 @@ from langkit.expressions.envs import EmptyEnv
 from langkit.utils import assert_type
 
 
+def constant_value(expr):
+    """
+    If "expr" is a boolean or integer literal, return its value. Return None
+    otherwise.
+
+    Expressions whose operands have constant values are folded at construction
+    time, so that the generated code does not compute them at run time.
+
+    :param ResolvedExpression expr: Expression to evaluate.
+    :rtype: bool|int|None
+    """
+    if not isinstance(expr, LiteralExpr):
+        return None
+    elif expr.static_type is BoolType and expr.literal in ('True', 'False'):
+        return expr.literal == 'True'
+    elif expr.static_type is LongType:
+        try:
+            return int(expr.literal)
+        except ValueError:
+            return None
+    else:
+        return None
+
+
+def constant_bool(value):
+    """
+    Return a resolved expression for the "value" boolean constant.
+
+    :param bool value: Boolean value.
+    :rtype: LiteralExpr
+    """
+    return LiteralExpr(str(value), BoolType)
+
+
 @attr_call('and_then', 'and')
 @attr_call('or_else', 'or')
 class BinaryBooleanOperator(AbstractExpression):
@@ -56,16 +90,30 @@ class BinaryBooleanOperator(AbstractExpression):
         )
 
         if lhs.type is BoolType:
-            # Boolean case
+            # Boolean case. "X and True" and "X or False" are just "X". Other
+            # cases with constant operands are folded when building the If
+            # expression.
+            if constant_value(rhs) == (self.kind == self.AND):
+                return lhs
+
             if self.kind == self.AND:
                 then = rhs
-                else_then = LiteralExpr('False', BoolType)
+                else_then = constant_bool(False)
             else:
-                then = LiteralExpr('True', BoolType)
+                then = constant_bool(True)
                 else_then = rhs
-            return If.Expr(lhs, then, else_then, BoolType)
+            return If.make_expr(lhs, then, else_then, BoolType)
         else:
-            # Equation case
+            # Equation case. LogicTrue is neutral for "and" and LogicFalse is
+            # neutral for "or": do not allocate a relation for them at all.
+            from langkit.expressions.logic import is_constant_equation
+
+            neutral = self.kind == self.AND
+            for dropped, kept in [(rhs, lhs), (lhs, rhs)]:
+                if is_constant_equation(dropped, neutral):
+                    PropertyDef.get().vars.remove(dropped._result_var)
+                    return kept
+
             return BuiltinCallExpr(
                 names.Name("Logic") + names.Name.from_lower(self.kind),
                 EquationType, [lhs, rhs],
@@ -105,9 +153,35 @@ class Eq(AbstractExpression):
     Expression for equality test expression.
     """
 
+    TEMPLATE = '{} = {}'
+
+    @staticmethod
+    def compared_exprs(expr):
+        """
+        If "expr" is an equality test that "make_expr" created, return its
+        operands. Return None otherwise.
+
+        :param ResolvedExpression expr: Expression to inspect.
+        :rtype: (ResolvedExpression, ResolvedExpression)|None
+        """
+        return (tuple(expr.operands)
+                if type(expr) is BasicExpr and expr.template == Eq.TEMPLATE
+                else None)
+
     @staticmethod
     def make_expr(lhs, rhs):
-        return BasicExpr('{} = {}', BoolType, [lhs, rhs])
+        # Value literals are side effect free, so the same literal is always
+        # equal to itself. This does not hold for literals that allocate,
+        # such as empty arrays: each evaluation yields a distinct access.
+        lhs_value, rhs_value = constant_value(lhs), constant_value(rhs)
+        if lhs_value is not None and rhs_value is not None:
+            return constant_bool(lhs_value == rhs_value)
+        elif (isinstance(lhs, LiteralExpr) and isinstance(rhs, LiteralExpr)
+                and lhs.type == rhs.type and lhs.literal == rhs.literal
+                and lhs.literal == lhs.type.nullexpr()):
+            return constant_bool(True)
+
+        return BasicExpr(Eq.TEMPLATE, BoolType, [lhs, rhs])
 
     def __init__(self, lhs, rhs):
         """
@@ -173,6 +247,13 @@ class OrderingTest(AbstractExpression):
         GE: '>=',
     }
 
+    OPERATOR_FUNC = {
+        LT: lambda l, r: l < r,
+        LE: lambda l, r: l <= r,
+        GT: lambda l, r: l > r,
+        GE: lambda l, r: l >= r,
+    }
+
     class Expr(ResolvedExpression):
         static_type = BoolType
         pretty_class_name = 'OrdTest'
@@ -197,6 +278,16 @@ class OrderingTest(AbstractExpression):
                 self.rhs.render_expr()
             )
 
+        def _cse_key(self):
+            keys = (self.lhs.cse_key, self.rhs.cse_key)
+            return (None
+                    if None in keys else
+                    (OrderingTest.Expr, self.operator) + keys)
+
+        @property
+        def sequential_subexprs(self):
+            return [self.lhs, self.rhs]
+
         @property
         def subexprs(self):
             return {'op': self.operator, 'lhs': self.lhs, 'rhs': self.rhs}
@@ -219,13 +310,22 @@ class OrderingTest(AbstractExpression):
         """
         Construct a resolved expression for this.
 
-        :rtype: OrderingTest.Expr
+        :rtype: ResolvedExpression
         """
-        return OrderingTest.Expr(self.operator, *[
+        lhs, rhs = [
             construct(e, LongType,
                       "Comparisons only work on scalars, not {expr_type}")
             for e in (self.lhs, self.rhs)
-        ])
+        ]
+
+        lhs_value, rhs_value = constant_value(lhs), constant_value(rhs)
+        if lhs_value is not None and rhs_value is not None:
+            return constant_bool(
+                OrderingTest.OPERATOR_FUNC[self.operator](lhs_value,
+                                                          rhs_value)
+            )
+
+        return OrderingTest.Expr(self.operator, lhs, rhs)
 
 
 class If(AbstractExpression):
@@ -264,6 +364,13 @@ class If(AbstractExpression):
         def _render_expr(self):
             return self.result_var.name.camel_with_underscores
 
+        def _owned_var(self):
+            return self.result_var
+
+        @property
+        def sequential_subexprs(self):
+            return [self.cond]
+
         @property
         def subexprs(self):
             return {'0-cond': self.cond,
@@ -273,6 +380,22 @@ class If(AbstractExpression):
         def __repr__(self):
             return '<If.Expr>'
 
+    @staticmethod
+    def make_expr(cond, then, else_then, rtype):
+        """
+        Create a resolved expression for a conditional expression. If "cond"
+        is constant, just return the branch it selects.
+
+        See If.Expr's constructor for the parameters.
+
+        :rtype: ResolvedExpression
+        """
+        cond_value = constant_value(cond)
+        if cond_value is None:
+            return If.Expr(cond, then, else_then, rtype)
+        else:
+            return then if cond_value else else_then
+
     def __init__(self, cond, then, else_then):
         """
         :param cond: A boolean expression.
@@ -309,7 +432,8 @@ class If(AbstractExpression):
         if else_then != rtype:
             else_then = BuiltinCallExpr(rtype.name(), rtype, [else_then])
 
-        return If.Expr(construct(self.cond, BoolType), then, else_then, rtype)
+        return If.make_expr(construct(self.cond, BoolType), then, else_then,
+                            rtype)
 
 
 class Not(AbstractExpression):
@@ -324,12 +448,30 @@ class Not(AbstractExpression):
         super(Not, self).__init__()
         self.expr = expr
 
+    TEMPLATE = 'not ({})'
+
     def construct(self):
         return Not.make_expr(construct(self.expr, BoolType))
 
+    @staticmethod
+    def negated_expr(expr):
+        """
+        If "expr" is a "not" expression that "make_expr" created, return its
+        operand. Return None otherwise.
+
+        :param ResolvedExpression expr: Expression to inspect.
+        :rtype: ResolvedExpression|None
+        """
+        return (expr.operands[0]
+                if type(expr) is BasicExpr and expr.template == Not.TEMPLATE
+                else None)
+
     @staticmethod
     def make_expr(expr):
-        return BasicExpr('not ({})', BoolType, [expr])
+        value = constant_value(expr)
+        return (BasicExpr(Not.TEMPLATE, BoolType, [expr])
+                if value is None else
+                constant_bool(not value))
 
     @property
     def subexprs(self):
@@ -370,6 +512,13 @@ class Then(AbstractExpression):
         def _render_expr(self):
             return self.result_var.name.camel_with_underscores
 
+        def _owned_var(self):
+            return self.result_var
+
+        @property
+        def sequential_subexprs(self):
+            return [self.expr]
+
         @property
         def subexprs(self):
             return {'0-prefix': self.expr,
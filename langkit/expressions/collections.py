@@ -11,7 +11,7 @@ from langkit.diagnostics import (
 from langkit.expressions.base import (
     AbstractExpression, AbstractVariable, BuiltinCallExpr, PropertyDef,
     ResolvedExpression, attr_expr, attr_call, auto_attr_custom, auto_attr,
-    construct, render, unsugar
+    construct, ignore, render, unsugar
 )
 
 
@@ -173,6 +173,7 @@ class Contains(CollectionExpression):
 @attr_call('map', filter_expr=lambda x: None)
 @attr_call('mapcat', filter_expr=lambda x: None, concat=True)
 @attr_call('take_while', lambda x: x, lambda x: None, False)
+@attr_call('take', lambda x: x, lambda x: None, False, lambda x: None)
 class Map(CollectionExpression):
     """
     Abstract expression that is the result of a map expression evaluation.
@@ -184,10 +185,11 @@ class Map(CollectionExpression):
         code.
         """
         pretty_class_name = 'Map'
+        is_loop = True
 
         def __init__(self, list_element_var, element_var, index_var,
                      collection, expr, iter_scope, filter=None, concat=False,
-                     take_while=None):
+                     take_while=None, take_count=None):
             """
             :type list_element_var: VarExpr|None
             :type element_var: VarExpr
@@ -198,8 +200,10 @@ class Map(CollectionExpression):
             :type filter: ResolvedExpression
             :type concat: bool
             :type take_while: ResolvedExpression
+            :type take_count: ResolvedExpression
             """
             self.take_while = take_while
+            self.take_count = take_count
             self.list_element_var = list_element_var
             self.element_var = element_var
             self.index_var = index_var
@@ -209,6 +213,15 @@ class Map(CollectionExpression):
             self.concat = concat
             self.iter_scope = iter_scope
 
+            self.producer = None
+            """
+            If the collection for this map was fused with it, map expression
+            for this collection, None otherwise. See
+            fuse_collection_pipelines.
+
+            :type: Map.Expr|None
+            """
+
             element_type = (self.expr.type.element_type()
                             if self.concat else
                             self.expr.type)
@@ -236,6 +249,24 @@ class Map(CollectionExpression):
         def _render_expr(self):
             return self.array_var.name.camel_with_underscores
 
+        def _owned_var(self):
+            return self.array_var
+
+        @property
+        def sequential_subexprs(self):
+            return ([self.take_count] if self.take_count else []) + [
+                self.collection
+            ]
+
+        def make_producer(self):
+            """
+            Make this map expression a producer for the expression that
+            consumes its result: the items it computes are consumed as soon as
+            they are computed, and the array that holds its result is never
+            built.
+            """
+            PropertyDef.get().vars.remove(self.array_var)
+
         @property
         def subexprs(self):
             result = {'collection': self.collection, 'expr': self.expr}
@@ -243,6 +274,8 @@ class Map(CollectionExpression):
                 result['take_while'] = self.take_while
             if self.filter:
                 result['filter'] = self.filter
+            if self.take_count:
+                result['take_count'] = self.take_count
             return result
 
         def _bindings(self):
@@ -250,7 +283,8 @@ class Map(CollectionExpression):
                     if var is not None]
 
     def __init__(self, collection, expr, filter_expr=lambda x: None,
-                 concat=False, take_while_pred=lambda x: None):
+                 concat=False, take_while_pred=lambda x: None,
+                 take_count=None):
         """
         See CollectionExpression for the other parameters.
 
@@ -267,12 +301,18 @@ class Map(CollectionExpression):
             induction variable and that returns a boolean expression which says
             whether to continue the map or not.
         :type take_while_pred: None|(AbstractExpression) -> AbstractExpression
+
+        :param take_count: If provided, integer expression for the maximum
+            number of items in the result. The map stops as soon as it has
+            computed this many items.
+        :type take_count: None|AbstractExpression
         """
         super(Map, self).__init__(collection, expr)
 
         self.filter_fn = filter_expr
 
         self.take_while_pred = take_while_pred
+        self.take_count = take_count
         self.concat = concat
         self.filter_expr = None
         self.take_while_expr = None
@@ -311,6 +351,10 @@ class Map(CollectionExpression):
             ' expected instead)'.format(expr.type.name())
         )
 
+        # The maximum number of items is computed once, before the iteration
+        take_count = (construct(self.take_count, LongType)
+                      if self.take_count is not None else None)
+
         with iter_scope.use():
             filter_expr = (construct(self.filter_expr, BoolType)
                            if self.filter_expr else None)
@@ -320,7 +364,7 @@ class Map(CollectionExpression):
 
         return Map.Expr(list_element_var, element_var, index_var,
                         collection_expr, expr, iter_scope, filter_expr,
-                        self.concat, take_while_expr)
+                        self.concat, take_while_expr, take_count)
 
 
 @auto_attr
@@ -354,6 +398,7 @@ class Quantifier(CollectionExpression):
     class Expr(ResolvedExpression):
         static_type = BoolType
         pretty_class_name = 'Quantifier'
+        is_loop = True
 
         def __init__(self, kind, collection, expr, list_element_var,
                      element_var, index_var, iter_scope):
@@ -394,6 +439,13 @@ class Quantifier(CollectionExpression):
             self.element_var = element_var
             self.index_var = index_var
             self.iter_scope = iter_scope
+            self.producer = None
+            """
+            See Map.Expr.producer.
+
+            :type: Map.Expr|None
+            """
+
             self.result_var = PropertyDef.get().vars.create_scopeless(
                 'Quantifier_Result', BoolType
             )
@@ -410,6 +462,10 @@ class Quantifier(CollectionExpression):
         def _render_expr(self):
             return self.result_var.name.camel_with_underscores
 
+        @property
+        def sequential_subexprs(self):
+            return [self.collection]
+
         @property
         def subexprs(self):
             return {'kind': self.kind,
@@ -465,6 +521,139 @@ class Quantifier(CollectionExpression):
                                iter_scope)
 
 
+@attr_call('find')
+@attr_expr('first')
+class Find(CollectionExpression):
+    """
+    Expression that returns the first item of a collection that satisfies a
+    predicate, or null if there is no such item. The iteration stops as soon as
+    it finds this item.
+    """
+
+    class Expr(ResolvedExpression):
+        pretty_class_name = 'Find'
+        is_loop = True
+
+        def __init__(self, collection, expr, list_element_var, element_var,
+                     index_var, iter_scope):
+            """
+            :param ResolvedExpression collection: Collection on which this find
+                operation works.
+
+            :param expr: A boolean expression to evaluate on the collection's
+                items. If None, the first item is returned.
+            :type expr: ResolvedExpression|None
+
+            :param list_element_var: When the collection is an AST list,
+                variable that holds the element we are currently processing
+                during the iteration, typed as root grammar type.  None
+                otherwise.
+            :type: ResolvedExpression|None
+
+            :param element_var: Variable to use in "expr".
+            :type element_var: ResolvedExpression
+
+            :param index_var: Index variable to use in "expr".
+            :type index_var: None|ResolvedExpression
+
+            :param iter_scope: Scope for local variables internal to the
+                iteration.
+            :type iter_scope: langkit.expressions.base.LocalVars.Scope
+            """
+            self.collection = collection
+            self.expr = expr
+            self.list_element_var = list_element_var
+            self.element_var = element_var
+            self.index_var = index_var
+            self.iter_scope = iter_scope
+            self.static_type = element_var.type
+            self.producer = None
+            """
+            See Map.Expr.producer.
+
+            :type: Map.Expr|None
+            """
+
+            self.result_var = PropertyDef.get().vars.create_scopeless(
+                'Find_Result', self.type
+            )
+            iter_scope.parent.add(self.result_var)
+
+            super(Find.Expr, self).__init__()
+
+        def _render_pre(self):
+            return render('properties/find_ada', find=self, Name=names.Name)
+
+        def _render_expr(self):
+            return self.result_var.name.camel_with_underscores
+
+        def _owned_var(self):
+            return self.result_var
+
+        @property
+        def sequential_subexprs(self):
+            return [self.collection]
+
+        @property
+        def subexprs(self):
+            result = {'collection': self.collection}
+            if self.expr:
+                result['expr'] = self.expr
+            return result
+
+        def _bindings(self):
+            return [var for var in [self.element_var, self.index_var]
+                    if var is not None]
+
+        def __repr__(self):
+            return '<Find.Expr>'
+
+    def __init__(self, collection, predicate=None):
+        """
+        See CollectionExpression for the other parameters.
+
+        :param predicate: If provided, function that takes an induction
+            variable and that returns a boolean expression which says whether
+            the item is the one to return. Otherwise, return the first item.
+        :type predicate: None|(AbstractExpression) -> AbstractExpression
+        """
+        # Without a predicate, the iteration expression is not used: it just
+        # binds the element variable.
+        super(Find, self).__init__(collection,
+                                   predicate or (lambda item: item))
+        self.has_predicate = predicate is not None
+
+    def do_prepare(self):
+        super(Find, self).do_prepare()
+        if not self.has_predicate:
+            ignore(self.element_var)
+
+    def construct(self):
+        """
+        Construct a resolved expression for this find expression.
+
+        :rtype: Find.Expr
+        """
+        (collection_expr,
+         expr,
+         list_element_var,
+         element_var,
+         index_var,
+         iter_scope) = self.construct_common()
+
+        if self.has_predicate:
+            check_source_language(
+                expr.type.matches(BoolType),
+                "Wrong type for expression in find: expected bool, "
+                "got {}".format(expr.type.name().camel)
+            )
+        else:
+            expr = None
+
+        return Find.Expr(collection_expr, expr, list_element_var,
+                         element_var, index_var, iter_scope)
+
+
 @auto_attr_custom("at")
 @auto_attr_custom("at_or_raise", or_null=False)
 def collection_get(coll_expr, index_expr, or_null=True):
@@ -500,10 +689,48 @@ def length(coll_expr):
     :param AbstractExpression coll_expr: The expression representing the
         collection to get from.
     """
-    return BuiltinCallExpr(
-        "Length", LongType,
-        [construct(coll_expr, lambda t: t.is_collection())]
-    )
+    return LengthExpr(construct(coll_expr, lambda t: t.is_collection()))
+
+
+class LengthExpr(BuiltinCallExpr):
+    """
+    Resolved expression that computes the length of a collection.
+    """
+
+    def __init__(self, collection):
+        """
+        :param ResolvedExpression collection: The collection to get the length
+            of.
+        """
+        self.collection = collection
+
+        self.producer = None
+        """
+        See Map.Expr.producer.
+
+        :type: Map.Expr|None
+        """
+
+        self.count_var = None
+        """
+        If this expression has a producer, variable that holds the number of
+        items it produced.
+
+        :type: langkit.expressions.base.LocalVars.LocalVar|None
+        """
+
+        super(LengthExpr, self).__init__('Length', LongType, [collection])
+
+    def _render_pre(self):
+        if self.producer:
+            return render('properties/length_ada', length=self,
+                          Name=names.Name)
+        return super(LengthExpr, self)._render_pre()
+
+    def _render_expr(self):
+        if self.producer:
+            return self.count_var.name.camel_with_underscores
+        return super(LengthExpr, self)._render_expr()
 
 
 @attr_expr('singleton')
@@ -542,6 +769,9 @@ class CollectionSingleton(AbstractExpression):
         def _render_expr(self):
             return self.array_var.name
 
+        def _owned_var(self):
+            return self.array_var
+
         @property
         def subexprs(self):
             return [self.expr]
@@ -560,7 +790,7 @@ class CollectionSingleton(AbstractExpression):
         expr = construct(self.expr)
         ret = CollectionSingleton.Expr(expr)
         if self.coerce_null:
-            return If.Expr(
+            return If.make_expr(
                 IsNull.construct_static(expr),
                 EmptyArray.construct_static(expr.type.array_type()),
                 ret,
@@ -606,3 +836,57 @@ class Concat(AbstractExpression):
         return BuiltinCallExpr(
             "Concat", array_1.type, [array_1, array_2], "Concat_Result"
         )
+
+
+def fuse_collection_pipelines(expr):
+    """
+    Optimization pass for the "expr" resolved expression tree: fuse map
+    expressions with the collection expressions that consume their result
+    (other map expressions, quantifiers, find expressions and length
+    computations). Fused map expressions do not build an array for their
+    result: the consumer runs its per-item code as soon as the map expression
+    computes an item.
+
+    Note that this changes the order in which items are evaluated: consumers
+    that stop early (quantifiers, find expressions, "take_while" and "take"
+    maps) also stop the evaluation of the items they did not consume.
+
+    This pass must run while the property that owns "expr" is bound.
+
+    :param ResolvedExpression expr: Root of the tree to optimize.
+    """
+    # Map expressions whose result is referenced more than once must be
+    # built, so count references.
+    ref_counts = {}
+    all_exprs = []
+
+    def visit(e):
+        ref_counts[e] = ref_counts.get(e, 0) + 1
+        if ref_counts[e] == 1:
+            all_exprs.append(e)
+            for sub in e.flat_subexprs:
+                visit(sub)
+
+    visit(expr)
+
+    for consumer in all_exprs:
+        if not isinstance(consumer, (Map.Expr, Quantifier.Expr, Find.Expr,
+                                     LengthExpr)):
+            continue
+
+        # The number of items that "take" maps produce depends on the number
+        # of items they already computed, which only the array tracks.
+        producer = consumer.collection
+        if not (isinstance(producer, Map.Expr)
+                and producer._result_var is None
+                and producer.take_count is None
+                and ref_counts[producer] == 1):
+            continue
+
+        producer.make_producer()
+        consumer.producer = producer
+        if isinstance(consumer, LengthExpr):
+            consumer.count_var = PropertyDef.get().vars.create_scopeless(
+                'Item_Count', LongType
+            )
+            producer.iter_scope.parent.add(consumer.count_var)
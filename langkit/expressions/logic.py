@@ -153,9 +153,14 @@ class Bind(AbstractExpression):
 
             return expr
 
+        PropertyDef.forbid_in_pure('bind logic variables')
+
         lhs = construct_operand(self.from_expr)
         rhs = construct_operand(self.to_expr)
 
+        # Binder packages are instantiated in the body of $.Analysis
+        PropertyDef.get().uses_body_helpers = True
+
         return BuiltinCallExpr(
             "Bind_{}_{}.Create".format(cprop_uid, eprop_uid),
             EquationType,
@@ -257,6 +262,7 @@ def domain(logic_var_expr, domain):
         derives from the root grammar class, or the root grammar class
         itself.
     """
+    PropertyDef.forbid_in_pure('bind logic variables')
     return DomainExpr(
         construct(domain, lambda d: d.is_collection(), "Type given "
                   "to LogicVar must be collection type, got {expr_type}"),
@@ -315,6 +321,7 @@ class Predicate(AbstractExpression):
              "The property passed to bind must belong to a subtype "
              "of {}".format(T.root_node.name().camel))
         ])
+        PropertyDef.forbid_in_pure('bind logic variables')
 
         exprs = [construct(e) for e in self.exprs]
 
@@ -378,6 +385,9 @@ class Predicate(AbstractExpression):
             ), type=None, operands=closure_exprs)
         )
 
+        # Predicate packages are instantiated in the body of $.Analysis
+        PropertyDef.get().uses_body_helpers = True
+
         return BuiltinCallExpr(
             "{}_Pred.Create".format(pred_id), EquationType, logic_var_exprs,
             result_var_name="Pred"
@@ -393,6 +403,7 @@ def get_value(logic_var):
     :param AbstractExpression logic_var: The logic var from which we want to
         extract the value.
     """
+    PropertyDef.forbid_in_pure('read logic variables')
     return BuiltinCallExpr(
         "Eq_Node.Refs.GetL", T.root_node.env_el(),
         [construct(logic_var, LogicVarType)]
@@ -414,6 +425,7 @@ def solve(equation):
 
     :param AbstractExpression equation: The equation to solve.
     """
+    PropertyDef.forbid_in_pure('solve equations')
     return BuiltinCallExpr("Solve", BoolType,
                            [construct(equation, EquationType)])
 
@@ -474,11 +486,13 @@ class LogicTrue(AbstractExpression):
     An equation that always return True.
     """
 
+    LITERAL = "True_Rel"
+
     def __init__(self):
         super(LogicTrue, self).__init__()
 
     def construct(self):
-        return LiteralExpr("True_Rel", type=EquationType,
+        return LiteralExpr(self.LITERAL, type=EquationType,
                            result_var_name="Logic_True")
 
 
@@ -487,9 +501,27 @@ class LogicFalse(AbstractExpression):
     An equation that always return False.
     """
 
+    LITERAL = "False_Rel"
+
     def __init__(self):
         super(LogicFalse, self).__init__()
 
     def construct(self):
-        return LiteralExpr("False_Rel", type=EquationType,
+        return LiteralExpr(self.LITERAL, type=EquationType,
                            result_var_name="Logic_False")
+
+
+def is_constant_equation(expr, value):
+    """
+    Return whether "expr" is the resolved expression for LogicTrue (if "value"
+    is True) or for LogicFalse (if "value" is False).
+
+    :param ResolvedExpression expr: Expression to test.
+    :param bool value: Result of the constant equation to look for.
+    :rtype: bool
+    """
+    return (isinstance(expr, LiteralExpr)
+            and expr.static_type is EquationType
+            and expr.literal == (LogicTrue.LITERAL
+                                 if value else
+                                 LogicFalse.LITERAL))
@@ -9,10 +9,10 @@ from langkit.diagnostics import Severity, check_source_language
 from langkit.expressions.analysis_units import construct_analysis_unit_property
 from langkit.expressions.base import (
     AbstractExpression, AbstractVariable, BindingScope, LiteralExpr, Let,
-    PropertyDef, ResolvedExpression, UnreachableExpr, attr_call, attr_expr,
-    construct, render
+    PropertyDef, ResolvedExpression, Self, attr_call, attr_expr, construct,
+    count_references, render
 )
-from langkit.expressions.boolean import Eq, If, Not
+from langkit.expressions.boolean import Eq, If, Not, Then, constant_value
 from langkit.expressions.envs import Env
 from langkit.utils import TypeSet
 
@@ -42,6 +42,12 @@ class Cast(AbstractExpression):
             self.expr = expr
             self.static_type = dest_type
 
+            # Whether the generated code must check the kind of the node to
+            # cast. Upcasts always succeed. See also eliminate_safety_checks.
+            self.type_check = not issubclass(
+                self.node_type(expr.type), self.node_type(dest_type)
+            )
+
             p = PropertyDef.get()
             self.expr_var = p.vars.create('Cast_Expr', self.expr.type)
             self.result_var = (result_var or
@@ -56,6 +62,17 @@ class Cast(AbstractExpression):
 
             super(Cast.Expr, self).__init__()
 
+        @staticmethod
+        def node_type(t):
+            """
+            Return the AST node type that values of type "t", an AST node or
+            env element type, designate.
+
+            :param CompiledType t: Type parameter.
+            :rtype: ASTNode
+            """
+            return t.el_type if t.is_env_element_type else t
+
         def _render_pre(self):
             # Before actually downcasting an access to an AST node, add a type
             # check so that we raise a Property_Error if it's wrong.
@@ -64,6 +81,16 @@ class Cast(AbstractExpression):
         def _render_expr(self):
             return self.result_var.name
 
+        def _cse_key(self):
+            expr_key = self.expr.cse_key
+            return (None
+                    if expr_key is None else
+                    (Cast.Expr, self.static_type, self.do_raise, expr_key))
+
+        @property
+        def sequential_subexprs(self):
+            return [self.expr]
+
         @property
         def subexprs(self):
             return {'expr': self.expr, 'type': self.static_type.name()}
@@ -136,6 +163,24 @@ class IsNull(AbstractExpression):
             cexpr, LiteralExpr(cexpr.type.nullexpr(), cexpr.type)
         )
 
+    @staticmethod
+    def tested_expr(expr):
+        """
+        If "expr" is a null test that "construct_static" created, return the
+        expression it tests. Return None otherwise.
+
+        :param ResolvedExpression expr: Expression to inspect.
+        :rtype: ResolvedExpression|None
+        """
+        operands = Eq.compared_exprs(expr)
+        if operands is None:
+            return None
+        lhs, rhs = operands
+        return (lhs
+                if (isinstance(rhs, LiteralExpr)
+                    and rhs.literal == lhs.type.nullexpr()) else
+                None)
+
     def construct(self):
         """
         Construct a resolved expression for this.
@@ -196,9 +241,15 @@ class New(AbstractExpression):
         """
 
         def __init__(self, astnode, assocs):
+            PropertyDef.forbid_in_pure('synthesize nodes')
+
             p = PropertyDef.get()
             self.result_var = p.vars.create('New_Node', astnode)
 
+            # Registering the new node for destruction uses a helper that is
+            # declared in the body of $.Analysis.
+            p.uses_body_helpers = True
+
             super(New.NodeExpr, self).__init__(astnode, assocs)
 
         def _render_pre(self):
@@ -318,6 +369,15 @@ class FieldAccess(AbstractExpression):
             self.simple_field_access = False
             self.implicit_deref = implicit_deref
 
+            # Whether the generated code must check that the receiver is not
+            # null. See eliminate_safety_checks.
+            self.null_check = True
+
+            # If not None, node type whose implementation of the called
+            # property is known to be the one to call, so that the call does
+            # not need to dispatch. See devirtualize_property_calls.
+            self.static_node_type = None
+
             # After EnvSpec.create_properties has been run, expressions in
             # environment specifications only allow field accesses. These are
             # not evaluated in a property context, so they cannot create local
@@ -354,7 +414,8 @@ class FieldAccess(AbstractExpression):
             # Property_Error in the case it is.
             return '{}\n{}'.format(
                 render('properties/null_safety_check_ada',
-                       expr=self.receiver_expr, result_var=self.prefix_var)
+                       expr=self.receiver_expr, result_var=self.prefix_var,
+                       check=self.null_check)
                 if not get_context().no_property_checks
                 else '',
                 '\n'.join(arg.render_pre() for arg in self.arguments)
@@ -369,6 +430,12 @@ class FieldAccess(AbstractExpression):
             if self.implicit_deref:
                 prefix = "{}.El".format(prefix)
 
+            # Calls on a specific type view of the prefix are not dispatching
+            if self.static_node_type:
+                prefix = "{} ({}.all)".format(
+                    self.static_node_type.value_type_name(), prefix
+                )
+
             ret = "{}.{}".format(prefix, self.node_data.name)
 
             # If we're calling a property, then pass the arguments
@@ -400,6 +467,26 @@ class FieldAccess(AbstractExpression):
 
             return ret
 
+        def _cse_key(self):
+            # Only fields and pure properties are known to be free of side
+            # effects. Calls that pass the implicit environment depend on more
+            # than their operands.
+            prop = self.node_data if self.node_data.is_property else None
+            if prop and (not prop.pure or prop.has_implicit_env):
+                return None
+
+            operand_keys = tuple(
+                e.cse_key for e in [self.receiver_expr] + list(self.arguments)
+            )
+            if None in operand_keys:
+                return None
+            return (FieldAccess.Expr, self.node_data,
+                    self.implicit_deref) + operand_keys
+
+        @property
+        def sequential_subexprs(self):
+            return [self.receiver_expr] + list(self.arguments)
+
         @property
         def subexprs(self):
             result = {'0-prefix': self.receiver_expr,
@@ -473,6 +560,11 @@ class FieldAccess(AbstractExpression):
             '{} is for internal use only'.format(to_get.qualname)
         )
 
+        if to_get.is_property and PropertyDef.get() and not to_get.pure:
+            PropertyDef.forbid_in_pure(
+                'call {}, which is not pure'.format(to_get.qualname)
+            )
+
         # If the field is a property that take an implicit env argument, make
         # sure we have one to provide.
         check_source_language(
@@ -507,6 +599,11 @@ class FieldAccess(AbstractExpression):
             )
         ]
 
+        # Keep track of the call graph for dead code elimination
+        current_prop = PropertyDef.get()
+        if to_get.is_property and current_prop:
+            current_prop.called_properties.add(to_get)
+
         ret = FieldAccess.Expr(receiver_expr, to_get, arg_exprs, is_deref)
         return ret
 
@@ -528,6 +625,246 @@ class FieldAccess(AbstractExpression):
         return "<FieldAccess {} {}>".format(self.receiver, self.field)
 
 
+def devirtualize_property_calls(expr):
+    """
+    Optimization pass for the "expr" resolved expression tree: turn calls to
+    dispatching properties into direct calls when no subclass of the prefix
+    type overrides the called property. In this case, the implementation to
+    call does not depend on the kind of the prefix node.
+
+    :param ResolvedExpression expr: Root of the tree to optimize.
+    """
+    visited = set()
+
+    def is_overriden(node_type, prop):
+        """
+        Return whether a subclass of "node_type" overrides "prop".
+        """
+        for subcls in node_type.subclasses:
+            for p in subcls.get_properties(include_inherited=False):
+                if p._name == prop._name:
+                    return True
+            if is_overriden(subcls, prop):
+                return True
+        return False
+
+    def visit(e):
+        if e in visited:
+            return
+        visited.add(e)
+
+        if (isinstance(e, FieldAccess.Expr)
+                and e.node_data.is_property
+                and e.node_data.dispatching
+                and not e.node_data.abstract
+                and not e.simple_field_access
+                and not e.implicit_deref
+                and not is_overriden(e.receiver_expr.type, e.node_data)):
+            e.static_node_type = e.receiver_expr.type
+
+        for sub in e.flat_subexprs:
+            visit(sub)
+
+    visit(expr)
+
+
+def eliminate_safety_checks(expr):
+    """
+    Optimization pass for the "expr" resolved expression tree: remove the null
+    checks on field access receivers and match prefixes, and the kind checks on
+    casts, that cannot fail at the point where they are evaluated.
+
+    To do so, track facts about values that are free of side effects (see
+    ResolvedExpression.cse_key): whether they are known not to be null, and the
+    node kinds they are known to have if they are not null. Facts come from:
+
+    * Self, which is never null in a property;
+    * checks that were evaluated before: after a null check passed, the value
+      is not null anymore;
+    * null and kind tests in the condition of If expressions, for the branch
+      that they select;
+    * the variables that Then and Match expressions bind.
+
+    This pass must run while the property that owns "expr" is bound.
+
+    :param ResolvedExpression expr: Root of the tree to optimize.
+    """
+    from langkit.compile_context import get_context
+
+    context = get_context()
+    if context.no_property_checks:
+        return
+
+    # Expressions that appear several times in the tree can be rendered in
+    # places where the facts are different, so leave them alone.
+    ref_counts = count_references(expr)
+
+    class Facts(object):
+        """
+        Facts that hold at some point in the evaluation of "expr".
+        """
+
+        def __init__(self, non_null=None, kinds=None):
+            self.non_null = set(non_null or [])
+            """
+            Keys for the access values that are known not to be null.
+            :type: set[tuple]
+            """
+
+            self.kinds = dict(kinds or {})
+            """
+            For values whose kind is known, map their keys to the list of AST
+            node types they can belong to, if they are not null.
+            :type: dict[tuple, list[ASTNode]]
+            """
+
+        def copy(self):
+            return Facts(self.non_null, self.kinds)
+
+        def add(self, expr, non_null=True, kinds=None):
+            key = expr.cse_key
+            if key is None:
+                return
+            if non_null and expr.type.is_ptr:
+                self.non_null.add(key)
+            if kinds is not None:
+                self.kinds[key] = kinds
+
+        def alias(self, var, expr):
+            """
+            Make the facts about "expr" hold for "var", which holds the same
+            value.
+            """
+            key = expr.cse_key
+            self.add(var, key in self.non_null, self.kinds.get(key))
+
+        def is_non_null(self, expr):
+            key = expr.cse_key
+            return key is not None and key in self.non_null
+
+        def has_kind(self, expr, node_type):
+            """
+            Return whether "expr" is known to be either null or a "node_type"
+            node.
+            """
+            kinds = self.kinds.get(expr.cse_key)
+            return kinds is not None and all(issubclass(k, node_type)
+                                             for k in kinds)
+
+    def cond_facts(cond, value, facts):
+        """
+        Add to "facts" what we know when "cond" evaluates to "value".
+        """
+        negated = Not.negated_expr(cond)
+        tested = IsNull.tested_expr(cond)
+
+        if negated is not None:
+            cond_facts(negated, not value, facts)
+
+        elif tested is not None:
+            if not value:
+                facts.add(tested)
+
+        elif isinstance(cond, IsA.Expr):
+            if value:
+                facts.add(cond.expr, kinds=cond.astnodes)
+
+        elif isinstance(cond, If.Expr):
+            # "A and B" is lowered to "if A then B else False", and "A or B"
+            # to "if A then True else B".
+            if value and constant_value(cond.else_then) is False:
+                cond_facts(cond.cond, True, facts)
+                cond_facts(cond.then, True, facts)
+            elif not value and constant_value(cond.then) is True:
+                cond_facts(cond.cond, False, facts)
+                cond_facts(cond.else_then, False, facts)
+
+    def visit(e, facts):
+        """
+        Remove the checks in "e" that "facts" make useless, and add to "facts"
+        what we know after "e" is evaluated.
+
+        :param ResolvedExpression e: Expression to process.
+        :param Facts facts: What we know when "e" starts being evaluated.
+        """
+        if ref_counts[e] > 1 or e._reused_expr:
+            return
+
+        if isinstance(e, FieldAccess.Expr):
+            visit(e.receiver_expr, facts)
+            if not e.simple_field_access and e.receiver_expr.type.is_ptr:
+                if facts.is_non_null(e.receiver_expr):
+                    e.null_check = False
+                    context.removed_null_checks += 1
+                facts.add(e.receiver_expr)
+            for arg in e.arguments:
+                visit(arg, facts)
+
+        elif isinstance(e, Cast.Expr):
+            visit(e.expr, facts)
+            dest_type = e.node_type(e.static_type)
+            if e.type_check and facts.has_kind(e.expr, dest_type):
+                e.type_check = False
+                context.removed_type_checks += 1
+
+            # Casting a non-null value yields a non-null value, unless the
+            # cast can return null on a kind mismatch.
+            if facts.is_non_null(e.expr) and (e.do_raise or not e.type_check):
+                facts.add(e)
+
+            # Once a raising cast has succeeded, the casted value is known to
+            # be either null or of the destination type.
+            if e.do_raise:
+                facts.add(e.expr, non_null=False, kinds=[dest_type])
+
+        elif isinstance(e, If.Expr):
+            visit(e.cond, facts)
+            for branch, value in [(e.then, True), (e.else_then, False)]:
+                branch_facts = facts.copy()
+                cond_facts(e.cond, value, branch_facts)
+                visit(branch, branch_facts)
+
+        elif isinstance(e, Then.Expr):
+            visit(e.expr, facts)
+            then_facts = facts.copy()
+            then_facts.alias(e.var_expr, e.expr)
+            then_facts.add(e.expr)
+            then_facts.add(e.var_expr)
+            visit(e.then_expr, then_facts)
+            visit(e.default_expr, facts.copy())
+
+        elif isinstance(e, Let.Expr):
+            for var, var_expr in zip(e.vars, e.var_exprs):
+                visit(var_expr, facts)
+                facts.alias(var, var_expr)
+            visit(e.expr, facts)
+
+        elif isinstance(e, Match.Expr):
+            visit(e.prefix_var, facts)
+            if facts.is_non_null(e.prefix_var):
+                e.null_check = False
+                context.removed_null_checks += 1
+            facts.add(e.prefix_var)
+            for kinds, match_var, match_expr in e.matchers:
+                match_facts = facts.copy()
+                match_facts.add(e.prefix_var, kinds=kinds)
+                match_facts.add(match_var, kinds=kinds)
+                visit(match_expr, match_facts)
+
+        else:
+            sequential = e.sequential_subexprs
+            for sub in sequential:
+                visit(sub, facts)
+            for sub in e.flat_subexprs:
+                if not any(sub is s for s in sequential):
+                    visit(sub, facts.copy())
+
+    facts = Facts()
+    with Self.bind_type(PropertyDef.get().struct):
+        facts.add(construct(Self))
+    visit(expr, facts)
+
+
 @attr_call("is_a")
 class IsA(AbstractExpression):
     """
@@ -549,16 +886,27 @@ class IsA(AbstractExpression):
                              if a.is_env_element_type
                              else a for a in astnodes]
 
+            # If the static type of "expr" already guarantees that the node is
+            # one of "astnodes", the kind test reduces to a null check.
+            node_type = (expr.type.el_type
+                         if expr.type.is_env_element_type else
+                         expr.type)
+            self.static_match = any(issubclass(node_type, a)
+                                    for a in self.astnodes)
+
             super(IsA.Expr, self).__init__()
 
         def _render_pre(self):
             return self.expr.render_pre()
 
         def _render_expr(self):
-            target = ("{}.El.all"
-                      if self.expr.type.is_env_element_type
-                      else "{}.all")
-            return (target + " in {}").format(
+            node = ("{}.El"
+                    if self.expr.type.is_env_element_type
+                    else "{}")
+            if self.static_match:
+                return (node + " /= null").format(self.expr.render_expr())
+
+            return (node + ".all in {}").format(
                 self.expr.render_expr(),
                 " | ".join(
                     "{}_Type'Class".format(a.name().camel_with_underscores)
@@ -566,6 +914,16 @@ class IsA(AbstractExpression):
                 )
             )
 
+        def _cse_key(self):
+            expr_key = self.expr.cse_key
+            return (None
+                    if expr_key is None else
+                    (IsA.Expr, tuple(self.astnodes), expr_key))
+
+        @property
+        def sequential_subexprs(self):
+            return [self.expr]
+
         @property
         def subexprs(self):
             return {'expr': self.expr,
@@ -622,6 +980,117 @@ class Match(AbstractExpression):
     Will return n.foo for a node "n" that is a SomeNodeType.
     """
 
+    class Expr(ResolvedExpression):
+        """
+        Resolved expression for a match expression.
+
+        Rather than testing the matched value against each matcher type in
+        turn, this dispatches once on its node kind.
+        """
+
+        pretty_class_name = 'Match'
+
+        def __init__(self, prefix_var, matchers, rtype):
+            """
+            :param ResolvedExpression prefix_var: Variable that holds the
+                value to match.
+            :param matchers: For each matcher, the list of concrete node types
+                it handles, the variable to bind to the matched value and the
+                expression to evaluate.
+            :type matchers: list[(list[ASTNode], ResolvedExpression,
+                                  ResolvedExpression)]
+            :param langkit.compiled_types.CompiledType rtype: Type parameter.
+                The type that all matcher expressions return.
+            """
+            self.prefix_var = prefix_var
+            self.matchers = matchers
+            self.static_type = rtype
+
+            # Whether the generated code must check that the matched value is
+            # not null. See eliminate_safety_checks.
+            self.null_check = True
+            self.result_var = PropertyDef.get().vars.create('Match_Result',
+                                                            rtype)
+
+            # Rendering depends on the whole AST node type hierarchy, not only
+            # on the types that matchers reference: compute what it needs now
+            # so that it is part of the property cache key (see
+            # PropertyDef.rendering_key).
+            self.choices = [self.kind_choices(kinds) if kinds else None
+                            for kinds, _, _ in matchers]
+            """
+            For each matcher, Ada choices for the case statement alternative
+            that handles it, or None if it is unreachable.
+
+            :type: list[str|None]
+            """
+
+            self.covers_all_kinds = self._covers_all_kinds(matchers)
+            """
+            Whether matchers handle all concrete node kinds, and not only the
+            ones the matched value can have.
+
+            :type: bool
+            """
+
+            super(Match.Expr, self).__init__()
+
+        def _render_pre(self):
+            return render('properties/match_ada', expr=self)
+
+        def _render_expr(self):
+            return self.result_var.name.camel_with_underscores
+
+        def _owned_var(self):
+            return self.result_var
+
+        @property
+        def sequential_subexprs(self):
+            return [self.prefix_var]
+
+        @property
+        def subexprs(self):
+            return {'0-prefix': self.prefix_var,
+                    '1-matchers': [expr for _, _, expr in self.matchers]}
+
+        def __repr__(self):
+            return '<Match.Expr>'
+
+        @staticmethod
+        def kind_choices(kinds):
+            """
+            Return the Ada choices to use in a case statement alternative so
+            that it handles the given node kinds.
+
+            :param list[ASTNode] kinds: List of concrete AST node types.
+            :rtype: str
+            """
+            from langkit.compile_context import get_context
+
+            # Use the subtype for an abstract node when there is one that
+            # matches exactly these kinds, so that cases over large
+            # hierarchies stay readable.
+            for cls in get_context().astnode_types:
+                subclasses = cls.concrete_subclasses()
+                if (cls.abstract and subclasses
+                        and set(subclasses) == set(kinds)):
+                    return cls.ada_kind_name()
+            return ' | '.join(k.ada_kind_name() for k in kinds)
+
+        @staticmethod
+        def _covers_all_kinds(matchers):
+            """
+            Return whether the given matchers handle all concrete node kinds.
+
+            :param matchers: See the constructor.
+            :rtype: bool
+            """
+            from langkit.compile_context import get_context
+            handled = set(sum((kinds for kinds, _, _ in matchers), []))
+            return all(t in handled
+                       for t in get_context().astnode_types
+                       if not t.abstract)
+
     def __init__(self, expr, *matchers):
         """
         :param AbstractExpression expr: The expression to match.
@@ -827,33 +1296,46 @@ class Match(AbstractExpression):
             )
             rtype = expr.type.unify(rtype)
 
-        # This is the expression execution will reach if we have a bug in our
-        # code (i.e. if matchers did not cover all cases).
-        result = UnreachableExpr(rtype)
-
-        # Wrap this "failing" expression with all the cases to match in the
-        # appropriate order, so that in the end the first matchers are tested
-        # first.
-        for match_var, expr in reversed(constructed_matchers):
-            casted = Cast.Expr(matched_var,
-                               match_var.type,
-                               result_var=match_var)
-            guard = Not.make_expr(
-                Eq.make_expr(
-                    casted, LiteralExpr(casted.type.nullexpr(), casted.type)
-                )
-            )
+        # Compute the set of concrete node kinds each matcher handles. As
+        # matchers are tried in order, a kind goes to the first matcher whose
+        # type includes it.
+        input_node_type = (matched_expr.type.el_type
+                           if matched_expr.type.is_env_element_type else
+                           matched_expr.type)
+        remaining_kinds = self._concrete_kinds(input_node_type)
+        kind_matchers = []
+        for match_var, expr in constructed_matchers:
+            node_type = (match_var.type.el_type
+                         if match_var.type.is_env_element_type else
+                         match_var.type)
+            kinds = [k for k in self._concrete_kinds(node_type)
+                     if k in remaining_kinds]
+            remaining_kinds = [k for k in remaining_kinds if k not in kinds]
+
             if expr.type != rtype:
                 # We already checked that type matches, so only way this is
                 # true is if expr.type is an ASTNode type derived from
                 # rtype. In that case, we need an explicity upcast.
                 expr = Cast.Expr(expr, rtype)
 
-            result = If.Expr(guard, expr, result, rtype)
+            kind_matchers.append((kinds, match_var, expr))
 
         return Let.Expr(
             [matched_var],
             [matched_expr],
-            BindingScope(result,
+            BindingScope(Match.Expr(matched_var, kind_matchers, rtype),
                          [construct(var) for _, var, _ in self.matchers])
         )
+
+    @staticmethod
+    def _concrete_kinds(node_type):
+        """
+        Return the list of concrete AST node types that derive from
+        "node_type", including "node_type" itself if it is concrete.
+
+        :param ASTNode node_type: Type parameter.
+        :rtype: list[ASTNode]
+        """
+        from langkit.compile_context import get_context
+        return [t for t in get_context().astnode_types
+                if not t.abstract and issubclass(t, node_type)]
@@ -11,9 +11,13 @@ import pipes
 import shutil
 import subprocess
 import sys
+import threading
+import time
 
+from langkit import caching
 from langkit.compile_context import Verbosity
 from langkit.diagnostics import Diagnostics, DiagnosticError, print_context
+from langkit.profiling import PassProfiler
 from langkit.utils import Colors, col, printcol
 
 
@@ -106,6 +110,50 @@ def get_cpu_count():
         return 1
 
 
+class BuildJob(object):
+    """
+    Command to run as part of a build. Independent jobs run concurrently: see
+    ManageScript.run_jobs.
+    """
+
+    def __init__(self, name, argv, library_type, deps=None):
+        """
+        :param str name: Name for this job, used in messages.
+        :param list[str] argv: Arguments for the command to run.
+        :param str library_type: Library type ("relocatable" or "static")
+            this job builds.
+        :param list[BuildJob]|None deps: Jobs that must complete successfully
+            before this one can start.
+        """
+        self.name = name
+        self.argv = argv
+        self.library_type = library_type
+        self.deps = deps or []
+
+        self.done = threading.Event()
+        """
+        Event set when this job is over (or skipped).
+        """
+
+        self.error = None
+        """
+        If this job could not complete successfully, error message for it.
+
+        :type: str|None
+        """
+
+        self.duration = None
+        """
+        If this job was run, time it took to complete, in seconds.
+
+        :type: float|None
+        """
+
+    @property
+    def success(self):
+        return self.duration is not None and self.error is None
+
+
 class ManageScript(object):
 
     BUILD_MODES = ('dev', 'prod')
@@ -237,6 +285,7 @@ class ManageScript(object):
             self.do_generate, True
         )
         self.add_generate_args(generate_parser)
+        self.add_jobs_arg(generate_parser)
 
         #########
         # Build #
@@ -253,6 +302,23 @@ class ManageScript(object):
         self.add_generate_args(make_parser)
         self.add_build_args(make_parser)
 
+        #########
+        # Watch #
+        #########
+
+        self.watch_parser = watch_parser = create_parser(self.do_watch)
+        self.add_generate_args(watch_parser)
+        self.add_build_args(watch_parser)
+        watch_parser.add_argument(
+            '--build', action='store_true',
+            help='Also build the generated library after each generation'
+        )
+        watch_parser.add_argument(
+            '--poll-interval', type=float, default=1.0, metavar='SECONDS',
+            help='Time to wait between two checks for changes (default: 1'
+                 ' second)'
+        )
+
         ###########
         # Install #
         ###########
@@ -309,6 +375,19 @@ class ManageScript(object):
             '--no-compile-quex', help="Don't compile the quex lexer",
             action='store_true',
         )
+        subparser.add_argument(
+            '--quex-cache-dir', metavar='DIR',
+            default=(os.environ.get('LANGKIT_QUEX_CACHE_DIR')
+                     or caching.user_cache_dir('quex')),
+            help='Directory in which to keep the lexer sources that Quex'
+                 ' generates, so that other builds can reuse them (default:'
+                 ' $LANGKIT_QUEX_CACHE_DIR or ~/.cache/langkit/quex)'
+        )
+        subparser.add_argument(
+            '--no-quex-cache', action='store_true',
+            help="Don't use the cache for the lexer sources that Quex"
+                 " generates"
+        )
         subparser.add_argument(
             '--check-only', help="Only check the input for errors, don't"
             "generate the code",
@@ -319,10 +398,27 @@ class ManageScript(object):
             help="Don't generate runtime checks for properties",
             action='store_true'
         )
+        subparser.add_argument(
+            '--separate-properties', action='store_true',
+            help='Emit the bodies of properties in separate units, so that'
+                 ' they can be compiled in parallel'
+        )
+        subparser.add_argument(
+            '--eliminate-dead-code', action='store_true',
+            help="Don't emit private properties that nothing can call, nor"
+                 " the types that only these properties use"
+        )
+        subparser.add_argument(
+            '--profile-passes', nargs='?', const='langkit-passes.json',
+            metavar='FILE',
+            help='Measure the time and memory spent in each compilation pass,'
+                 ' AST node type, property and template, write them to a JSON'
+                 ' file (default: "langkit-passes.json") and print a summary'
+        )
 
-    def add_build_args(self, subparser):
+    def add_jobs_arg(self, subparser):
         """
-        Add arguments to tune code compilation to "subparser".
+        Add the argument that controls parallelism to "subparser".
 
         :type subparser: argparse.ArgumentParser
         """
@@ -331,6 +427,14 @@ class ManageScript(object):
             help='Number of parallel jobs to spawn in parallel '
                  '(default: your number of cpu)'
         )
+
+    def add_build_args(self, subparser):
+        """
+        Add arguments to tune code compilation to "subparser".
+
+        :type subparser: argparse.ArgumentParser
+        """
+        self.add_jobs_arg(subparser)
         subparser.add_argument(
             '--build-mode', '-b', choices=list(self.BUILD_MODES),
             default='dev',
@@ -513,12 +617,32 @@ class ManageScript(object):
                 "Generating source for {} ...".format(self.lib_name.lower()),
                 Colors.HEADER
             )
+        if args.profile_passes:
+            self.context.profiler = PassProfiler()
+
         self.context.emit(file_root=self.dirs.build_dir(),
                           main_programs=self.main_programs,
                           annotate_fields_types=args.annotate_fields_types,
                           generate_lexer=not args.no_compile_quex,
                           compile_only=args.check_only,
-                          no_property_checks=args.no_property_checks)
+                          no_property_checks=args.no_property_checks,
+                          jobs=args.jobs,
+                          separate_properties=args.separate_properties,
+                          quex_cache_dir=(None if args.no_quex_cache else
+                                          args.quex_cache_dir),
+                          dead_code_elimination=args.eliminate_dead_code)
+
+        if (args.eliminate_dead_code and not args.check_only
+                and args.verbosity.info):
+            print self.context.dead_code_report()
+
+        if not args.check_only and args.verbosity.info:
+            print self.context.safety_checks_report()
+
+        if args.profile_passes:
+            self.context.profiler.write_report(args.profile_passes)
+            if args.verbosity.info:
+                print self.context.profiler.summary()
 
         if args.check_only:
             return
@@ -587,8 +711,26 @@ class ManageScript(object):
             build. By default, GPRbuild builds them all, so this arguments
             makes it possible to build only a subset of them.
         """
+        self.run_jobs(args, 'Build', self.gprbuild_jobs(
+            args, path.basename(project_file), project_file, is_library, mains
+        ))
+
+    def gprbuild_jobs(self, args, name, project_file, is_library, mains=None):
+        """
+        Return jobs to run GPRbuild on a project file: one per library type to
+        build. See gprbuild for arguments description.
+
+        As the jobs for the various library types can run concurrently, the
+        number of parallel jobs in "args" is split between them.
+
+        :param str name: Name for the jobs, used in messages.
+        :rtype: list[BuildJob]
+        """
+        build_shared, build_static = self.what_to_build(args, is_library)
+        build_count = max(1, int(build_shared) + int(build_static))
+
         base_argv = ['gprbuild', '-m', '-p',
-                     '-j{}'.format(args.jobs),
+                     '-j{}'.format(max(1, args.jobs // build_count)),
                      '-P{}'.format(project_file),
                      '-XBUILD_MODE={}'.format(args.build_mode)]
         if args.enable_warnings:
@@ -605,7 +747,7 @@ class ManageScript(object):
         if hasattr(args, 'cargs'):
             cargs.extend(args.cargs)
 
-        def run(library_type):
+        def job(library_type):
             argv = list(base_argv)
             argv.append('-XLIBRARY_TYPE={}'.format(library_type))
             if mains:
@@ -614,13 +756,15 @@ class ManageScript(object):
                 argv.append('-gnatef')
             argv.append('-cargs')
             argv.extend(cargs)
-            self.check_call(args, 'Build', argv)
+            return BuildJob('{} ({})'.format(name, library_type), argv,
+                            library_type)
 
-        build_shared, build_static = self.what_to_build(args, is_library)
+        result = []
         if build_shared:
-            run('relocatable')
+            result.append(job('relocatable'))
         if build_static:
-            run('static')
+            result.append(job('static'))
+        return result
 
     # noinspection PyIncorrectDocstring
     def gprinstall(self, args, project_file, is_library):
@@ -678,9 +822,14 @@ class ManageScript(object):
         lib_project = self.dirs.build_dir(
             'lib', 'gnat', '{}.gpr'.format(self.lib_name.lower())
         )
-        self.gprbuild(args, lib_project, True)
-
-        # Then build the main programs, if any
+        lib_jobs = self.gprbuild_jobs(args, 'library', lib_project, True)
+        jobs = list(lib_jobs)
+
+        # Then build the main programs, if any. They are linked against the
+        # library, so wait for the corresponding library build, but not for
+        # the other ones. All mains builds share the same object and
+        # executable directories, so run them one after the other, the static
+        # one last.
         disabled_mains = reduce(set.union, args.disable_mains, set())
         mains = (set()
                  if args.disable_all_mains else
@@ -688,8 +837,19 @@ class ManageScript(object):
         if mains:
             if args.verbosity.info:
                 printcol("Building the main programs ...", Colors.HEADER)
-            self.gprbuild(args, self.dirs.build_dir('src', 'mains.gpr'), False,
-                          mains)
+            previous_job = None
+            for job in self.gprbuild_jobs(
+                args, 'mains', self.dirs.build_dir('src', 'mains.gpr'), False,
+                mains
+            ):
+                job.deps = [lib_job for lib_job in lib_jobs
+                            if lib_job.library_type == job.library_type]
+                if previous_job:
+                    job.deps.append(previous_job)
+                jobs.append(job)
+                previous_job = job
+
+        self.run_jobs(args, 'Build', jobs)
 
         # On Windows, shared libraries (DLL) are looked up in the PATH, just
         # like binaries (it's LD_LIBRARY_PATH on Unix). For this platform,
@@ -712,6 +872,122 @@ class ManageScript(object):
         self.do_generate(args)
         self.do_build(args)
 
+    def do_watch(self, args):
+        """
+        Generate the library again each time its specification changes.
+
+        Watch the Python sources in the language specification directory and
+        all files in its extensions directory, and run the "generate" command
+        each time one of them changes, then the "build" one if requested.
+
+        Each run happens in a process forked from this one, so that it starts
+        from a clean state. This process only imports Langkit, so this still
+        saves some work. Source files that are generated with the same content
+        as before are left untouched and property code comes from the
+        property cache, so that the edit-generate-build loop remains short.
+
+        :param argparse.Namespace args: The arguments parsed from the command
+            line invocation of manage.py.
+        """
+        if not hasattr(os, 'fork'):
+            print >> sys.stderr, col(
+                'The watch command is not supported on this platform',
+                Colors.FAIL
+            )
+            sys.exit(1)
+
+        # Do not watch the build directory, in case it is inside the language
+        # specification directory, nor hidden files. Outside of extensions,
+        # only watch Python sources: runs write other files (reports, logs,
+        # ...) that must not trigger new runs.
+        build_dir = self.dirs.build_dir()
+        extensions_dir = self.dirs.lang_source_dir('extensions')
+
+        def snapshot():
+            result = {}
+            for dirpath, dirnames, filenames in os.walk(
+                self.dirs.lang_source_dir()
+            ):
+                dirnames[:] = [d for d in dirnames
+                               if not d.startswith('.') and
+                               path.join(dirpath, d) != build_dir]
+                in_extensions = (
+                    dirpath == extensions_dir or
+                    dirpath.startswith(extensions_dir + os.sep)
+                )
+                for filename in filenames:
+                    if (filename.startswith('.') or
+                            filename.endswith(('.pyc', '.pyo')) or
+                            not (in_extensions or filename.endswith('.py'))):
+                        continue
+                    filepath = path.join(dirpath, filename)
+                    try:
+                        st = os.stat(filepath)
+                    except OSError:
+                        # The file was removed in the meantime
+                        continue
+                    result[filepath] = (st.st_mtime, st.st_size)
+            return result
+
+        def run():
+            start_time = time.time()
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    self.set_context(args)
+                    self.do_generate(args)
+                    if args.build:
+                        self.do_build(args)
+                    status = 0
+                except SystemExit as exc:
+                    # Like the interpreter does, consider that no exit code
+                    # means success and that other non-integer ones (error
+                    # messages) mean failure.
+                    if exc.code is None:
+                        status = 0
+                    elif isinstance(exc.code, int):
+                        status = exc.code
+                    else:
+                        status = 1
+                except DiagnosticError:
+                    print >> sys.stderr, col('Errors', Colors.FAIL)
+                except Exception:
+                    import traceback
+                    traceback.print_exc()
+                    print_context(recovered=True)
+                    print >> sys.stderr, col('Internal error!', Colors.FAIL)
+                finally:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(status)
+
+            _, status = os.waitpid(pid, 0)
+            if args.verbosity.info:
+                printcol('Done in {:.1f}s, waiting for changes...'.format(
+                    time.time() - start_time
+                ), Colors.OKGREEN if status == 0 else Colors.FAIL)
+
+        previous = None
+        try:
+            while True:
+                current = snapshot()
+                if current != previous:
+                    if previous is not None and args.verbosity.info:
+                        changed = sorted(
+                            path.relpath(f, self.dirs.lang_source_dir())
+                            for f in set(current) | set(previous)
+                            if current.get(f) != previous.get(f)
+                        )
+                        printcol('Changes detected in: {}'.format(
+                            ', '.join(changed)
+                        ), Colors.HEADER)
+                    previous = current
+                    run()
+                time.sleep(args.poll_interval)
+        except KeyboardInterrupt:
+            pass
+
     def do_install(self, args):
         """
         Install programs and libraries.
@@ -735,6 +1011,7 @@ class ManageScript(object):
             os.path.join('include', lib_name + '.h'),
             os.path.join('share', lib_name, 'ast-types.txt'),
             os.path.join('python', lib_name + '.py'),
+            os.path.join('python', lib_name + '_batch.py'),
         ]:
             build_path = self.dirs.build_dir(fpath)
             install_path = self.dirs.install_dir(fpath)
@@ -845,6 +1122,92 @@ class ManageScript(object):
             )
             sys.exit(1)
 
+    def run_jobs(self, args, name, jobs):
+        """
+        Run jobs concurrently, with a derived environment.
+
+        Each job starts as soon as all its dependencies completed successfully.
+        The output of each job is captured and printed at once when it
+        completes, so that the outputs of concurrent jobs are not interleaved.
+
+        If a job fails, exit ourselves with a status code and a proper error
+        message once the other jobs are over.
+
+        :param argparse.Namespace args: The arguments parsed from the command
+            line invocation of manage.py.
+        :param str name: Name of the processes to run, use for error message
+            formatting only.
+        :param list[BuildJob] jobs: Jobs to run.
+        """
+        env = self.derived_env()
+        output_lock = threading.Lock()
+
+        def run(job):
+            try:
+                for dep in job.deps:
+                    dep.done.wait()
+                if not all(dep.success for dep in job.deps):
+                    return
+
+                with output_lock:
+                    self.log_exec(args, job.argv)
+
+                start_time = time.time()
+                try:
+                    p = subprocess.Popen(job.argv, env=env,
+                                         stdout=subprocess.PIPE,
+                                         stderr=subprocess.STDOUT)
+                    output, _ = p.communicate()
+                except OSError as exc:
+                    output = ''
+                    job.error = str(exc)
+                else:
+                    if p.returncode != 0:
+                        job.error = ('Command returned non-zero exit status'
+                                     ' {}'.format(p.returncode))
+                job.duration = time.time() - start_time
+
+                with output_lock:
+                    sys.stdout.write(output)
+                    sys.stdout.flush()
+            except Exception as exc:
+                job.error = 'Unexpected error: {}'.format(exc)
+            finally:
+                # Always signal completion, so that the jobs that depend on
+                # this one do not wait forever.
+                job.done.set()
+
+        threads = [threading.Thread(target=run, args=(job, ))
+                   for job in jobs]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        if args.verbosity.info and len(jobs) > 1:
+            print '{} durations:'.format(name)
+            for job in jobs:
+                print '  {:<30} {}'.format(
+                    job.name + ':',
+                    ('{:.1f}s'.format(job.duration)
+                     if job.duration is not None else 'skipped')
+                )
+
+        for job in jobs:
+            if job.error:
+                print(
+                    '{color}{name} failed:{reset}'
+                    ' error while running {argv}:'
+                    '\n    {exc}'.format(
+                        color=Colors.FAIL,
+                        name=name,
+                        reset=Colors.ENDC,
+                        argv=' '.join(job.argv),
+                        exc=job.error
+                    )
+                )
+                sys.exit(1)
+
     def log_exec(self, args, argv):
         """
         If verbosity level is debug, log a command we are about to execute.
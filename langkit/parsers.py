@@ -44,11 +44,18 @@ from langkit.utils import (Colors, assert_type, common_ancestor, copy_with,
 class GeneratedParser(object):
     """Simple holder for generated parsers."""
 
-    def __init__(self, name, spec, body):
+    def __init__(self, name, spec, body, type):
         self.name = name
         self.spec = spec
         self.body = body
 
+        self.type = type
+        """
+        Type of the values this parser returns, which determines the type of
+        its memoization table.
+        :type: CompiledType
+        """
+
 
 def render(*args, **kwargs):
     return compiled_types.make_renderer().update({
@@ -404,7 +411,8 @@ class Parser(object):
         get_context().generated_parsers.append(GeneratedParser(
             self.gen_fn_name,
             render('parsers/fn_profile_ada', t_env),
-            render('parsers/fn_code_ada', t_env)))
+            render('parsers/fn_code_ada', t_env),
+            self.get_type()))
 
     def get_type(self):
         """
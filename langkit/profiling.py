@@ -0,0 +1,226 @@
+"""
+Helpers to measure the time and memory spent in the various steps of code
+generation: compilation passes, processing of each AST node type and of each
+property, and rendering of each template.
+"""
+
+from __future__ import absolute_import
+
+import json
+import os
+import time
+
+
+def memory_usage():
+    """
+    Return the resident set size of the current process, in bytes, or None if
+    it cannot be determined on this platform.
+
+    :rtype: int|None
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (IOError, OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+
+class ProfileEntry(object):
+    """
+    Accumulated measurements for one section of code generation.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        """
+        Name of the measured section.
+
+        :type: str
+        """
+
+        self.count = 0
+        """
+        Number of times this section was run.
+
+        :type: int
+        """
+
+        self.time = 0.0
+        """
+        Total wall time spent in this section, in seconds.
+
+        :type: float
+        """
+
+        self.memory = None
+        """
+        Total growth of the resident set size during this section, in bytes,
+        or None if it cannot be measured.
+
+        :type: int|None
+        """
+
+    def to_json(self):
+        return {'name': self.name,
+                'count': self.count,
+                'time': self.time,
+                'memory': self.memory}
+
+
+class Section(object):
+    """
+    Context manager that measures a section of code generation and adds the
+    result to the corresponding profile entry.
+    """
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.start_time = None
+        self.start_memory = None
+
+    def __enter__(self):
+        self.start_memory = memory_usage()
+        self.start_time = time.time()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.time() - self.start_time
+        end_memory = memory_usage()
+
+        entry = self.entry
+        entry.count += 1
+        entry.time += elapsed
+        if self.start_memory is not None and end_memory is not None:
+            entry.memory = ((entry.memory or 0)
+                            + end_memory - self.start_memory)
+
+
+class NullSection(object):
+    """
+    Context manager that measures nothing, to be used when profiling is
+    disabled.
+    """
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+null_section = NullSection()
+
+
+class PassProfiler(object):
+    """
+    Collect measurements for code generation.
+
+    Measurements are grouped in categories (see CATEGORIES). In each category,
+    measurements for sections that have the same name are accumulated.
+    """
+
+    CATEGORIES = (
+        ('passes', 'Compilation passes'),
+        ('nodes', 'AST node types'),
+        ('properties', 'Properties'),
+        ('templates', 'Templates'),
+    )
+    """
+    Couples of category names and descriptions for all categories. Entries in
+    the "templates" category include the time spent rendering sub-templates.
+    """
+
+    def __init__(self):
+        self.entries = {cat: {} for cat, _ in self.CATEGORIES}
+        """
+        Mapping from category names to mappings from section names to the
+        corresponding profile entries.
+
+        :type: dict[str, dict[str, ProfileEntry]]
+        """
+
+        self.passes_order = []
+        """
+        Names of compilation passes, in the order they were first run.
+
+        :type: list[str]
+        """
+
+    def section(self, category, name):
+        """
+        Return a context manager that measures the "name" section in the
+        "category" category.
+
+        :param str category: Name of the category for this section.
+        :param str name: Name of the measured section.
+        :rtype: Section
+        """
+        entries = self.entries[category]
+        try:
+            entry = entries[name]
+        except KeyError:
+            entry = ProfileEntry(name)
+            entries[name] = entry
+            if category == 'passes':
+                self.passes_order.append(name)
+        return Section(entry)
+
+    def sorted_entries(self, category):
+        """
+        Return the profile entries for "category". Compilation passes are
+        returned in execution order, other entries are sorted from the slowest
+        to the fastest.
+
+        :param str category: Name of the category to look up.
+        :rtype: list[ProfileEntry]
+        """
+        entries = self.entries[category]
+        if category == 'passes':
+            return [entries[name] for name in self.passes_order]
+        return sorted(entries.values(), key=lambda e: (-e.time, e.name))
+
+    def to_json(self):
+        """
+        Return a JSON-serializable representation of all measurements.
+
+        :rtype: dict[str, list[dict]]
+        """
+        return {cat: [e.to_json() for e in self.sorted_entries(cat)]
+                for cat, _ in self.CATEGORIES}
+
+    def write_report(self, filename):
+        """
+        Write all measurements to the "filename" JSON file.
+
+        :param str filename: Name of the file to write.
+        """
+        with open(filename, 'w') as f:
+            json.dump(self.to_json(), f, indent=2, sort_keys=True)
+
+    def summary(self, top_n=10):
+        """
+        Return a human readable summary of measurements, showing only the
+        "top_n" slowest entries for categories other than compilation passes.
+
+        :param int top_n: Maximum number of entries to show per category.
+        :rtype: str
+        """
+        def format_memory(memory):
+            if memory is None:
+                return ''
+            return '{:+.1f} MB'.format(memory / (1024.0 * 1024.0))
+
+        lines = []
+        for cat, description in self.CATEGORIES:
+            entries = self.sorted_entries(cat)
+            if not entries:
+                continue
+            if cat != 'passes':
+                entries = entries[:top_n]
+                description = '{} ({} slowest)'.format(description, top_n)
+            lines.append('{}:'.format(description))
+            for e in entries:
+                lines.append('  {:>8.3f}s {:>11} {:>6}x  {}'.format(
+                    e.time, format_memory(e.memory), e.count, e.name
+                ))
+        return '\n'.join(lines)
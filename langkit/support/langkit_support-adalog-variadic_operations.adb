@@ -4,40 +4,55 @@ use Langkit_Support.Adalog.Pure_Relations;
 
 package body Langkit_Support.Adalog.Variadic_Operations is
 
+   function Is_True (Rel : Relation) return Boolean
+   is (Rel /= null and then Rel.all in True_Relation.Rel);
+   --  Return whether Rel is a relation that always succeeds once
+
+   function Is_False (Rel : Relation) return Boolean
+   is (Rel /= null and then Rel.all in False_Relation.Rel);
+   --  Return whether Rel is a relation that never succeeds
+
    ------------------
    -- Variadic_And --
    ------------------
 
    function Variadic_And (Rels : Relation_Array) return Relation is
       Ret, Old_Ret : Relation;
+      Empty        : Boolean := True;
    begin
-      if Rels'Length = 0 then
-         return True_Rel;
-      end if;
-
-      Ret := Rels (Rels'First);
-      Inc_Ref (Ret);
-
-      --  We Inc_Ref here because:
-      --
-      --  - If Rels has only one element, we return a new ownership share for
-      --    an already existing relation.
-      --
-      --  - If Rels has several elements, this share will be automatically
-      --    Dec_Ref'd in the for loop below.
-
-      for I in Rels'First + 1 .. Rels'Last loop
-         Old_Ret := Ret;
-         Ret := Relation (Ret and Rels (I));
-
-         Dec_Ref (Old_Ret);
-         --  Here we Dec_Ref, because either Old_Ret is the first rel and
-         --  has been Inc_Ref'd before, either it is an And relation that was
-         --  created with an ownership that we now renounce, because it is
-         --  owned by the new And.
+      for Rel of Rels loop
+
+         --  True relations do not change the set of solutions of an And
+         --  relation: skip them so that we allocate fewer relations.
+
+         if not Is_True (Rel) then
+            if Empty then
+               Ret := Rel;
+               Inc_Ref (Ret);
+               Empty := False;
+
+               --  We Inc_Ref here because:
+               --
+               --  - If Rels has only one element to combine, we return a new
+               --    ownership share for an already existing relation.
+               --
+               --  - If Rels has several elements to combine, this share will
+               --    be automatically Dec_Ref'd below.
+
+            else
+               Old_Ret := Ret;
+               Ret := Relation (Ret and Rel);
+
+               Dec_Ref (Old_Ret);
+               --  Here we Dec_Ref, because either Old_Ret is the first rel
+               --  and has been Inc_Ref'd before, either it is an And relation
+               --  that was created with an ownership that we now renounce,
+               --  because it is owned by the new And.
+            end if;
+         end if;
       end loop;
 
-      return Ret;
+      return (if Empty then True_Rel else Ret);
    end Variadic_And;
 
    -----------------
@@ -46,21 +61,27 @@ package body Langkit_Support.Adalog.Variadic_Operations is
 
    function Variadic_Or (Rels : Relation_Array) return Relation is
       Ret, Old_Ret : Relation;
+      Empty        : Boolean := True;
    begin
-      if Rels'Length = 0 then
-         return False_Rel;
-      end if;
+      for Rel of Rels loop
 
-      Ret := Rels (Rels'First);
-      Inc_Ref (Ret);
+         --  Likewise, False relations do not change the set of solutions of
+         --  an Or relation.
 
-      for I in Rels'First + 1 .. Rels'Last loop
-         Old_Ret := Ret;
-         Ret := Ret or Rels (I);
-         Dec_Ref (Old_Ret);
+         if not Is_False (Rel) then
+            if Empty then
+               Ret := Rel;
+               Inc_Ref (Ret);
+               Empty := False;
+            else
+               Old_Ret := Ret;
+               Ret := Ret or Rel;
+               Dec_Ref (Old_Ret);
+            end if;
+         end if;
       end loop;
 
-      return Ret;
+      return (if Empty then False_Rel else Ret);
    end Variadic_Or;
 
 end Langkit_Support.Adalog.Variadic_Operations;
@@ -6,7 +6,73 @@ with System.Storage_Elements; use System.Storage_Elements;
 package body Langkit_Support.Symbols is
 
    procedure Deallocate is new Ada.Unchecked_Deallocation
-     (Sets.Set, Symbol_Table);
+     (Symbol_Set, Symbol_Table);
+
+   ----------------
+   -- Symbol_Set --
+   ----------------
+
+   protected body Symbol_Set is
+
+      ----------
+      -- Find --
+      ----------
+
+      procedure Find
+        (T      : Text_Type;
+         Create : Boolean;
+         Result : out Symbol_Type)
+      is
+         use Sets;
+
+         T_Acc  : Symbol_Type := T'Unrestricted_Access;
+         Cur    : constant Cursor := Set.Find (T_Acc);
+      begin
+         --  If we already have such a symbol, return the access we already
+         --  internalized. Otherwise, give up if asked to.
+
+         if Has_Element (Cur) then
+            Result := Element (Cur);
+            return;
+         elsif not Create then
+            Result := null;
+            return;
+         end if;
+
+         --  At this point, we know we have to internalize a new symbol
+
+         T_Acc := new Text_Type'(T);
+         Set.Insert (T_Acc);
+         Result := T_Acc;
+      end Find;
+
+      -----------
+      -- Clear --
+      -----------
+
+      procedure Clear is
+         use Sets;
+         C : Cursor := Set.First;
+      begin
+         while Has_Element (C) loop
+            declare
+               --  We keep Symbol_Type to be a constant access everywhere for
+               --  simplification, but we know symbol tables are the only
+               --  owners of these, so stripping the "constant" attribute away
+               --  here is known to be safe.
+
+               function Convert is new Ada.Unchecked_Conversion
+                 (Symbol_Type, Text_Access);
+               To_Free : Text_Access := Convert (Element (C));
+            begin
+               Next (C);
+               Free (To_Free);
+            end;
+         end loop;
+         Set.Clear;
+      end Clear;
+
+   end Symbol_Set;
 
    ------------
    -- Create --
@@ -14,7 +80,7 @@ package body Langkit_Support.Symbols is
 
    function Create return Symbol_Table is
    begin
-      return new Sets.Set;
+      return new Symbol_Set;
    end Create;
 
    ----------
@@ -27,25 +93,10 @@ package body Langkit_Support.Symbols is
       Create : Boolean := True)
       return Symbol_Type
    is
-      use Sets;
-
-      T_Acc  : Symbol_Type := T'Unrestricted_Access;
-      Result : constant Cursor := ST.Find (T_Acc);
+      Result : Symbol_Type;
    begin
-      --  If we already have such a symbol, return the access we already
-      --  internalized. Otherwise, give up if asked to.
-
-      if Has_Element (Result) then
-         return Element (Result);
-      elsif not Create then
-         return null;
-      end if;
-
-      --  At this point, we know we have to internalize a new symbol
-
-      T_Acc := new Text_Type'(T);
-      ST.Insert (T_Acc);
-      return T_Acc;
+      ST.Find (T, Create, Result);
+      return Result;
    end Find;
 
    -------------
@@ -53,24 +104,8 @@ package body Langkit_Support.Symbols is
    -------------
 
    procedure Destroy (ST : in out Symbol_Table) is
-      use Sets;
-      C : Cursor := ST.First;
    begin
-      while Has_Element (C) loop
-         declare
-            --  We keep Symbol_Type to be a constant access everywhere for
-            --  simplification, but we know symbol tables are the only owners
-            --  of these, so stripping the "constant" attribute away here is
-            --  known to be safe.
-
-            function Convert is new Ada.Unchecked_Conversion
-              (Symbol_Type, Text_Access);
-            To_Free : Text_Access := Convert (Element (C));
-         begin
-            Next (C);
-            Free (To_Free);
-         end;
-      end loop;
+      ST.Clear;
       Deallocate (ST);
    end Destroy;
 
@@ -1,7 +1,11 @@
 from __future__ import absolute_import
 
+import hashlib
+import os
+import posixpath
 import sys
 
+import mako
 import mako.exceptions
 
 from langkit import documentation, names
@@ -44,8 +48,16 @@ class Renderer(object):
                 env.items() + kwargs.items()))._render(template_name)
 
     def _render(self, template_name):
+        # Kludge: importing compile_context at the top-level would create an
+        # import cycle.
+        from langkit import compile_context
+
+        ctx = compile_context.compile_ctx
         try:
-            return mako_template(template_name).render(**self.env)
+            if ctx is None:
+                return mako_template(template_name).render(**self.env)
+            with ctx.profile('templates', template_name):
+                return mako_template(template_name).render(**self.env)
         except DiagnosticError:
             # In the case of DiagnosticErrors, we don't want to show the
             # traceback.
@@ -65,6 +77,29 @@ def mako_template(file_name):
     return template_lookup.get_template("{}.mako".format(file_name))
 
 
+def compiled_template_namer(module_directory):
+    """
+    Return a function suitable for TemplateLookup's "modulename_callable"
+    argument. It makes Mako store the Python module compiled for a template in
+    `module_directory`, under a name that depends on the template source and
+    on the Mako version, so that stale modules are never picked up.
+
+    :param str module_directory: Directory in which to store compiled
+        templates.
+    :rtype: (str, str) -> str
+    """
+    def get_module_name(filename, uri):
+        with open(filename, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha1(mako.__version__ + '\0' + content).hexdigest()
+        return os.path.join(
+            module_directory,
+            '{}-{}.py'.format(posixpath.normpath(uri.lstrip('/')), digest)
+        )
+
+    return get_module_name
+
+
 common_renderer = Renderer({
     'string_repr':      string_repr,
     'get_type':         get_type,
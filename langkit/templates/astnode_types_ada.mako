@@ -129,6 +129,10 @@
            (Node   : access ${type_name};
             Prefix : String := "");
 
+         overriding procedure Write_JSON
+           (Node   : access ${type_name};
+            Result : in out Unbounded_String);
+
       % endif
    % endif
 
@@ -261,6 +265,13 @@
    # Keep a list of fields that are annotated with repr
    repr_fields = cls.get_parse_fields(lambda f: f.repr)
 
+   # Keep a list of the fields that are exposed in the JSON representation:
+   # the ones that the Python API exposes.
+   json_fields = cls.get_parse_fields(
+      lambda f: library_public_field(f) and (is_ast_node(f.type)
+                                             or is_token_type(f.type))
+   )
+
    type_name = cls.value_type_name()
 
    ext = ctx.ext("nodes", cls.name(), "bodies")
@@ -425,6 +436,37 @@
 
       end Print;
 
+      ----------------
+      -- Write_JSON --
+      ----------------
+
+      overriding procedure Write_JSON
+        (Node   : access ${type_name};
+         Result : in out Unbounded_String)
+      is
+         % if json_fields:
+            First : Boolean := True;
+         % else:
+            pragma Unreferenced (Node);
+         % endif
+      begin
+         Append (Result, '{');
+         % for field in json_fields:
+            % if is_ast_node(field.type):
+               if Node.${field.name} /= null then
+                  Append_JSON_Key (Result, "${field.name.lower}", First);
+                  Node.${field.name}.Write_JSON (Result);
+               end if;
+            % else:
+               if ${field.name} (Node) /= No_Token then
+                  Append_JSON_Key (Result, "${field.name.lower}", First);
+                  Append_JSON (Result, ${field.name} (Node));
+               end if;
+            % endif
+         % endfor
+         Append (Result, '}');
+      end Write_JSON;
+
       % if memoized_properties:
          overriding procedure Reset_Property_Caches
            (Node : access ${cls.value_type_name()})
@@ -216,6 +216,18 @@ ${capi.get_name("get_analysis_unit_from_buffer")}(
         size_t buffer_size,
         int with_trivia);
 
+${c_doc('langkit.get_units_from_files')}
+extern void
+${capi.get_name("get_analysis_units_from_files")}(
+        ${analysis_context_type} context,
+        const char **filenames,
+        size_t count,
+        const char *charset,
+        int reparse,
+        int with_trivia,
+        int jobs,
+        ${analysis_unit_type} *units);
+
 % if ctx.default_unit_file_provider:
 ${c_doc('langkit.get_unit_from_provider')}
 extern ${analysis_unit_type}
@@ -317,6 +329,10 @@ ${c_doc('langkit.node_short_image')}
 extern ${text_type}
 ${capi.get_name("node_short_image")}(${node_type} node);
 
+${c_doc('langkit.node_to_json')}
+extern char *
+${capi.get_name("node_to_json")}(${node_type} node);
+
 ${c_doc('langkit.node_sloc_range')}
 extern void
 ${capi.get_name("node_sloc_range")}(${node_type} node,
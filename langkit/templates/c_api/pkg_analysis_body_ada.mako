@@ -7,6 +7,7 @@
 <%namespace name="exts"          file="../extensions.mako" />
 
 with Ada.Finalization;
+with Ada.Strings.Unbounded;
 
 pragma Warnings (Off, "is an internal GNAT unit");
 with Ada.Strings.Wide_Wide_Unbounded.Aux;
@@ -178,6 +179,52 @@ package body ${ada_lib_name}.Analysis.C is
          return ${analysis_unit_type} (System.Null_Address);
    end;
 
+   procedure ${capi.get_name("get_analysis_units_from_files")}
+     (Context              : ${analysis_context_type};
+      Filenames            : System.Address;
+      Count                : size_t;
+      Charset              : chars_ptr;
+      Reparse, With_Trivia : int;
+      Jobs                 : int;
+      Units                : System.Address)
+   is
+   begin
+      Clear_Last_Exception;
+
+      declare
+         Ctx : constant Analysis_Context := Unwrap (Context);
+
+         Filenames_Array : chars_ptr_array (1 .. Count)
+            with Import, Address => Filenames;
+         Units_Array     : array (1 .. Count) of ${analysis_unit_type}
+            with Import, Address => Units;
+
+         Names : Batch_Filenames (1 .. Natural (Count));
+      begin
+         for I in Names'Range loop
+            Names (I) := Ada.Strings.Unbounded.To_Unbounded_String
+              (Value (Filenames_Array (size_t (I))));
+         end loop;
+
+         declare
+            Result : constant Batch_Units := Get_From_Files
+              (Ctx,
+               Names,
+               Value_Or_Empty (Charset),
+               Reparse /= 0,
+               With_Trivia /= 0,
+               Positive'Max (1, Integer (Jobs)));
+         begin
+            for I in Result'Range loop
+               Units_Array (size_t (I)) := Wrap (Result (I));
+            end loop;
+         end;
+      end;
+   exception
+      when Exc : others =>
+         Set_Last_Exception (Exc);
+   end;
+
    function ${capi.get_name("get_analysis_unit_from_buffer")}
      (Context           : ${analysis_context_type};
       Filename, Charset : chars_ptr;
@@ -193,7 +240,7 @@ package body ${ada_lib_name}.Analysis.C is
          Ctx : constant Analysis_Context := Unwrap (Context);
          Unit : Analysis_Unit;
 
-         Buffer_Str : String (1 .. Positive (Buffer_Size));
+         Buffer_Str : String (1 .. Natural (Buffer_Size));
          for Buffer_Str'Address use Convert (Buffer);
       begin
          Unit := Get_From_Buffer
@@ -469,7 +516,7 @@ package body ${ada_lib_name}.Analysis.C is
 
       declare
          U : constant Analysis_Unit := Unwrap (Unit);
-         Buffer_Str : String (1 .. Positive (Buffer_Size));
+         Buffer_Str : String (1 .. Natural (Buffer_Size));
          for Buffer_Str'Address use Convert (Buffer);
       begin
          Reparse (U, Value_Or_Empty (Charset), Buffer_Str);
@@ -572,6 +619,22 @@ package body ${ada_lib_name}.Analysis.C is
          return (System.Null_Address, 0, 0);
    end;
 
+   function ${capi.get_name('node_to_json')} (Node : ${node_type})
+                                              return chars_ptr
+   is
+   begin
+      Clear_Last_Exception;
+      declare
+         N : constant ${root_node_type_name} := Unwrap (Node);
+      begin
+         return New_String (To_JSON (N));
+      end;
+   exception
+      when Exc : others =>
+         Set_Last_Exception (Exc);
+         return Null_Ptr;
+   end;
+
    procedure ${capi.get_name("node_sloc_range")}
      (Node         : ${node_type};
       Sloc_Range_P : ${sloc_range_type}_Ptr)
@@ -211,6 +211,20 @@ package ${ada_lib_name}.Analysis.C is
               "${capi.get_name('get_analysis_unit_from_buffer')}";
    ${ada_c_doc('langkit.get_unit_from_buffer', 3)}
 
+   procedure ${capi.get_name('get_analysis_units_from_files')}
+     (Context              : ${analysis_context_type};
+      Filenames            : System.Address;
+      Count                : size_t;
+      Charset              : chars_ptr;
+      Reparse, With_Trivia : int;
+      Jobs                 : int;
+      Units                : System.Address)
+      with Export        => True,
+           Convention    => C,
+           External_name =>
+              "${capi.get_name('get_analysis_units_from_files')}";
+   ${ada_c_doc('langkit.get_units_from_files', 3)}
+
    % if ctx.default_unit_file_provider:
       function ${capi.get_name('get_analysis_unit_from_provider')}
         (Context     : ${analysis_context_type};
@@ -375,6 +389,13 @@ package ${ada_lib_name}.Analysis.C is
            External_name => "${capi.get_name('node_short_image')}";
    ${ada_c_doc('langkit.node_short_image', 3)}
 
+   function ${capi.get_name('node_to_json')} (Node : ${node_type})
+                                              return chars_ptr
+      with Export        => True,
+           Convention    => C,
+           External_name => "${capi.get_name('node_to_json')}";
+   ${ada_c_doc('langkit.node_to_json', 3)}
+
    procedure ${capi.get_name('node_sloc_range')}
      (Node         : ${node_type};
       Sloc_Range_P : ${sloc_range_type}_Ptr)
@@ -1,6 +1,7 @@
 ## vim: filetype=makoada
 
 with Ada.Strings.Wide_Wide_Unbounded; use Ada.Strings.Wide_Wide_Unbounded;
+with Ada.Unchecked_Deallocation;
 
 with Langkit_Support.Diagnostics; use Langkit_Support.Diagnostics;
 with Langkit_Support.Packrat;
@@ -31,6 +32,22 @@ package body ${ada_lib_name}.Analysis.Parsers is
    % endfor
    pragma Warnings (On, "is not referenced");
 
+   type Parser_Private_Part_Type is record
+      % for parser in ctx.generated_parsers:
+      ${parser.name}_Memo : ${parser.type.storage_type_name()}_Memos.Memo_Type;
+      % endfor
+   end record;
+
+   procedure Free is new Ada.Unchecked_Deallocation
+     (Parser_Private_Part_Type, Parser_Private_Part);
+
+   function Create_Private_Part return Parser_Private_Part;
+   --  Allocate the private part for a new parser, with empty memoization
+   --  tables.
+
+   procedure Clean_All_Memos (Parser : in out Parser_Type);
+   --  Remove all entries from the memoization tables of Parser
+
    % for parser in ctx.generated_parsers:
    ${parser.spec}
    % endfor
@@ -63,6 +80,7 @@ package body ${ada_lib_name}.Analysis.Parsers is
               Symbol_Literals =>
                  Unit.Context.Symbol_Literals'Unrestricted_Access,
               % endif
+              Private_Part    => Create_Private_Part,
               others          => <>);
    end Create_From_File;
 
@@ -86,6 +104,7 @@ package body ${ada_lib_name}.Analysis.Parsers is
               Symbol_Literals =>
                  Unit.Context.Symbol_Literals'Unrestricted_Access,
               % endif
+              Private_Part    => Create_Private_Part,
               others          => <>);
    end Create_From_Buffer;
 
@@ -172,7 +191,7 @@ package body ${ada_lib_name}.Analysis.Parsers is
       % endfor
       end case;
       Process_Parsing_Error (Parser, Check_Complete);
-      Clean_All_Memos;
+      Clean_All_Memos (Parser);
       Set_Parents (Result, null);
       return Result;
    end Parse;
@@ -181,15 +200,37 @@ package body ${ada_lib_name}.Analysis.Parsers is
    ${parser.body}
    % endfor
 
+   -------------------------
+   -- Create_Private_Part --
+   -------------------------
+
+   function Create_Private_Part return Parser_Private_Part is
+      Result : constant Parser_Private_Part := new Parser_Private_Part_Type;
+   begin
+      % for parser in ctx.generated_parsers:
+         Clear (Result.${parser.name}_Memo);
+      % endfor
+      return Result;
+   end Create_Private_Part;
+
    ---------------------
    -- Clean_All_Memos --
    ---------------------
 
-   procedure Clean_All_Memos is
+   procedure Clean_All_Memos (Parser : in out Parser_Type) is
    begin
-      % for fn in ctx.fns:
-         Clear (${fn}_Memo);
+      % for parser in ctx.generated_parsers:
+         Clear (Parser.Private_Part.${parser.name}_Memo);
       % endfor
    end Clean_All_Memos;
 
+   -------------
+   -- Destroy --
+   -------------
+
+   procedure Destroy (Parser : in out Parser_Type) is
+   begin
+      Free (Parser.Private_Part);
+   end Destroy;
+
 end ${ada_lib_name}.Analysis.Parsers;
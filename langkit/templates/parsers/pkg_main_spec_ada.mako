@@ -26,6 +26,10 @@ private package ${ada_lib_name}.Analysis.Parsers is
       end case;
    end record;
 
+   type Parser_Private_Part is private;
+   --  Data that only the parsing functions use, such as memoization tables.
+   --  Each parser has its own, so that several parsers can run concurrently.
+
    type Parser_Type is record
       Current_Pos     : Token_Index := First_Token_Index;
       Last_Fail       : Fail_Info;
@@ -36,6 +40,7 @@ private package ${ada_lib_name}.Analysis.Parsers is
       % if ctx.symbol_literals:
       Symbol_Literals : Symbol_Literal_Array_Access;
       % endif
+      Private_Part    : Parser_Private_Part;
    end record;
 
    function Create_From_File
@@ -71,9 +76,13 @@ private package ${ada_lib_name}.Analysis.Parsers is
    --  consider the case when the parser could not consume all the input tokens
    --  as an error.
 
-   procedure Clean_All_Memos;
-   --  TODO??? We want to allow multiple parsers to run at the same time so
-   --  memos should be stored in Parser_Type. In the end, this should be turned
-   --  into a Parser_Type finalizer.
+   procedure Destroy (Parser : in out Parser_Type);
+   --  Free the resources that Create_From_File/Create_From_Buffer allocated
+   --  for Parser.
+
+private
+
+   type Parser_Private_Part_Type;
+   type Parser_Private_Part is access all Parser_Private_Part_Type;
 
 end ${ada_lib_name}.Analysis.Parsers;
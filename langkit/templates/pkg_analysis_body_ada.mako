@@ -13,6 +13,7 @@
 
 with Ada.Containers;                  use Ada.Containers;
 with Ada.Containers.Hashed_Maps;
+with Ada.Containers.Hashed_Sets;
 with Ada.Containers.Ordered_Maps;
 with Ada.Exceptions;
 with Ada.Strings.Wide_Wide_Unbounded; use Ada.Strings.Wide_Wide_Unbounded;
@@ -53,6 +54,10 @@ with ${ctx.default_unit_file_provider.unit_fqn};
 %if ctx.symbol_canonicalizer:
 with ${ctx.symbol_canonicalizer.unit_fqn};
 %endif
+## Units that contain separate bodies for properties
+% for unit_name, _, _ in ctx.separate_property_units():
+with ${ada_lib_name}.Analysis.${unit_name};
+% endfor
 
 package body ${ada_lib_name}.Analysis is
 
@@ -83,6 +88,36 @@ package body ${ada_lib_name}.Analysis is
    --  unit using Get_Parser and replace Unit's AST_Root and the diagnostics
    --  with the parsers's output.
 
+   procedure Release_AST (Unit : Analysis_Unit);
+   --  Helper for Do_Parsing: destroy the AST of Unit, if any, before it is
+   --  parsed again.
+
+   procedure Parse_Unit
+     (Unit       : Analysis_Unit;
+      Read_BOM   : Boolean;
+      Get_Parser : access function (Unit     : Analysis_Unit;
+                                    Read_BOM : Boolean)
+                                    return Parser_Type);
+   --  Helper for Do_Parsing: create a parser with Get_Parser and use it to
+   --  set Unit's AST_Root and diagnostics. Unlike the rest of Do_Parsing,
+   --  this modifies only Unit (and the context's symbol table, which is
+   --  protected), so this can run concurrently for different units of the
+   --  same context.
+
+   procedure Fetch_Unit
+     (Context           : Analysis_Context;
+      Filename, Charset : String;
+      Reparse           : Boolean;
+      With_Trivia       : Boolean;
+      Rule              : Grammar_Rule;
+      Unit              : out Analysis_Unit;
+      Read_BOM          : out Boolean;
+      Must_Parse        : out Boolean);
+   --  Helper for Get_Unit and Get_From_Files: set Unit to the analysis unit
+   --  for Filename in Context, creating it if needed, and update its charset.
+   --  Set Read_BOM to whether the lexer must look for a byte order mark, and
+   --  Must_Parse to whether the unit must be (re)parsed.
+
    function Get_Unit
      (Context           : Analysis_Context;
       Filename, Charset : String;
@@ -209,37 +244,36 @@ package body ${ada_lib_name}.Analysis is
       end if;
    end Dec_Ref;
 
-   --------------
-   -- Get_Unit --
-   --------------
+   ----------------
+   -- Fetch_Unit --
+   ----------------
 
-   function Get_Unit
+   procedure Fetch_Unit
      (Context           : Analysis_Context;
       Filename, Charset : String;
       Reparse           : Boolean;
-      Get_Parser        : access function (Unit     : Analysis_Unit;
-                                           Read_BOM : Boolean)
-                                           return Parser_Type;
       With_Trivia       : Boolean;
-      Rule              : Grammar_Rule)
-      return Analysis_Unit
+      Rule              : Grammar_Rule;
+      Unit              : out Analysis_Unit;
+      Read_BOM          : out Boolean;
+      Must_Parse        : out Boolean)
    is
       use Units_Maps;
 
       Fname   : constant Unbounded_String := To_Unbounded_String (Filename);
       Cur     : constant Cursor := Context.Units_Map.Find (Fname);
       Created : constant Boolean := Cur = No_Element;
-      Unit    : Analysis_Unit;
 
-      Read_BOM : constant Boolean := Charset'Length = 0;
+      Actual_Charset : Unbounded_String;
+
+   begin
       --  Unless the caller requested a specific charset for this unit, allow
       --  the lexer to automatically discover the source file encoding before
       --  defaulting to the context-specific one. We do this trying to match a
       --  byte order mark.
 
-      Actual_Charset : Unbounded_String;
+      Read_BOM := Charset'Length = 0;
 
-   begin
       --  Determine which encoding to use.  The parameter comes first, then the
       --  unit-specific default, then the context-specific one.
 
@@ -277,12 +311,36 @@ package body ${ada_lib_name}.Analysis is
       end if;
       Unit.Charset := Actual_Charset;
 
+      Must_Parse := Created
+                    or else Reparse
+                    or else (With_Trivia and then not Unit.With_Trivia);
+   end Fetch_Unit;
+
+   --------------
+   -- Get_Unit --
+   --------------
+
+   function Get_Unit
+     (Context           : Analysis_Context;
+      Filename, Charset : String;
+      Reparse           : Boolean;
+      Get_Parser        : access function (Unit     : Analysis_Unit;
+                                           Read_BOM : Boolean)
+                                           return Parser_Type;
+      With_Trivia       : Boolean;
+      Rule              : Grammar_Rule)
+      return Analysis_Unit
+   is
+      Unit       : Analysis_Unit;
+      Read_BOM   : Boolean;
+      Must_Parse : Boolean;
+   begin
+      Fetch_Unit (Context, Filename, Charset, Reparse, With_Trivia, Rule,
+                  Unit, Read_BOM, Must_Parse);
+
       --  (Re)parse it if needed
 
-      if Created
-         or else Reparse
-         or else (With_Trivia and then not Unit.With_Trivia)
-      then
+      if Must_Parse then
          Do_Parsing (Unit, Read_BOM, Get_Parser);
       end if;
 
@@ -316,23 +374,22 @@ package body ${ada_lib_name}.Analysis is
                                     Read_BOM : Boolean)
                                     return Parser_Type)
    is
+   begin
+      Release_AST (Unit);
 
-      procedure Add_Diagnostic (Message : String);
-      --  Helper to add a sloc-less diagnostic to Unit
-
-      --------------------
-      -- Add_Diagnostic --
-      --------------------
+      --  As (re-)loading an unit can change how any AST node property in the
+      --  whole analysis context behaves, we have to invalidate caches. This
+      --  is likely overkill, but kill all caches here as it's easy to do.
+      Reset_Property_Caches (Unit.Context);
 
-      procedure Add_Diagnostic (Message : String) is
-      begin
-         Unit.Diagnostics.Append
-           ((Sloc_Range => No_Source_Location_Range,
-             Message    => To_Unbounded_Wide_Wide_String (To_Text (Message))));
-      end Add_Diagnostic;
+      Parse_Unit (Unit, Read_BOM, Get_Parser);
+   end Do_Parsing;
 
-      Parser : Parser_Type;
+   -----------------
+   -- Release_AST --
+   -----------------
 
+   procedure Release_AST (Unit : Analysis_Unit) is
    begin
       --  If we have an AST_Mem_Pool already, we are reparsing. We want to
       --  destroy it to free all the allocated memory.
@@ -345,12 +402,37 @@ package body ${ada_lib_name}.Analysis is
       Unit.AST_Root := null;
       Unit.Has_Filled_Caches := False;
       Unit.Diagnostics.Clear;
+   end Release_AST;
 
-      --  As (re-)loading an unit can change how any AST node property in the
-      --  whole analysis context behaves, we have to invalidate caches. This
-      --  is likely overkill, but kill all caches here as it's easy to do.
-      Reset_Property_Caches (Unit.Context);
+   ----------------
+   -- Parse_Unit --
+   ----------------
+
+   procedure Parse_Unit
+     (Unit       : Analysis_Unit;
+      Read_BOM   : Boolean;
+      Get_Parser : access function (Unit     : Analysis_Unit;
+                                    Read_BOM : Boolean)
+                                    return Parser_Type)
+   is
 
+      procedure Add_Diagnostic (Message : String);
+      --  Helper to add a sloc-less diagnostic to Unit
+
+      --------------------
+      -- Add_Diagnostic --
+      --------------------
+
+      procedure Add_Diagnostic (Message : String) is
+      begin
+         Unit.Diagnostics.Append
+           ((Sloc_Range => No_Source_Location_Range,
+             Message    => To_Unbounded_Wide_Wide_String (To_Text (Message))));
+      end Add_Diagnostic;
+
+      Parser : Parser_Type;
+
+   begin
       --  Now create the parser. This is where lexing occurs, so this is where
       --  we get most "setup" issues: missing input file, bad charset, etc.
       --  If we have such an error, catch it, turn it into diagnostics and
@@ -391,8 +473,8 @@ package body ${ada_lib_name}.Analysis is
 
       Unit.AST_Root := Parse (Parser, Rule => Unit.Rule);
       Unit.Diagnostics := Parser.Diagnostics;
-      Clean_All_Memos;
-   end Do_Parsing;
+      Destroy (Parser);
+   end Parse_Unit;
 
    -------------------
    -- Get_From_File --
@@ -445,6 +527,199 @@ package body ${ada_lib_name}.Analysis is
                        With_Trivia, Rule);
    end Get_From_Buffer;
 
+   --------------------
+   -- Get_From_Files --
+   --------------------
+
+   function Get_From_Files
+     (Context     : Analysis_Context;
+      Filenames   : Batch_Filenames;
+      Charset     : String := "";
+      Reparse     : Boolean := False;
+      With_Trivia : Boolean := False;
+      Jobs        : Positive := 1;
+      Rule        : Grammar_Rule :=
+         ${Name.from_lower(ctx.main_rule_name)}_Rule)
+      return Batch_Units
+   is
+      package Filename_Sets is new Ada.Containers.Hashed_Sets
+        (Element_Type        => Unbounded_String,
+         Hash                => Ada.Strings.Unbounded.Hash,
+         Equivalent_Elements => "=",
+         "="                 => "=");
+
+      Units     : Batch_Units (Filenames'Range);
+      Read_BOMs : array (Filenames'Range) of Boolean;
+      To_Parse  : array (Filenames'Range) of Boolean := (others => False);
+      --  For each file, the corresponding unit, whether the lexer must look
+      --  for a byte order mark in it and whether this call must parse it.
+
+      Parse_Count : Natural := 0;
+      --  Number of units to parse
+
+      procedure Parse (I : Positive);
+      --  Parse the unit for Filenames (I)
+
+      -----------
+      -- Parse --
+      -----------
+
+      procedure Parse (I : Positive) is
+         function Get_Parser
+           (Unit     : Analysis_Unit;
+            Read_BOM : Boolean)
+            return Parser_Type
+         is (Create_From_File (To_String (Filenames (I)),
+                               To_String (Unit.Charset), Read_BOM, Unit,
+                               With_Trivia));
+      begin
+         Parse_Unit (Units (I), Read_BOMs (I), Get_Parser'Access);
+      end Parse;
+
+   begin
+      --  Creating units and destroying old ASTs affect the whole context, so
+      --  do this first, sequentially. A file that appears several times in
+      --  Filenames is parsed only once.
+
+      declare
+         Scheduled  : Filename_Sets.Set;
+         Must_Parse : Boolean;
+      begin
+         for I in Filenames'Range loop
+            Fetch_Unit
+              (Context, To_String (Filenames (I)), Charset, Reparse,
+               With_Trivia, Rule, Units (I), Read_BOMs (I), Must_Parse);
+            if Must_Parse and then not Scheduled.Contains (Filenames (I)) then
+               Scheduled.Insert (Filenames (I));
+               To_Parse (I) := True;
+               Parse_Count := Parse_Count + 1;
+               Release_AST (Units (I));
+            end if;
+         end loop;
+      end;
+      if Parse_Count > 0 then
+         Reset_Property_Caches (Context);
+      end if;
+
+      --  Then parse the units. This only modifies the units themselves, so
+      --  this can be done by concurrent tasks.
+
+      if Jobs = 1 or else Parse_Count <= 1 then
+         for I in Filenames'Range loop
+            if To_Parse (I) then
+               Parse (I);
+            end if;
+         end loop;
+
+      else
+         declare
+            use Ada.Exceptions;
+
+            protected Queue is
+               procedure Next (I : out Natural);
+               --  Set I to the index of the next file to parse, or to 0 if
+               --  there is none left or if a worker failed.
+
+               procedure Set_Error (Exc : Exception_Occurrence);
+               --  Record that a worker failed with Exc, if no other did
+
+               procedure Reraise_Error;
+               --  If a worker failed, re-raise the exception it failed with
+
+            private
+               Next_Index : Positive := Filenames'First;
+               Failed     : Boolean := False;
+               Error      : Exception_Occurrence;
+            end Queue;
+
+            protected body Queue is
+
+               ----------
+               -- Next --
+               ----------
+
+               procedure Next (I : out Natural) is
+               begin
+                  if not Failed then
+                     while Next_Index <= Filenames'Last loop
+                        I := Next_Index;
+                        Next_Index := Next_Index + 1;
+                        if To_Parse (I) then
+                           return;
+                        end if;
+                     end loop;
+                  end if;
+                  I := 0;
+               end Next;
+
+               ---------------
+               -- Set_Error --
+               ---------------
+
+               procedure Set_Error (Exc : Exception_Occurrence) is
+               begin
+                  if not Failed then
+                     Failed := True;
+                     Save_Occurrence (Error, Exc);
+                  end if;
+               end Set_Error;
+
+               -------------------
+               -- Reraise_Error --
+               -------------------
+
+               procedure Reraise_Error is
+               begin
+                  if Failed then
+                     Reraise_Occurrence (Error);
+                  end if;
+               end Reraise_Error;
+
+            end Queue;
+
+         begin
+            declare
+               task type Worker;
+
+               task body Worker is
+                  I : Natural;
+               begin
+                  loop
+                     Queue.Next (I);
+                     exit when I = 0;
+                     Parse (I);
+                  end loop;
+               exception
+                  when Exc : others =>
+                     Queue.Set_Error (Exc);
+               end Worker;
+
+               Workers : array (1 .. Positive'Min (Jobs, Parse_Count))
+                  of Worker;
+               pragma Unreferenced (Workers);
+            begin
+               --  Leaving this block waits for all workers to complete
+               null;
+            end;
+            Queue.Reraise_Error;
+         end;
+      end if;
+
+      --  Finally, update the lexical environments of the units that were
+      --  reparsed, which affects other units too.
+
+      for I in Filenames'Range loop
+         if To_Parse (I)
+            and then (Reparse
+                      or else (With_Trivia and then not Units (I).With_Trivia))
+         then
+            Update_After_Reparse (Units (I));
+         end if;
+      end loop;
+
+      return Units;
+   end Get_From_Files;
+
    % if ctx.default_unit_file_provider:
 
    -----------------------
@@ -1816,6 +2091,99 @@ package body ${ada_lib_name}.Analysis is
               " Text=" & Image (Text (Token), With_Quotes => True) & ">");
    end Image;
 
+   ------------------------
+   -- Append_JSON_String --
+   ------------------------
+
+   procedure Append_JSON_String
+     (Result : in out Unbounded_String;
+      Text   : Text_Type)
+   is
+      Hex_Digits : constant String := "0123456789abcdef";
+
+      procedure Append_Escape (Code : Natural);
+      --  Append to Result a "\uXXXX" escape sequence for the Code UTF-16 code
+      --  unit.
+
+      -------------------
+      -- Append_Escape --
+      -------------------
+
+      procedure Append_Escape (Code : Natural) is
+      begin
+         Append (Result, "\u");
+         for Shift in reverse 0 .. 3 loop
+            Append (Result, Hex_Digits (Code / 16 ** Shift mod 16 + 1));
+         end loop;
+      end Append_Escape;
+
+   begin
+      Append (Result, '"');
+      for C of Text loop
+         declare
+            Code : constant Natural := Wide_Wide_Character'Pos (C);
+         begin
+            case Code is
+               when Character'Pos ('"') => Append (Result, "\""");
+               when Character'Pos ('\') => Append (Result, "\\");
+               when 8 => Append (Result, "\b");
+               when 9 => Append (Result, "\t");
+               when 10 => Append (Result, "\n");
+               when 12 => Append (Result, "\f");
+               when 13 => Append (Result, "\r");
+
+               --  Other printable ASCII characters are output as-is
+
+               when 16#20# .. 16#21# | 16#23# .. 16#5B# | 16#5D# .. 16#7E# =>
+                  Append (Result, Character'Val (Code));
+
+               --  Characters outside of the Basic Multilingual Plane must be
+               --  encoded as UTF-16 surrogate pairs.
+
+               when 16#1_0000# .. Natural'Last =>
+                  Append_Escape (16#D800# + (Code - 16#1_0000#) / 16#400#);
+                  Append_Escape (16#DC00# + (Code - 16#1_0000#) mod 16#400#);
+               when others =>
+                  Append_Escape (Code);
+            end case;
+         end;
+      end loop;
+      Append (Result, '"');
+   end Append_JSON_String;
+
+   ---------------------
+   -- Append_JSON_Key --
+   ---------------------
+
+   procedure Append_JSON_Key
+     (Result : in out Unbounded_String;
+      Key    : String;
+      First  : in out Boolean) is
+   begin
+      if not First then
+         Append (Result, ", ");
+      end if;
+      First := False;
+      Append_JSON_String (Result, To_Text (Key));
+      Append (Result, ": ");
+   end Append_JSON_Key;
+
+   -----------------
+   -- Append_JSON --
+   -----------------
+
+   procedure Append_JSON
+     (Result : in out Unbounded_String;
+      Token  : Token_Type) is
+   begin
+      Append (Result, "{""kind"": ""Token"", ""token_kind"": ");
+      Append_JSON_String
+        (Result, To_Text (Token_Kind_Name (Data (Token).Kind)));
+      Append (Result, ", ""text"": ");
+      Append_JSON_String (Result, Text (Token));
+      Append (Result, '}');
+   end Append_JSON;
+
    --------------------------
    -- Children_With_Trivia --
    --------------------------
@@ -1981,6 +2349,19 @@ package body ${ada_lib_name}.Analysis is
              & " " & To_Text (Image (Sloc_Range (Node))) & ">";
    end Short_Image;
 
+   -------------
+   -- To_JSON --
+   -------------
+
+   function To_JSON
+     (Node : access ${root_node_value_type}'Class) return String
+   is
+      Result : Unbounded_String;
+   begin
+      Node.Write_JSON (Result);
+      return To_String (Result);
+   end To_JSON;
+
    ------------------------
    -- Address_To_Id_Maps --
    ------------------------
@@ -2457,6 +2838,29 @@ package body ${ada_lib_name}.Analysis is
       end loop;
    end Print;
 
+   ----------------
+   -- Write_JSON --
+   ----------------
+
+   overriding procedure Write_JSON
+     (Node   : access ${generic_list_value_type};
+      Result : in out Unbounded_String)
+   is
+      First : Boolean := True;
+   begin
+      Append (Result, '[');
+      for Child of Node.Vec loop
+         if Child /= null then
+            if not First then
+               Append (Result, ", ");
+            end if;
+            First := False;
+            Child.Write_JSON (Result);
+         end if;
+      end loop;
+      Append (Result, ']');
+   end Write_JSON;
+
    ------------------
    -- Destroy_Node --
    ------------------
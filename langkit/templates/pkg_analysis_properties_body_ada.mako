@@ -0,0 +1,39 @@
+## vim: filetype=makoada
+
+## Property bodies can use the same units as the body of $.Analysis, but
+## each unit uses only a few of them.
+pragma Warnings (Off, "referenced");
+with Ada.Containers;                  use Ada.Containers;
+with Ada.Strings.Wide_Wide_Unbounded; use Ada.Strings.Wide_Wide_Unbounded;
+with Ada.Unchecked_Conversion;
+with Ada.Unchecked_Deallocation;
+
+with Langkit_Support.Slocs;   use Langkit_Support.Slocs;
+with Langkit_Support.Text;    use Langkit_Support.Text;
+
+with Langkit_Support.Adalog.Abstract_Relation;
+use Langkit_Support.Adalog.Abstract_Relation;
+with Langkit_Support.Adalog.Debug;
+use Langkit_Support.Adalog.Debug;
+with Langkit_Support.Adalog.Operations;
+use Langkit_Support.Adalog.Operations;
+with Langkit_Support.Adalog.Predicates;
+use Langkit_Support.Adalog.Predicates;
+with Langkit_Support.Adalog.Pure_Relations;
+use Langkit_Support.Adalog.Pure_Relations;
+with Langkit_Support.Adalog.Variadic_Operations;
+use Langkit_Support.Adalog.Variadic_Operations;
+pragma Warnings (On, "referenced");
+
+package body ${ada_lib_name}.Analysis.${unit_name} is
+
+   ##  Make logic operations on nodes accessible
+   pragma Warnings (Off, "referenced");
+   use Eq_Node, Eq_Node.Raw_Impl;
+   pragma Warnings (On, "referenced");
+
+   % for prop in props:
+   ${prop.prop_separate_def}
+   % endfor
+
+end ${ada_lib_name}.Analysis.${unit_name};
@@ -0,0 +1,12 @@
+## vim: filetype=makoada
+
+--  Bodies of the properties of ${astnode.name()} nodes. They are not in the
+--  body of ${ada_lib_name}.Analysis so that they can be compiled separately.
+
+private package ${ada_lib_name}.Analysis.${unit_name} is
+
+   % for prop in props:
+   ${prop.prop_separate_decl}
+   % endfor
+
+end ${ada_lib_name}.Analysis.${unit_name};
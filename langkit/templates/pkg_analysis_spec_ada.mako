@@ -167,6 +167,21 @@ package ${ada_lib_name}.Analysis is
       return Analysis_Unit;
    ${ada_doc('langkit.get_unit_from_buffer', 3)}
 
+   type Batch_Filenames is array (Positive range <>) of Unbounded_String;
+   type Batch_Units is array (Positive range <>) of Analysis_Unit;
+
+   function Get_From_Files
+     (Context     : Analysis_Context;
+      Filenames   : Batch_Filenames;
+      Charset     : String := "";
+      Reparse     : Boolean := False;
+      With_Trivia : Boolean := False;
+      Jobs        : Positive := 1;
+      Rule        : Grammar_Rule :=
+         ${Name.from_lower(ctx.main_rule_name)}_Rule)
+      return Batch_Units;
+   ${ada_doc('langkit.get_units_from_files', 3)}
+
    function Has_Unit
      (Context       : Analysis_Context;
       Unit_Filename : String) return Boolean;
@@ -772,6 +787,20 @@ package ${ada_lib_name}.Analysis is
    --  Debug helper: print to standard output Node and all its children. Prefix
    --  is prepended to each output line.
 
+   procedure Write_JSON
+     (Node   : access ${root_node_value_type};
+      Result : in out Unbounded_String) is abstract;
+   --  Append to Result a JSON representation of Node and all its children.
+   --  See To_JSON for the format.
+
+   function To_JSON
+     (Node : access ${root_node_value_type}'Class) return String;
+   --  Return a JSON representation of Node and all its children. Nodes are
+   --  represented as objects that map the names of their non-null parsing
+   --  fields to their values, list nodes as arrays of their non-null items
+   --  and tokens as objects with "kind", "token_kind" and "text" members.
+   --  Non-ASCII characters are escaped, so the result is pure ASCII.
+
    procedure PP_Trivia
      (Node  : access ${root_node_value_type}'Class;
       Prefix : String := "");
@@ -885,6 +914,10 @@ package ${ada_lib_name}.Analysis is
    overriding procedure Print
      (Node : access ${generic_list_value_type}; Prefix : String := "");
 
+   overriding procedure Write_JSON
+     (Node   : access ${generic_list_value_type};
+      Result : in out Unbounded_String);
+
    overriding function Is_Empty_List
      (Node : access ${generic_list_value_type})
       return Boolean
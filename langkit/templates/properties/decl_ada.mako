@@ -15,6 +15,8 @@ ${"overriding" if property.overriding else ""} function ${property.name}
       % else:
       is abstract
       % endif
+   % elif property.inline:
+      with Inline
    % endif
    ;
 ${ada_doc(property, 0)}
@@ -3,13 +3,33 @@
 <%namespace name="scopes"  file="scopes_ada.mako" />
 <%namespace name="helpers" file="helpers.mako" />
 
-## Regular property function
+## Regular property function. The "unit" variable determines where this
+## definition goes:
+##
+## * "inline": in the body of $.Analysis;
+## * "main": in the body of $.Analysis, which then just calls the separate
+##   body (see PropertyDef.has_separate_body);
+## * "separate": in the separate unit for this property.
 
 pragma Warnings (Off, "is not referenced");
-% if not property.abstract and not property.external:
+% if unit == 'main':
 ${"overriding" if property.overriding else ""} function ${property.name}
   ${helpers.argument_list(property, property.dispatching)}
    return ${property.type.name()}
+is
+begin
+   return ${property.separate_unit_name}.${property.name}
+     (${property.self_arg_name}
+      % for arg in property.arguments:
+         , ${arg.name}
+      % endfor
+     );
+end ${property.name};
+% elif not property.abstract and not property.external:
+${"overriding" if property.overriding and unit == 'inline' else ""} \
+function ${property.name}
+  ${helpers.argument_list(property, property.dispatching)}
+   return ${property.type.name()}
 is
    use type AST_Envs.Lexical_Env;
 
@@ -79,10 +99,7 @@ begin
 
    ${property.constructed_expr.render_pre()}
 
-   Property_Result := ${property.constructed_expr.render_expr()};
-   % if property.type.is_refcounted():
-      Inc_Ref (Property_Result);
-   % endif
+   ${property.constructed_expr.render_store('Property_Result')}
    ${scopes.finalize_scope(property.vars.root_scope)}
 
    % if property.memoized:
@@ -117,7 +134,8 @@ end ${property.name};
 
 ## Wrapper to return convenient Ada arrays
 
-% if not property.overriding and is_array_type(property.type):
+% if unit != 'separate' and not property.overriding \
+     and is_array_type(property.type):
    function ${property.name}
      ${helpers.argument_list(property, False)}
      return ${property.type.api_name()}
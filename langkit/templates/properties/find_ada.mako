@@ -0,0 +1,24 @@
+## vim: filetype=makoada
+
+<%namespace name="iteration" file="iteration_ada.mako" />
+
+<%
+   result_var = find.result_var.name
+   loop_label = result_var + Name('Loop')
+%>
+
+<%def name="check_item()">
+   % if find.expr:
+      ${find.expr.render_pre()}
+      if ${find.expr.render_expr()} then
+         ${find.element_var.render_store(result_var)}
+         ${iteration.exit_iteration(find, loop_label)}
+      end if;
+   % else:
+      ${find.element_var.render_store(result_var)}
+      ${iteration.exit_iteration(find, loop_label)}
+   % endif
+</%def>
+
+${result_var} := ${find.type.nullexpr()};
+${iteration.iterate(find, loop_label, check_item)}
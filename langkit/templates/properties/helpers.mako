@@ -153,9 +153,3 @@
 
    % endfor
 </%def>
-
-<%def name="inc_ref(var)">
-   % if var.type.is_refcounted():
-      Inc_Ref (${var.name});
-   % endif
-</%def>
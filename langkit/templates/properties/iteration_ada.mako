@@ -0,0 +1,147 @@
+## vim: filetype=makoada
+
+<%namespace name="scopes" file="scopes_ada.mako" />
+
+## Helpers to iterate over the items of collections. When the collection of a
+## collection expression is a map expression that was fused with it (see
+## langkit.expressions.collections.fuse_collection_pipelines), the items this
+## map produces are consumed as soon as they are computed, so the array for the
+## map result is never built.
+
+## Render statements that run the "body" def for each item in the collection of
+## "consumer", with the element variable of "consumer" bound to this item. Also
+## maintain the index variable of "consumer" and finalize its iteration scope
+## after each item. "label" is the name of the outermost loop, so that "body"
+## can exit the whole iteration.
+<%def name="iterate(consumer, label, body)">
+   <%
+      collection = consumer.collection
+      list_element_var = (consumer.list_element_var.name
+                          if consumer.list_element_var else
+                          None)
+      element_var = consumer.element_var.name
+      iteration_var = list_element_var or element_var
+   %>
+
+   <%def name="consume()">
+      ${body()}
+      % if consumer.index_var:
+         ${consumer.index_var.name} := ${consumer.index_var.name} + 1;
+      % endif
+      ${scopes.finalize_scope(consumer.iter_scope)}
+   </%def>
+
+   <%def name="produce_and_consume()">
+      ${produce(consumer.producer, label, element_var, consume)}
+   </%def>
+
+   % if consumer.index_var:
+      ${consumer.index_var.name} := 0;
+   % endif
+
+   % if consumer.producer:
+      ${iterate(consumer.producer, label, produce_and_consume)}
+
+   % else:
+      ${collection.render_pre()}
+
+      ## Empty lists are null: handle this pecularity here to make it easier
+      ## for property writers.
+      % if collection.type.is_list_type:
+      if ${collection.render_expr()} /= null then
+      % endif
+
+      ${label} : for ${iteration_var} of
+         % if collection.type.is_list_type:
+            ${collection.render_expr()}.Vec
+         % else:
+            ${collection.render_expr()}.Items
+         % endif
+      loop
+         % if list_element_var:
+            ${element_var} :=
+               ${consumer.element_var.type.name()} (${list_element_var});
+         % endif
+
+         ${consume()}
+      end loop ${label};
+
+      % if collection.type.is_list_type:
+      end if;
+      % endif
+   % endif
+</%def>
+
+## Render statements that exit the iteration that "iterate" renders for
+## "consumer" from its "body" def. As this skips the end of the current
+## iteration, finalize the iteration scopes of "consumer" and of the map
+## expressions fused with it first.
+<%def name="exit_iteration(consumer, label)">
+   <%
+      iter_scopes = []
+      c = consumer
+      while c:
+         iter_scopes.append(c.iter_scope)
+         c = c.producer
+   %>
+   % for iter_scope in iter_scopes:
+      ${scopes.finalize_scope(iter_scope)}
+   % endfor
+   exit ${label};
+</%def>
+
+## Render statements that compute the items that "map" produces for its current
+## element, and that run the "body" def for each of them with "item_var"
+## (a constant) bound to it. If "item_referenced" is false, "body" does not
+## reference "item_var".
+<%def name="produce(map, label, item_var, body, item_referenced=True)">
+   <% item_type = map.type.element_type().name() %>
+
+   % if map.take_while:
+      ${map.take_while.render_pre()}
+      exit ${label} when not (${map.take_while.render_expr()});
+   % endif
+
+   % if map.filter:
+      ${map.filter.render_pre()}
+      if ${map.filter.render_expr()} then
+   % endif
+
+   ${map.expr.render_pre()}
+   % if map.concat and (map.expr.type.is_list_type or not item_referenced):
+      for Collection_Item of
+         % if map.expr.type.is_list_type:
+            ${map.expr.render_expr()}.Vec
+         % else:
+            ${map.expr.render_expr()}.Items
+         % endif
+      loop
+         declare
+            ${item_var} : constant ${item_type} :=
+               ${item_type} (Collection_Item);
+            % if not item_referenced:
+            pragma Unreferenced (${item_var});
+            % endif
+         begin
+            ${body()}
+         end;
+      end loop;
+   % elif map.concat:
+      for ${item_var} of ${map.expr.render_expr()}.Items loop
+         ${body()}
+      end loop;
+   % else:
+      declare
+         ${item_var} : constant ${item_type} := ${map.expr.render_expr()};
+         % if not item_referenced:
+         pragma Unreferenced (${item_var});
+         % endif
+      begin
+         ${body()}
+      end;
+   % endif
+
+   % if map.filter:
+      end if;
+   % endif
+</%def>
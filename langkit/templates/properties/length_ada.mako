@@ -0,0 +1,23 @@
+## vim: filetype=makoada
+
+<%namespace name="iteration" file="iteration_ada.mako" />
+
+## Count the items that the map expression "length.producer" produces without
+## building the corresponding array.
+
+<%
+   count_var = length.count_var.name
+   loop_label = count_var + Name('Loop')
+%>
+
+<%def name="count_item()">
+   ${count_var} := ${count_var} + 1;
+</%def>
+
+<%def name="produce_and_count()">
+   ${iteration.produce(length.producer, loop_label, 'Counted_Item', count_item,
+                       item_referenced=False)}
+</%def>
+
+${count_var} := 0;
+${iteration.iterate(length.producer, loop_label, produce_and_count)}
@@ -0,0 +1,61 @@
+## vim: filetype=makoada
+
+<%
+is_env_el = expr.prefix_var.type.is_env_element_type
+prefix = str(expr.prefix_var.name) + ('.El' if is_env_el else '')
+
+## Unreachable matchers get no kind at all. When only one matcher is
+## reachable, there is nothing to dispatch on.
+reachable_matchers = [(choices, match_var, match_expr)
+                      for choices, (_, match_var, match_expr)
+                      in zip(expr.choices, expr.matchers)
+                      if choices]
+%>
+
+## Render the statements that bind "match_var" to the matched value and that
+## evaluate "match_expr" in the result variable.
+<%def name="match_branch(match_var, match_expr)">
+   <%
+   is_env_el = expr.prefix_var.type.is_env_element_type
+   prefix = str(expr.prefix_var.name) + ('.El' if is_env_el else '')
+   %>
+   % if is_env_el:
+      ${match_var.name} :=
+        (El => ${match_var.type.el_type.name()} (${prefix}),
+         Md => ${expr.prefix_var.name}.Md,
+         Parents_Bindings => ${expr.prefix_var.name}.Parents_Bindings,
+         Is_Null => False);
+   % else:
+      ${match_var.name} := ${match_var.type.name()} (${prefix});
+   % endif
+   ${match_expr.render_pre()}
+   ${match_expr.render_store(expr.result_var.name)}
+</%def>
+
+## The matched value can be null, and a null node has no kind: no matcher can
+## handle it.
+% if expr.null_check:
+if ${prefix} = null then
+   raise Property_Error with "dereferencing a null access";
+end if;
+% endif
+
+% if len(reachable_matchers) == 1:
+   <% _, match_var, match_expr = reachable_matchers[0] %>
+   ${match_branch(match_var, match_expr)}
+% else:
+   case ${prefix}.Kind is
+      % for choices, match_var, match_expr in reachable_matchers:
+         when ${choices} =>
+            ${match_branch(match_var, match_expr)}
+      % endfor
+
+      ## Coverage checks ensure that matchers handle all the kinds the
+      ## matched value can have, but Ada requires the case statement to cover
+      ## all others too.
+      % if not expr.covers_all_kinds:
+         when others =>
+            raise Program_Error with "Executing supposedly unreachable code";
+      % endif
+   end case;
+% endif
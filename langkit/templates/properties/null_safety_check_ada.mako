@@ -2,7 +2,9 @@
 
 ${expr.render_pre()}
 ${result_var.name} := ${expr.render_expr()};
-% if expr.type.is_ptr:
+## "check" is false when the value is known not to be null: see
+## langkit.expressions.structs.eliminate_safety_checks.
+% if expr.type.is_ptr and check:
    if ${result_var.name} = null then
       raise Property_Error with "dereferencing a null access";
    end if;
@@ -0,0 +1,10 @@
+## vim: filetype=makoada
+
+<%namespace name="helpers" file="helpers.mako" />
+
+## Declaration in the separate unit for this property. This is not a primitive
+## of the node type: the primitive in $.Analysis calls it.
+
+function ${property.name}
+  ${helpers.argument_list(property, property.dispatching)}
+   return ${property.type.name()};
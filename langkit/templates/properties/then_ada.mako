@@ -1,10 +1,7 @@
 ## vim: filetype=makoada
 
-<%namespace name="helpers" file="helpers.mako" />
-
 ${then.expr.render_pre()}
-${then.var_expr.name} := ${then.expr.render_expr()};
-${helpers.inc_ref(then.var_expr)}
+${then.expr.render_store(then.var_expr.name)}
 
 if
    <%
@@ -18,9 +15,8 @@ if
    % endif
 then
    ${then.then_expr.render_pre()}
-   ${then.result_var.name} := ${then.then_expr.render_expr()};
+   ${then.then_expr.render_store(then.result_var.name)}
 else
    ${then.default_expr.render_pre()}
-   ${then.result_var.name} := ${then.default_expr.render_expr()};
+   ${then.default_expr.render_store(then.result_var.name)}
 end if;
-${helpers.inc_ref(then.result_var)}
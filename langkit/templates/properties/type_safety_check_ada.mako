@@ -9,10 +9,14 @@ source = str(expr.expr_var.name) + (".El" if is_env_el else "")
 ${expr.expr.render_pre()}
 ${expr.expr_var.name} := ${expr.expr.render_expr()};
 
+## The kind check is useless when it cannot fail: see
+## langkit.expressions.structs.eliminate_safety_checks.
+% if expr.type_check:
 if ${source} = null
      or else
    ${source}.all in ${ast_node.value_type_name()}'Class
 then
+% endif
 % if is_env_el:
    ${expr.result_var.name} :=
      (El => ${ast_node.name()} (${expr.expr_var.name}.El),
@@ -22,6 +26,7 @@ then
 % else:
    ${expr.result_var.name} := ${ast_node.name()} (${expr.expr_var.name});
 % endif
+% if expr.type_check:
 else
    % if expr.do_raise:
    raise Property_Error with "invalid object cast";
@@ -29,3 +34,4 @@ else
    ${expr.result_var.name} := ${expr.static_type.nullexpr()};
    % endif
 end if;
+% endif
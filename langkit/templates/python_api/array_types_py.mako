@@ -9,6 +9,12 @@
    ptr_name = pyapi.type_internal_name(cls)
    inc_ref = '_{}_inc_ref'.format(type_name)
    dec_ref = '_{}_dec_ref'.format(type_name)
+   elt_type = cls.element_type()
+
+   ## Arrays of scalars, enumerators and node references are stored as plain
+   ## C values: we can expose them without copying anything.
+   is_flat = (is_bool(elt_type) or is_long(elt_type) or is_enum(elt_type)
+              or is_ast_node(elt_type))
 %>
 
 ${py_doc(cls)}
@@ -76,12 +82,57 @@ class ${type_name}(object):
         ## reference to the record. Thus, in order to keep memory safety, we
         ## must copy the record itself so that the array can be deallocated
         ## while the user still has a reference to a record.
-        <% elt_type = cls.element_type() %>
         % if is_struct_type(elt_type) and not is_ast_node(elt_type):
         return item.copy()
         % else:
         return ${pyapi.wrap_value('item', elt_type)}
         % endif
 
+    % if is_flat:
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def _raw_items(self):
+        """
+        Return a ctypes array that maps the elements of this array in place.
+        """
+        items_addr = _field_address(self._c_value.contents, 'items')
+        result = (${element_type} * self._length).from_address(items_addr)
+
+        # The ctypes array does not own its memory: make it keep this wrapper
+        # (and thus the underlying array) alive.
+        result._array = self
+        return result
+
+    def to_list(self):
+        """
+        Return a list that contains all the elements of this array. This is
+        much faster than iterating over the array, as all the elements are
+        converted at once.
+        """
+        ## Slicing a ctypes array converts all its elements in a single call.
+        ## Note that slices yield plain Python values, hence the field access
+        ## wrapping mode.
+        % if is_long(elt_type):
+        return self._raw_items()[:]
+        % else:
+        return [${pyapi.wrap_value('item', elt_type, from_field_access=True)}
+                for item in self._raw_items()[:]]
+        % endif
+
+    def as_memoryview(self):
+        """
+        Return a memoryview on the elements of this array, without copying
+        them. The array is kept alive as long as the memoryview exists.
+        """
+        return memoryview(self._raw_items())
+    % else:
+    def to_list(self):
+        """
+        Return a list that contains all the elements of this array.
+        """
+        return [self[i] for i in range(self._length)]
+    % endif
+
 % endif
 </%def>
@@ -0,0 +1,130 @@
+## vim: filetype=makopython
+
+<% module_name = pyapi.module_name %>
+
+"""
+Helpers to analyze a corpus of source files with a pool of worker processes.
+
+Analysis units and nodes cannot cross process boundaries, so workers run a
+user callback on each analysis unit and send back only its result, which must
+be picklable. The `snapshot` function turns a node into such a result.
+
+Each worker reuses the same analysis context for all the files it processes,
+so that units referenced from several files are parsed only once per worker.
+"""
+
+import collections
+import multiprocessing
+import os
+
+import ${module_name}
+
+
+NodeSnapshot = collections.namedtuple(
+    'NodeSnapshot', 'kind_name filename sloc_range text'
+)
+"""
+Picklable summary of an AST node: its kind name, the name of the file that
+contains it, its source location range and its source text.
+"""
+
+
+def snapshot(node):
+    """
+    Return a NodeSnapshot for `node`, or None if `node` is None.
+
+    :type node: ${module_name}.${T.root_node.name().camel}|None
+    :rtype: NodeSnapshot|None
+    """
+    if node is None:
+        return None
+    return NodeSnapshot(node.kind_name, node.unit.filename, node.sloc_range,
+                        node.text)
+
+
+def _memory_usage():
+    """
+    Return the resident set size of the current process, in bytes, or None if
+    it cannot be determined on this platform.
+
+    :rtype: int|None
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (IOError, OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+
+class _Worker(object):
+    """
+    State for a worker process. There is exactly one instance per process,
+    created by the pool initializer.
+    """
+
+    instance = None
+
+    def __init__(self, callback, charset, memory_limit):
+        self.callback = callback
+        self.charset = charset
+        self.memory_limit = memory_limit
+        self.context = None
+
+    def process(self, filename):
+        if self.context is None:
+            self.context = ${module_name}.AnalysisContext(self.charset)
+
+        unit = self.context.get_from_file(filename)
+        result = self.callback(unit)
+
+        # If we are above the memory ceiling, drop the analysis context (and
+        # thus all its analysis units): the next file will start from a fresh
+        # one.
+        if self.memory_limit is not None:
+            usage = _memory_usage()
+            if usage is not None and usage > self.memory_limit:
+                del unit
+                self.context = None
+
+        return (filename, result)
+
+
+def _init_worker(callback, charset, memory_limit):
+    _Worker.instance = _Worker(callback, charset, memory_limit)
+
+
+def _process_file(filename):
+    return _Worker.instance.process(filename)
+
+
+def analyze_files(filenames, callback, jobs=None, charset=None,
+                  memory_limit=None, chunksize=1):
+    """
+    Parse all files in `filenames` over a pool of worker processes and run
+    `callback` on the resulting analysis units.
+
+    Return an iterator that yields a (filename, result) couple for each file,
+    in completion order, `result` being the value `callback` returned for the
+    unit. Exceptions raised by `callback` are propagated to the caller.
+
+    :param list[str] filenames: Names of the files to analyze.
+    :param callback: Function to call on each analysis unit. Its result must
+        be picklable.
+    :type callback: (${module_name}.AnalysisUnit) -> object
+    :param int|None jobs: Number of worker processes. If None, use as many as
+        there are CPUs.
+    :param str|None charset: Charset to use in order to decode the files.
+    :param int|None memory_limit: If not None, a worker discards its analysis
+        context once its resident set size exceeds this number of bytes.
+    :param int chunksize: Number of files to send to a worker at once.
+    """
+    pool = multiprocessing.Pool(jobs, _init_worker,
+                                (callback, charset, memory_limit))
+    try:
+        for result in pool.imap_unordered(_process_file, filenames,
+                                          chunksize):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
@@ -11,6 +11,7 @@
 
 
 import collections
+import contextlib
 import ctypes
 import json
 import os
@@ -223,13 +224,26 @@ class AnalysisContext(object):
                                                with_trivia)
         return AnalysisUnit(c_value)
 
+    def get_from_files(self, filenames, charset=None, reparse=False,
+                       with_trivia=False, jobs=1):
+        ${py_doc('langkit.get_units_from_files', 8)}
+        filenames = list(filenames)
+        count = len(filenames)
+        c_filenames = (ctypes.c_char_p * count)(*filenames)
+        c_units = (_analysis_unit * count)()
+        _get_analysis_units_from_files(self._c_value, c_filenames, count,
+                                       charset or '', reparse, with_trivia,
+                                       jobs, c_units)
+        return [AnalysisUnit(c_value) for c_value in c_units]
+
     def get_from_buffer(self, filename, buffer, charset=None, reparse=False,
                         with_trivia=False):
         ${py_doc('langkit.get_unit_from_buffer', 8)}
-        c_value = _get_analysis_unit_from_buffer(self._c_value, filename,
-                                                 charset or '',
-                                                 buffer, len(buffer),
-                                                 with_trivia)
+        with _buffer_address(buffer) as (buffer_addr, buffer_size):
+            c_value = _get_analysis_unit_from_buffer(self._c_value, filename,
+                                                     charset or '',
+                                                     buffer_addr, buffer_size,
+                                                     with_trivia)
         return AnalysisUnit(c_value)
 
 % if ctx.default_unit_file_provider:
@@ -326,8 +340,9 @@ class AnalysisUnit(object):
         if buffer is None:
             _unit_reparse_from_file(self._c_value, charset or '')
         else:
-            _unit_reparse_from_buffer(self._c_value, charset or '',
-                                      buffer, len(buffer))
+            with _buffer_address(buffer) as (buffer_addr, buffer_size):
+                _unit_reparse_from_buffer(self._c_value, charset or '',
+                                          buffer_addr, buffer_size)
 
     def populate_lexical_env(self):
         ${py_doc('langkit.unit_populate_lexical_env', 8)}
@@ -816,18 +831,11 @@ class ${root_astnode_name}(object):
         data types (dicts, lists, strings, ints, etc), and representing the
         portion of the AST corresponding to this node.
         """
-        if self.is_list_type:
-            return [i.to_data() for i in self if i is not None]
-        else:
-            return {n: v.to_data()
-                    for n, v in self.iter_fields(with_properties=False)
-                    if v is not None}
+        return json.loads(self.to_json())
 
     def to_json(self):
-        """
-        Return a JSON representation of this node.
-        """
-        return json.dumps(self.to_data())
+        ${py_doc('langkit.node_to_json', 8)}
+        return unwrap_str(_node_to_json(self._c_value))
 
 
 % for astnode in ctx.astnode_types:
@@ -962,12 +970,24 @@ _get_analysis_unit_from_file = _import_func(
      ctypes.c_int],      # reparse
     _analysis_unit
 )
+_get_analysis_units_from_files = _import_func(
+    '${capi.get_name("get_analysis_units_from_files")}',
+    [_analysis_context,                 # context
+     ctypes.POINTER(ctypes.c_char_p),   # filenames
+     ctypes.c_size_t,                   # count
+     ctypes.c_char_p,                   # charset
+     ctypes.c_int,                      # reparse
+     ctypes.c_int,                      # with_trivia
+     ctypes.c_int,                      # jobs
+     ctypes.POINTER(_analysis_unit)],   # units
+    None
+)
 _get_analysis_unit_from_buffer = _import_func(
     '${capi.get_name("get_analysis_unit_from_buffer")}',
     [_analysis_context,  # context
      ctypes.c_char_p,    # filename
      ctypes.c_char_p,    # charset
-     ctypes.c_char_p,    # buffer
+     ctypes.c_void_p,    # buffer
      ctypes.c_size_t],   # buffer_size
     _analysis_unit
 )
@@ -1044,7 +1064,7 @@ _unit_reparse_from_buffer = _import_func(
     '${capi.get_name("unit_reparse_from_buffer")}',
     [_analysis_unit,    # context
      ctypes.c_char_p,   # charset
-     ctypes.c_char_p,   # buffer
+     ctypes.c_void_p,   # buffer
      ctypes.c_size_t],  # buffer_size
     None
 )
@@ -1066,6 +1086,10 @@ _node_short_image = _import_func(
     '${capi.get_name("node_short_image")}',
     [_node], _text
 )
+_node_to_json = _import_func(
+    '${capi.get_name("node_to_json")}',
+    [_node], ctypes.POINTER(ctypes.c_char)
+)
 _node_sloc_range = _import_func(
     '${capi.get_name("node_sloc_range")}',
     [_node, ctypes.POINTER(_SlocRange)], None
@@ -1176,6 +1200,85 @@ _token_range_text = _import_func(
 # Layering helpers
 #
 
+class _Py_buffer(ctypes.Structure):
+    # Layout of the Py_buffer structure of Python 2.7, as filled by
+    # PyObject_GetBuffer.
+    _fields_ = [('buf', ctypes.c_void_p),
+                ('obj', ctypes.c_void_p),
+                ('len', ctypes.c_ssize_t),
+                ('itemsize', ctypes.c_ssize_t),
+                ('readonly', ctypes.c_int),
+                ('ndim', ctypes.c_int),
+                ('format', ctypes.c_char_p),
+                ('shape', ctypes.c_void_p),
+                ('strides', ctypes.c_void_p),
+                ('suboffsets', ctypes.c_void_p),
+                ('smalltable', ctypes.c_ssize_t * 2),
+                ('internal', ctypes.c_void_p)]
+
+
+_PyBUF_SIMPLE = 0
+
+_PyObject_GetBuffer = ctypes.pythonapi.PyObject_GetBuffer
+_PyObject_GetBuffer.argtypes = [ctypes.py_object, ctypes.POINTER(_Py_buffer),
+                                ctypes.c_int]
+_PyObject_GetBuffer.restype = ctypes.c_int
+
+_PyBuffer_Release = ctypes.pythonapi.PyBuffer_Release
+_PyBuffer_Release.argtypes = [ctypes.POINTER(_Py_buffer)]
+_PyBuffer_Release.restype = None
+
+_PyObject_AsReadBuffer = ctypes.pythonapi.PyObject_AsReadBuffer
+_PyObject_AsReadBuffer.argtypes = [ctypes.py_object,
+                                   ctypes.POINTER(ctypes.c_void_p),
+                                   ctypes.POINTER(ctypes.c_ssize_t)]
+_PyObject_AsReadBuffer.restype = ctypes.c_int
+
+
+@contextlib.contextmanager
+def _buffer_address(buffer):
+    """
+    Context manager that yields the address and the size of the memory that
+    holds the content of "buffer", so that the library can read it in place,
+    without any copy.
+
+    "buffer" can be any object that implements the buffer interface: str,
+    bytearray, buffer, memoryview, mmap.mmap, array.array, etc. For unicode
+    objects, the ASCII encoding is used, as the library expects bytes.
+
+    Foreign calls release the GIL, so other threads can run while the library
+    reads this memory. To keep it valid, a buffer export is held until the
+    context manager exits: exporting objects such as bytearray cannot be
+    resized in the meantime. Python 2 mmap.mmap and array.array objects only
+    implement the old buffer interface, which does not track exports, so their
+    content is copied first.
+
+    :rtype: contextlib.GeneratorContextManager
+    """
+    if isinstance(buffer, unicode):
+        buffer = buffer.encode('ascii')
+
+    view = _Py_buffer()
+    try:
+        _PyObject_GetBuffer(buffer, ctypes.byref(view), _PyBUF_SIMPLE)
+    except TypeError:
+        # The following raises a TypeError if "buffer" does not implement the
+        # old buffer interface either.
+        address = ctypes.c_void_p()
+        size = ctypes.c_ssize_t()
+        _PyObject_AsReadBuffer(buffer, ctypes.byref(address),
+                               ctypes.byref(size))
+        buffer = (ctypes.string_at(address.value, size.value)
+                  if size.value else
+                  '')
+        _PyObject_GetBuffer(buffer, ctypes.byref(view), _PyBUF_SIMPLE)
+
+    try:
+        yield (view.buf, view.len)
+    finally:
+        _PyBuffer_Release(ctypes.byref(view))
+
+
 def unwrap_str(c_char_p_value):
     """
     Assuming c_char_p_value is a valid char*, convert it to a native Python
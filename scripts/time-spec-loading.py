@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+
+"""
+Measure how long it takes to load a language specification, and how much of
+this time is spent capturing source locations for DSL objects (parsers, node
+types, properties, ...).
+
+Each measurement is done in a fresh Python process so that module caches do
+not hide the loading cost.
+"""
+
+from __future__ import absolute_import
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+parser = argparse.ArgumentParser(
+    description='Time the loading of a Langkit language specification'
+)
+parser.add_argument(
+    'lang_source_dir',
+    help='Directory that contains the language specification, i.e. the one'
+         ' that contains manage.py'
+)
+parser.add_argument(
+    'modules', nargs='*', default=['language.parser'],
+    help='Modules to import from the language specification (default:'
+         ' language.parser)'
+)
+parser.add_argument(
+    '--repeat', '-r', type=int, default=5,
+    help='Number of measurements to make (default: 5)'
+)
+parser.add_argument(
+    '--child', action='store_true',
+    help=argparse.SUPPRESS
+)
+
+
+def measure(lang_source_dir, modules):
+    """
+    Import `modules` and print a JSON object containing the total loading
+    time, the time spent in location capture and the number of captured
+    locations.
+    """
+    start = time.time()
+
+    # Instrument location capture before any other Langkit module imports
+    # it.
+    from langkit import diagnostics
+    diagnostics.Diagnostics.set_lang_source_dir(lang_source_dir)
+
+    stats = {'count': 0, 'time': 0.0}
+    extract_library_location = diagnostics.extract_library_location
+
+    def timed_extract_library_location():
+        loc_start = time.time()
+        result = extract_library_location()
+        stats['time'] += time.time() - loc_start
+        stats['count'] += 1
+        return result
+
+    diagnostics.extract_library_location = timed_extract_library_location
+
+    sys.path.insert(0, lang_source_dir)
+    for module in modules:
+        __import__(module)
+
+    print json.dumps({'total': time.time() - start,
+                      'locations': stats['time'],
+                      'count': stats['count']})
+
+
+def main(args):
+    lang_source_dir = os.path.abspath(args.lang_source_dir)
+    if args.child:
+        measure(lang_source_dir, args.modules)
+        return
+
+    results = []
+    for _ in range(args.repeat):
+        output = subprocess.check_output(
+            [sys.executable, __file__, '--child', lang_source_dir]
+            + args.modules
+        )
+        results.append(json.loads(output.splitlines()[-1]))
+
+    best = min(results, key=lambda r: r['total'])
+    print 'Best of {} runs:'.format(args.repeat)
+    print '  Total loading time: {:.3f}s'.format(best['total'])
+    print '  Location capture:   {:.3f}s ({} locations)'.format(
+        best['locations'], best['count']
+    )
+
+
+if __name__ == '__main__':
+    main(parser.parse_args())
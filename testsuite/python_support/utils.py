@@ -47,7 +47,8 @@ def prepare_context(grammar,
 
 def emit_and_print_errors(grammar_fn,
                           lexer=None,
-                          library_fields_all_public=False):
+                          library_fields_all_public=False,
+                          dead_code_elimination=False):
     """
     Compile and emit code for CTX. Return whether this was successful.
 
@@ -58,6 +59,9 @@ def emit_and_print_errors(grammar_fn,
 
     :param bool library_fields_all_public: Whether private fields should be
         exported in code generation (they are not by default).
+
+    :param bool dead_code_elimination: Whether to eliminate dead code. If
+        true, also print the dead code elimination report.
     :rtype: bool
     """
 
@@ -67,7 +71,8 @@ def emit_and_print_errors(grammar_fn,
 
     try:
         ctx = prepare_context(grammar_fn(), lexer, library_fields_all_public)
-        ctx.emit('build', generate_lexer=False)
+        ctx.emit('build', generate_lexer=False,
+                 dead_code_elimination=dead_code_elimination)
         # ... and tell about how it went
     except DiagnosticError:
         # If there is a diagnostic error, don't say anything, the diagnostics
@@ -75,6 +80,8 @@ def emit_and_print_errors(grammar_fn,
         return False
     else:
         print 'Code generation was successful'
+        if dead_code_elimination:
+            print ctx.dead_code_report()
         return True
     finally:
         reset_langkit()
@@ -82,10 +89,12 @@ def emit_and_print_errors(grammar_fn,
 
 def build_and_run(grammar, py_script,
                   lexer=None,
-                  library_fields_all_public=False):
+                  library_fields_all_public=False,
+                  separate_properties=False):
     """
     Compile and emit code for CTX and build the generated library. Then run
-    PY_SCRIPT with this library available.
+    PY_SCRIPT with this library available. If SEPARATE_PROPERTIES is true,
+    emit property bodies in separate units.
 
     An exception is raised if any step fails (the script must return code 0).
     """
@@ -110,6 +119,8 @@ def build_and_run(grammar, py_script,
     argv = ['-vnone', 'make']
     if ctx.library_fields_all_public:
         argv.append('--library-fields-all-public')
+    if separate_properties:
+        argv.append('--separate-properties')
     m.run(argv)
 
     # Then execute a script with it. Note that in order to use the generated
@@ -0,0 +1,25 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '(1, a, (2, 3, b), 4)'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+print 'Evaluating {}'.format(text)
+for label, group in [('root', u.root), ('nested', u.root.f_items[2])]:
+    print '{}:'.format(label)
+    print '  number_count = {}'.format(group.p_number_count)
+    print '  has_name = {}'.format(group.p_has_name)
+    print '  all_numbers = {}'.format(group.p_all_numbers)
+    print '  leading_numbers = {}'.format(
+        [n.f_tok.text for n in group.p_leading_numbers]
+    )
+    print '  nested_count = {}'.format(group.p_nested_count)
+    print '  number_indexes = {}'.format(group.p_number_indexes)
@@ -0,0 +1,73 @@
+"""
+Test that chained collection expressions, which the code generator fuses into
+single loops, compute the expected results.
+"""
+
+import os.path
+
+from langkit.compiled_types import ASTNode, Field, root_grammar_class
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import If, Not, Property, Self
+from langkit.parsers import Grammar, List, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    pass
+
+
+class Number(FooNode):
+    tok = Field()
+
+
+class Name(FooNode):
+    tok = Field()
+
+
+class Group(FooNode):
+    items = Field()
+
+    number_count = Property(
+        Self.items.filter(lambda i: i.is_a(Number)).length
+    )
+    has_name = Property(
+        Self.items.map(lambda i: i.cast(Name)).any(lambda n: Not(n.is_null))
+    )
+    all_numbers = Property(
+        Self.items.filter(lambda i: Not(i.is_a(Group)))
+        .all(lambda i: i.is_a(Number))
+    )
+    leading_numbers = Property(
+        Self.items.take_while(lambda i: i.is_a(Number))
+        .map(lambda i: i.cast(Number))
+    )
+    nested_count = Property(
+        Self.items.filter(lambda i: i.is_a(Group))
+        .mapcat(lambda g: g.cast(Group).items.map(lambda i: i))
+        .length
+    )
+    number_indexes = Property(
+        Self.items.map(lambda i, item: If(item.is_a(Number), i, -1))
+        .filter(lambda i: i >= 0)
+    )
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=','), ')'
+    ) ^ Group,
+    item=Or(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        Row(Tok(Token.Identifier, keep=True)) ^ Name,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
@@ -0,0 +1,36 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '(1, a, (2, 3), (b))'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+
+def evaluate(label, fn):
+    try:
+        result = fn()
+    except libfoolang.PropertyError:
+        print '  {}: got a PropertyError'.format(label)
+    else:
+        print '  {} = {}'.format(label, result)
+
+
+print 'Evaluating {}'.format(text)
+root = u.root
+for node in [root] + list(root.f_items):
+    print '{}:'.format(node.kind_name)
+    evaluate('grand_parent_size', lambda: node.p_grand_parent_size)
+    evaluate('enclosing_group size',
+             lambda: len(node.p_enclosing_group.f_items))
+    if isinstance(node, libfoolang.Group):
+        evaluate('sibling_count', lambda: node.p_sibling_count)
+        evaluate('parent_links', lambda: list(node.p_parent_links))
+        evaluate('has_sibling_group', lambda: node.p_has_sibling_group)
+        evaluate('nested_sizes', lambda: list(node.p_nested_sizes))
@@ -0,0 +1,88 @@
+"""
+Test that properties whose generated code shares the values of repeated
+expressions, and computes loop-invariant ones only once, compute the expected
+results.
+"""
+
+import os.path
+
+from langkit.compiled_types import ASTNode, Field, root_grammar_class, T
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import If, Not, Property, Self
+from langkit.parsers import Grammar, List, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    # The same field access chain in the condition and in one branch
+    grand_parent_size = Property(If(
+        Self.parent.parent.is_null,
+        -1,
+        Self.parent.parent.cast(T.Group).items.length
+    ))
+
+    # The same field access chain in both branches: no branch can reuse the
+    # value the other one computes.
+    enclosing_group = Property(If(
+        Self.is_a(T.Group),
+        Self.parent.parent.cast(T.Group),
+        Self.parent.parent.cast(T.Group),
+    ))
+
+
+class Number(FooNode):
+    tok = Field()
+
+
+class Name(FooNode):
+    tok = Field()
+
+
+class Group(FooNode):
+    items = Field()
+
+    # Loop-invariant expressions in a filter, a map and a quantifier
+    sibling_count = Property(Self.parent.parent.cast(T.Group).then(
+        lambda g: g.items.filter(
+            lambda i: Not(i == Self) & (i.parent.parent == Self.parent.parent)
+        ).length,
+        default_val=-1
+    ))
+    parent_links = Property(Self.items.map(
+        lambda i: i.parent.parent == Self.items.parent
+    ))
+    has_sibling_group = Property(Self.parent.parent.cast(T.Group).then(
+        lambda g: g.items.any(
+            lambda i: i.is_a(T.Group) & Not(i == Self)
+            & (Self.parent.parent == g)
+        ),
+        default_val=False
+    ))
+
+    # Repeated expression in a loop that is not loop-invariant
+    nested_sizes = Property(Self.items.map(
+        lambda i: If(
+            i.cast(T.Group).is_null, 0, i.cast(T.Group).items.length
+        )
+    ))
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=','), ')'
+    ) ^ Group,
+    item=Or(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        Row(Tok(Token.Identifier, keep=True)) ^ Name,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
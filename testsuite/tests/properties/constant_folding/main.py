@@ -0,0 +1,32 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '(1, (2, 3))'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+
+def nodes(node):
+    yield node
+    if isinstance(node, libfoolang.Group):
+        for item in node.f_items:
+            for n in nodes(item):
+                yield n
+
+
+print 'Evaluating {}'.format(text)
+for node in nodes(u.root):
+    print '{}:'.format(node.kind_name)
+    for name in ('const_if', 'const_not', 'const_null', 'same_null',
+                 'same_empty_array', 'and_true', 'or_false', 'and_false',
+                 'is_foo_node', 'kind_size'):
+        print '  {} = {}'.format(name, getattr(node, 'p_' + name))
+    if isinstance(node, libfoolang.Number):
+        print '  number_size = {}'.format(node.p_number_size)
@@ -0,0 +1,77 @@
+"""
+Test that properties whose expressions are folded at code generation time
+compute the expected results.
+"""
+
+import os.path
+
+from langkit.compiled_types import (
+    ASTNode, Field, LongType, root_grammar_class, T
+)
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import (
+    And, EmptyArray, If, Literal, No, Not, Or, Property, Self
+)
+from langkit.parsers import Grammar, List, Or as OrParser, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    # Constant conditions select a single branch
+    const_if = Property(If(Literal(1) < 2,
+                           10,
+                           Self.parent.cast(T.Group).items.length))
+    const_not = Property(Not(Literal(1) == 2))
+    const_null = Property(No(T.FooNode).is_null)
+    same_null = Property(No(T.FooNode) == No(T.FooNode))
+
+    # Each empty array is a new allocation, so two of them are not equal
+    same_empty_array = Property(EmptyArray(LongType) == EmptyArray(LongType))
+
+    # Constant operands of boolean operators
+    and_true = Property(And(Self.is_a(T.Number), Literal(True)))
+    or_false = Property(Or(Literal(False), Self.is_a(T.Group)))
+    and_false = Property(And(Literal(False), Self.parent.is_a(T.Group)))
+
+    # The static type already answers the kind test
+    is_foo_node = Property(Self.is_a(T.FooNode))
+
+    # Constant condition in a matcher
+    kind_size = Property(Self.match(
+        lambda g=T.Group: g.items.length,
+        lambda _=T.Number: If(Literal(True),
+                              -1,
+                              Self.parent.cast(T.Group).items.length),
+        lambda _: 0
+    ))
+
+
+class Number(FooNode):
+    tok = Field()
+
+    # Only one matcher handles the kinds the matched value can have
+    number_size = Property(Self.match(lambda _=T.Number: 1))
+
+
+class Group(FooNode):
+    items = Field()
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=','), ')'
+    ) ^ Group,
+    item=OrParser(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
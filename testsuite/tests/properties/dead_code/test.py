@@ -0,0 +1,89 @@
+"""
+Test that dead code elimination removes private properties that nothing can
+call, and the types that only these properties use, but keeps everything else.
+"""
+
+import os.path
+
+from langkit.compiled_types import (
+    ASTNode, BoolType, Field, LongType, Struct, abstract,
+    root_grammar_class
+)
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import (
+    AbstractProperty, If, Literal, New, Property, Self
+)
+from langkit.parsers import Grammar, Or, Row, Tok
+
+from lexer_example import Token
+from utils import emit_and_print_errors
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+class Pair(Struct):
+    left = Field(type=LongType)
+    right = Field(type=LongType)
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    pass
+
+
+@abstract
+class Expression(FooNode):
+    # Private, but called by a public property: alive
+    helper = Property(Literal(1), private=True)
+    public_count = Property(Self.helper + Self.is_literal_count)
+
+    # Dispatching private property called by a public one: the whole family
+    # is alive.
+    is_literal = AbstractProperty(type=BoolType, private=True)
+    is_literal_count = Property(If(Self.is_literal, 1, 0), private=True)
+
+    # Dispatching private property that nothing calls: the whole family is
+    # dead.
+    dead_dispatch = AbstractProperty(type=LongType, private=True)
+
+
+class Number(Expression):
+    tok = Field()
+
+    is_literal = Property(True)
+    dead_dispatch = Property(1)
+
+
+class Plus(Expression):
+    left = Field()
+    right = Field()
+
+    is_literal = Property(False)
+    dead_dispatch = Property(2)
+
+    # Private and called only by a dead property: dead
+    dead_callee = Property(Self.left.public_count, private=True)
+
+    # Private and not called: dead, and so are the types it uses
+    dead_pairs = Property(
+        Self.children.map(lambda _: New(Pair,
+                                        left=Self.helper,
+                                        right=Self.dead_callee)),
+        private=True
+    )
+
+
+def lang_def():
+    foo_grammar = Grammar('main_rule')
+    foo_grammar.add_rules(
+        main_rule=Or(
+            Row(foo_grammar.atom, '+', foo_grammar.main_rule) ^ Plus,
+            foo_grammar.atom
+        ),
+        atom=Row(Tok(Token.Number, keep=True)) ^ Number,
+    )
+    return foo_grammar
+
+emit_and_print_errors(lang_def, dead_code_elimination=True)
+print 'Done'
@@ -0,0 +1,20 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '(1, a, (2))'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+print 'Evaluating {}'.format(text)
+for node in [u.root, u.root.f_items[2]]:
+    print '{}:'.format(node.kind_name)
+    print '  item_codes = {}'.format(list(node.p_item_codes))
+    print '  name_codes = {}'.format(list(node.p_name_codes))
+    print '  self_code = {}'.format(node.p_self_code)
@@ -0,0 +1,64 @@
+"""
+Test that calls to dispatching properties whose implementation is statically
+known, which the generated code does not dispatch, call the right
+implementation.
+"""
+
+import os.path
+
+from langkit.compiled_types import ASTNode, Field, root_grammar_class, T
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import Property, Self
+from langkit.parsers import Grammar, List, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    code = Property(0)
+
+
+class Number(FooNode):
+    tok = Field()
+    code = Property(1)
+
+
+class Name(FooNode):
+    tok = Field()
+
+
+class Group(FooNode):
+    items = Field()
+    code = Property(2)
+
+    # Subclasses override FooNode.code: these calls dispatch
+    item_codes = Property(Self.items.map(lambda i: i.code))
+
+    # Name inherits FooNode.code and has no subclass: these calls do not
+    # dispatch.
+    name_codes = Property(Self.items.map(
+        lambda i: i.cast(T.Name).then(lambda n: n.code, default_val=-1)
+    ))
+
+    # Likewise for Group, which overrides FooNode.code
+    self_code = Property(Self.code)
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=','), ')'
+    ) ^ Group,
+    item=Or(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        Row(Tok(Token.Identifier, keep=True)) ^ Name,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
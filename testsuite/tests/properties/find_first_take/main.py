@@ -0,0 +1,33 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '(1, a, (2, 3), (b), 4, ())'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+
+def describe(node):
+    return ('{} {}'.format(node.kind_name, repr(node.text))
+            if node else
+            'None')
+
+
+print 'Evaluating {}'.format(text)
+for node in [u.root] + [n for n in u.root.f_items
+                        if isinstance(n, libfoolang.Group)]:
+    print '{}:'.format(describe(node))
+    print '  first_item = {}'.format(describe(node.p_first_item))
+    print '  first_name = {}'.format(describe(node.p_first_name))
+    print '  first_big_group = {}'.format(describe(node.p_first_big_group))
+    for label, nodes in [('two_items', node.p_two_items),
+                         ('two_numbers', node.p_two_numbers),
+                         ('no_items', node.p_no_items)]:
+        print '  {} = [{}]'.format(label, ', '.join(describe(n)
+                                                    for n in nodes))
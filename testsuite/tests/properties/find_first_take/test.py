@@ -0,0 +1,65 @@
+"""
+Test that "find", "first" and "take" collection expressions, which stop
+iterating as soon as they have their result, compute the expected results.
+"""
+
+import os.path
+
+from langkit.compiled_types import ASTNode, Field, root_grammar_class, T
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import Property, Self
+from langkit.parsers import Grammar, List, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    pass
+
+
+class Number(FooNode):
+    tok = Field()
+
+
+class Name(FooNode):
+    tok = Field()
+
+
+class Group(FooNode):
+    items = Field()
+
+    first_item = Property(Self.items.first)
+    first_name = Property(Self.items.find(lambda i: i.is_a(T.Name)))
+
+    # The filter is fused with the find expression, so the iteration stops on
+    # the first matching group.
+    first_big_group = Property(
+        Self.items.filter(lambda i: i.is_a(T.Group))
+        .find(lambda g: g.cast(T.Group).items.length > 1)
+    )
+
+    two_items = Property(Self.items.take(2))
+    two_numbers = Property(
+        Self.items.filter(lambda i: i.is_a(T.Number)).take(2)
+    )
+    no_items = Property(Self.items.take(0))
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=',', empty_valid=True), ')'
+    ) ^ Group,
+    item=Or(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        Row(Tok(Token.Identifier, keep=True)) ^ Name,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
@@ -0,0 +1,46 @@
+"""
+Test that invalid memoized properties are rejected.
+"""
+
+from langkit.compiled_types import (
+    ASTNode, LogicVarType, LongType, UserField, root_grammar_class
+)
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import Bind, Property, Self
+from langkit.parsers import Grammar, Row
+
+from os import path
+from utils import emit_and_print_errors
+
+
+def run(name, expr_fn):
+    """
+    Emit and print the errors we get for the below grammar with "expr_fn" as
+    the expression for a memoized property in BarNode.
+    """
+
+    Diagnostics.set_lang_source_dir(path.abspath(__file__))
+
+    print('== {} =='.format(name))
+
+    @root_grammar_class()
+    class FooNode(ASTNode):
+        pass
+
+    class BarNode(FooNode):
+        var = UserField(LogicVarType, is_private=True)
+        prop = Property(expr_fn(), private=True, memoized=True)
+
+    def lang_def():
+        foo_grammar = Grammar('main_rule')
+        foo_grammar.add_rules(main_rule=Row('example') ^ BarNode)
+        return foo_grammar
+
+    emit_and_print_errors(lang_def)
+    print('')
+
+
+run('Explicit argument', lambda: lambda x=LongType: x)
+run('Equation', lambda: Bind(Self.var, Self))
+run('Correct', lambda: Self.parent)
+print 'Done'
@@ -0,0 +1,69 @@
+"""
+Test that pure properties cannot perform operations that have side effects or
+that depend on more than their node and arguments.
+"""
+
+from langkit.compiled_types import (
+    ASTNode, BoolType, LogicVarType, UserField, abstract,
+    root_grammar_class
+)
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import (
+    AbstractProperty, Bind, Let, Property, Self, get_value,
+    langkit_property
+)
+from langkit.parsers import Grammar, Or, Row
+
+from os import path
+from utils import emit_and_print_errors
+
+
+def run(name, expr_fn, base_pure=True):
+    """
+    Emit and print the errors we get for the below grammar with "expr_fn" as
+    the expression for a pure property in BarNode.
+    """
+
+    Diagnostics.set_lang_source_dir(path.abspath(__file__))
+
+    print('== {} =='.format(name))
+
+    @root_grammar_class()
+    class FooNode(ASTNode):
+        ref_var = UserField(LogicVarType, is_private=True)
+
+        impure_prop = Property(True)
+        pure_prop = Property(True, pure=True)
+
+    @abstract
+    class Expr(FooNode):
+        base_prop = AbstractProperty(BoolType, pure=base_pure)
+
+    class BarNode(Expr):
+        @langkit_property(pure=True)
+        def base_prop():
+            return expr_fn()
+
+    class BazNode(Expr):
+        base_prop = Property(False)
+
+    def lang_def():
+        foo_grammar = Grammar('main_rule')
+        foo_grammar.add_rules(
+            main_rule=Or(
+                Row('example') ^ BarNode,
+                Row('example') ^ BazNode,
+            )
+        )
+        return foo_grammar
+
+    emit_and_print_errors(lang_def)
+    print('')
+
+
+run('Bind', lambda: Let(lambda eq=Bind(Self.ref_var, Self): True))
+run('Read logic variable', lambda: get_value(Self.ref_var) == Self)
+run('Impure call', lambda: Self.impure_prop)
+run('Inconsistent overriding', lambda: Self.pure_prop, base_pure=False)
+run('Correct', lambda: Self.pure_prop & Self.parent.pure_prop)
+print 'Done'
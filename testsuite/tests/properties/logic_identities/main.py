@@ -0,0 +1,15 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+u = ctx.get_from_buffer('main.txt', '1')
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+for name in ('and_true', 'or_false', 'and_false', 'or_true', 'all_true',
+             'any_false'):
+    print '{} = {}'.format(name, getattr(u.root, 'p_' + name))
@@ -0,0 +1,53 @@
+"""
+Test that equations combined with LogicTrue and LogicFalse, which the
+generated code drops, still have the expected solutions.
+"""
+
+import os.path
+
+from langkit.compiled_types import (
+    ASTNode, Field, LogicVarType, UserField, root_grammar_class
+)
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import (
+    All, Any, Bind, LogicFalse, LogicTrue, Property, Self
+)
+from langkit.parsers import Grammar, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    pass
+
+
+class Literal(FooNode):
+    tok = Field()
+
+    var = UserField(LogicVarType, is_private=True)
+    bind_self = Property(Bind(Self.var, Self), private=True)
+
+    and_true = Property((LogicTrue() & Self.bind_self).solve)
+    or_false = Property((Self.bind_self | LogicFalse()).solve)
+    and_false = Property((Self.bind_self & LogicFalse()).solve)
+    or_true = Property((LogicFalse() | LogicTrue()).solve)
+
+    all_true = Property(
+        All(Self.children.map(lambda _: LogicTrue())).solve
+    )
+    any_false = Property(
+        Any(Self.children.map(lambda _: LogicFalse())).solve
+    )
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(Tok(Token.Number, keep=True)) ^ Literal,
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
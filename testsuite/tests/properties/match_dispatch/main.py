@@ -0,0 +1,29 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '(1, a, (2, 3))'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+print 'Evaluating {}'.format(text)
+root = u.root
+for node in [root] + list(root.f_items):
+    print '{}:'.format(node.kind_name)
+    print '  category = {}'.format(node.p_category)
+    if isinstance(node, libfoolang.Atom):
+        print '  atom_code = {}'.format(node.p_atom_code)
+    if isinstance(node, libfoolang.Group):
+        print '  first_numbers = {}'.format(
+            [n.kind_name for n in node.p_first_numbers]
+        )
+    try:
+        print '  parent_category = {}'.format(node.p_parent_category)
+    except libfoolang.PropertyError:
+        print '  parent_category: got a PropertyError'
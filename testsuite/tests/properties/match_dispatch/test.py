@@ -0,0 +1,78 @@
+"""
+Test that match expressions, which the code generator turns into dispatches on
+node kinds, select the expected matchers.
+"""
+
+import os.path
+
+from langkit.compiled_types import (
+    ASTNode, Field, LongType, T, abstract, root_grammar_class
+)
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import Property, Self
+from langkit.parsers import Grammar, List, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    # Matcher for an abstract type, then for a concrete one
+    category = Property(Self.match(
+        lambda a=T.Atom: 1,
+        lambda g=T.Group: 2,
+        lambda o: 3,
+    ), type=LongType)
+
+    # The root node has no parent: matching a null node must raise an error
+    parent_category = Property(Self.parent.match(
+        lambda g=T.Group: 2,
+        lambda o: 3,
+    ), type=LongType)
+
+
+@abstract
+class Atom(FooNode):
+    # The input type does not cover all node kinds
+    atom_code = Property(Self.match(
+        lambda n=T.Number: 10,
+        lambda n=T.Name: 20,
+    ), type=LongType)
+
+
+class Number(Atom):
+    tok = Field()
+
+
+class Name(Atom):
+    tok = Field()
+
+
+class Group(FooNode):
+    items = Field()
+
+    # Matchers return different node types, so results need upcasts
+    first_numbers = Property(Self.items.map(lambda i: i.match(
+        lambda n=Number: n,
+        lambda g=Group: g.items.at(0),
+        lambda o: o,
+    )))
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=','), ')'
+    ) ^ Group,
+    item=Or(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        Row(Tok(Token.Identifier, keep=True)) ^ Name,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
@@ -0,0 +1,30 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '(1, (2, (3)))'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+
+def nodes(node):
+    yield node
+    if isinstance(node, libfoolang.Group):
+        for item in node.f_items:
+            for n in nodes(item):
+                yield n
+
+
+print 'Evaluating {}'.format(text)
+for node in nodes(u.root):
+    print '{}:'.format(node.kind_name)
+    print '  depth = {}'.format(node.p_depth)
+    print '  depth_delta = {}'.format(node.p_depth_delta)
+    if isinstance(node, libfoolang.Group):
+        print '  deeper_items = {}'.format(node.p_deeper_items)
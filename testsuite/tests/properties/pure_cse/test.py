@@ -0,0 +1,59 @@
+"""
+Test that properties whose generated code shares the results of calls to pure
+properties compute the expected results.
+"""
+
+import os.path
+
+from langkit.compiled_types import (
+    ASTNode, Field, LongType, root_grammar_class
+)
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import If, Property, Self
+from langkit.parsers import Grammar, List, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    depth = Property(If(Self.parent.is_null, 0, Self.parent.depth + 1),
+                     type=LongType, pure=True)
+    is_deeper = Property(lambda n=LongType: Self.depth > n, pure=True)
+
+    # Repeated calls to a pure property, with and without arguments
+    depth_delta = Property(If(
+        Self.is_deeper(3), Self.depth - 3,
+        If(Self.is_deeper(3), -1, Self.depth - 1)
+    ))
+
+
+class Number(FooNode):
+    tok = Field()
+
+
+class Group(FooNode):
+    items = Field()
+
+    # Loop-invariant call to a pure property in a filter
+    deeper_items = Property(Self.items.filter(
+        lambda i: i.is_deeper(Self.depth + 1)
+    ).length)
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=','), ')'
+    ) ^ Group,
+    item=Or(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
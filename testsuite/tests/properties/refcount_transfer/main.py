@@ -0,0 +1,34 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '(1, a, (2, 3), ((b)))'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+
+def evaluate(label, fn):
+    try:
+        result = [n.kind_name for n in fn()]
+    except libfoolang.PropertyError:
+        print '  {}: got a PropertyError'.format(label)
+    else:
+        print '  {} = {}'.format(label, result)
+
+
+print 'Evaluating {}'.format(text)
+root = u.root
+for node in [root] + list(root.f_items):
+    print '{}:'.format(node.kind_name)
+    evaluate('siblings', lambda: node.p_siblings)
+    if isinstance(node, libfoolang.Group):
+        evaluate('leaves', lambda: node.p_leaves)
+        evaluate('leaves_or_self', lambda: node.p_leaves_or_self)
+        evaluate('doubled_leaves', lambda: node.p_doubled_leaves)
+        evaluate('parent_leaves', lambda: node.p_parent_leaves)
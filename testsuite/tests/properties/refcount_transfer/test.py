@@ -0,0 +1,73 @@
+"""
+Test that properties whose generated code hands over references to arrays
+between temporaries, instead of creating new ones, compute the expected
+results.
+"""
+
+import os.path
+
+from langkit.compiled_types import ASTNode, Field, root_grammar_class, T
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import If, Let, Not, Property, Self
+from langkit.parsers import Grammar, List, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    # Array returned from the branches of a match
+    siblings = Property(Self.parent.parent.match(
+        lambda g=T.Group: g.leaves,
+        lambda n: n.to_array,
+    ))
+
+
+class Number(FooNode):
+    tok = Field()
+
+
+class Name(FooNode):
+    tok = Field()
+
+
+class Group(FooNode):
+    items = Field()
+
+    # Array returned right away
+    leaves = Property(Self.items.filter(lambda i: Not(i.is_a(T.Group))))
+
+    # Arrays returned from the branches of a conditional
+    leaves_or_self = Property(If(
+        Self.leaves.length == 0, Self.cast(FooNode).to_array, Self.leaves
+    ))
+
+    # Array bound to a variable, which is then used several times
+    doubled_leaves = Property(Let(
+        lambda l=Self.leaves: If(l.length == 0, l, l.concat(l))
+    ))
+
+    # Arrays both bound by and returned from a "then" expression
+    parent_leaves = Property(Self.parent.parent.cast(T.Group).then(
+        lambda g: g.leaves,
+        default_val=Self.leaves
+    ))
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=','), ')'
+    ) ^ Group,
+    item=Or(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        Row(Tok(Token.Identifier, keep=True)) ^ Name,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
@@ -0,0 +1,71 @@
+"""
+Test that properties in which null and kind checks are statically known to
+pass compute the expected results.
+"""
+
+import os.path
+
+from langkit.compiled_types import ASTNode, Field, root_grammar_class, T
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import And, If, Not, Property, Self
+from langkit.parsers import Grammar, List, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    # The null test guards the field access
+    parent_depth = Property(If(Self.parent.is_null,
+                               0,
+                               Self.parent.parent_depth + 1),
+                            type=T.LongType)
+    has_grand_parent = Property(And(Not(Self.parent.is_null),
+                                    Not(Self.parent.parent.is_null)))
+    then_grand_parent = Property(
+        Self.parent.then(lambda p: Not(p.parent.is_null), default_val=False)
+    )
+
+    # The kind test guards the cast
+    siblings_count = Property(Self.parent.then(
+        lambda p: p.parent.then(
+            lambda gp: If(gp.is_a(T.Group), gp.cast(T.Group).items.length, 0),
+            default_val=0
+        ),
+        default_val=0
+    ))
+
+    # Matchers on Self never see a null node
+    size = Property(Self.match(
+        lambda g=T.Group: g.items.length,
+        lambda _: 1
+    ))
+
+
+class Number(FooNode):
+    tok = Field()
+
+
+class Group(FooNode):
+    items = Field()
+
+    # Upcasts always succeed
+    is_root = Property(Self.cast(T.FooNode).parent.is_null)
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Row(
+        '(', List(foo_grammar.item, sep=','), ')'
+    ) ^ Group,
+    item=Or(
+        Row(Tok(Token.Number, keep=True)) ^ Number,
+        foo_grammar.main_rule
+    ),
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
@@ -0,0 +1,19 @@
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+
+text = '1 + 2 + 3'
+u = ctx.get_from_buffer('main.txt', text)
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+print 'Evaluating {}'.format(text)
+for _ in range(2):
+    print 'literal_count = {}'.format(u.root.p_literal_count)
+print 'is_plus = {}'.format([n.p_is_plus for n in (u.root, u.root.f_left)])
+print 'literals = {}'.format([n.f_tok.text for n in u.root.p_literals])
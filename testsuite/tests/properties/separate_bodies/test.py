@@ -0,0 +1,58 @@
+"""
+Test that properties build and run properly when their bodies are emitted in
+separate units.
+"""
+
+import os.path
+
+from langkit.compiled_types import (
+    ASTNode, Field, LongType, T, abstract, root_grammar_class
+)
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import AbstractProperty, Property, Self
+from langkit.parsers import Grammar, Or, Row, Tok
+
+from lexer_example import Token
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    is_plus = Property(Self.is_a(T.Plus))
+
+
+@abstract
+class Expression(FooNode):
+    literal_count = AbstractProperty(type=LongType)
+
+
+class Literal(Expression):
+    tok = Field()
+
+    literal_count = Property(1)
+
+
+class Plus(Expression):
+    left = Field()
+    right = Field()
+
+    literal_count = Property(
+        Self.left.literal_count + Self.right.literal_count,
+        memoized=True
+    )
+    literals = Property(Self.children.filter(lambda c: c.is_a(Literal)))
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=Or(
+        Row(foo_grammar.atom, '+', foo_grammar.main_rule) ^ Plus,
+        foo_grammar.atom
+    ),
+    atom=Row(Tok(Token.Number, keep=True)) ^ Literal,
+)
+build_and_run(foo_grammar, 'main.py', separate_properties=True)
+print 'Done'
@@ -0,0 +1,27 @@
+print 'main.py: Running...'
+
+
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+u = ctx.get_from_buffer('main.txt', '(1, 2, 3)')
+if u.diagnostics:
+    for d in u.diagnostics:
+        print(d)
+    sys.exit(1)
+
+items = u.root.p_all_items
+print 'to_list: {}'.format([n.tok.text for n in items.to_list()])
+print 'iter: {}'.format([n.tok.text for n in items])
+print 'same wrappers: {}'.format(items.to_list()[1] == items[1])
+
+flags = u.root.p_first_flags
+print 'flags: {}'.format(flags.to_list())
+
+view = flags.as_memoryview()
+del flags
+print 'view: {} {}'.format(len(view), [ord(b) for b in view.tobytes()])
+print 'main.py: Done.'
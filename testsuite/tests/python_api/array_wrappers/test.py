@@ -0,0 +1,43 @@
+"""
+Test the bulk accessors of array wrappers in the Python API.
+"""
+
+import os.path
+
+from langkit.compiled_types import ASTNode, Field, root_grammar_class
+from langkit.diagnostics import Diagnostics
+from langkit.expressions import Property, Self
+from langkit.parsers import Grammar, List, Row, Tok
+
+from lexer_example import Token as LexToken
+from utils import build_and_run
+
+
+Diagnostics.set_lang_source_dir(os.path.abspath(__file__))
+
+
+@root_grammar_class()
+class FooNode(ASTNode):
+    pass
+
+
+class Literal(FooNode):
+    tok = Field()
+
+
+class LiteralSequence(FooNode):
+    items = Field()
+
+    all_items = Property(Self.items.map(lambda i: i))
+    first_flags = Property(Self.items.map(lambda i: i == Self.items.at(0)))
+
+
+foo_grammar = Grammar('main_rule')
+foo_grammar.add_rules(
+    main_rule=foo_grammar.list_rule,
+    list_rule=Row('(', List(foo_grammar.list_item, sep=','), ')')
+    ^ LiteralSequence,
+    list_item=Row(Tok(LexToken.Number, keep=True)) ^ Literal,
+)
+build_and_run(foo_grammar, 'main.py')
+print 'Done'
@@ -0,0 +1,24 @@
+print 'main.py: Running...'
+
+
+import libfoolang_batch
+
+
+def root_summary(unit):
+    root = unit.root
+    return (libfoolang_batch.snapshot(root),
+            [item.kind_name for item in root.f_items])
+
+
+sources = {'a.txt': '(1, 2)', 'b.txt': '(3)', 'c.txt': '(4, 5, 6)'}
+for filename, content in sources.items():
+    with open(filename, 'w') as f:
+        f.write(content)
+
+results = libfoolang_batch.analyze_files(sorted(sources), root_summary,
+                                         jobs=2, memory_limit=1)
+for filename, (snapshot, item_kinds) in sorted(results):
+    print '{}: {} {} {} {}'.format(filename, snapshot.kind_name,
+                                   snapshot.sloc_range, repr(snapshot.text),
+                                   item_kinds)
+print 'main.py: Done.'
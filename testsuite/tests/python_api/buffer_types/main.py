@@ -0,0 +1,39 @@
+print 'main.py: Running...'
+
+
+import array
+import mmap
+
+import libfoolang
+
+
+def mmap_buffer(content):
+    result = mmap.mmap(-1, len(content))
+    result.write(content)
+    return result
+
+
+ctx = libfoolang.AnalysisContext()
+for label, buf in [
+    ('str', '(1)'),
+    ('unicode', u'(1, 2)'),
+    ('bytearray', bytearray('(1, 2, 3)')),
+    ('buffer', buffer('xx(4)', 2)),
+    ('memoryview', memoryview('(5, 6)')),
+    ('array', array.array('c', '(7)')),
+    ('mmap', mmap_buffer('(8, 9)')),
+]:
+    u = ctx.get_from_buffer('main.txt', buf)
+    print '{}: {} {}'.format(label, bool(u.diagnostics), repr(u.root.text))
+
+u.reparse(bytearray('(10)'))
+print 'reparse: {} {}'.format(bool(u.diagnostics), repr(u.root.text))
+
+u = ctx.get_from_buffer('main.txt', '')
+print 'empty: {}'.format(bool(u.diagnostics))
+
+try:
+    ctx.get_from_buffer('main.txt', 42)
+except TypeError as exc:
+    print 'int: TypeError: {}'.format(exc)
+print 'main.py: Done.'
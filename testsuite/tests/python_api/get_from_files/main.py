@@ -0,0 +1,50 @@
+print 'main.py: Running...'
+
+
+import libfoolang
+
+
+sources = {'a.txt': '(1, 2)', 'b.txt': '(3', 'c.txt': '(4)'}
+for filename, content in sources.items():
+    with open(filename, 'w') as f:
+        f.write(content)
+
+ctx = libfoolang.AnalysisContext()
+filenames = ['a.txt', 'b.txt', 'c.txt', 'missing.txt']
+units = ctx.get_from_files(filenames)
+print 'Got {} units'.format(len(units))
+for filename, u in zip(filenames, units):
+    print '{}: has diagnostics: {}, root: {}'.format(
+        filename, bool(u.diagnostics),
+        u.root.text if u.root and not u.diagnostics else None
+    )
+
+print 'Empty batch: {}'.format(ctx.get_from_files([]))
+
+
+# Parse many files concurrently, some of them several times, and check that
+# the results match a sequential parsing.
+many = ['many_{}.txt'.format(i) for i in range(50)]
+for i, filename in enumerate(many):
+    with open(filename, 'w') as f:
+        f.write('({})'.format(', '.join(str(j) for j in range(i))))
+
+
+def texts(units):
+    return [u.root.text if u.root else None for u in units]
+
+
+seq_units = libfoolang.AnalysisContext().get_from_files(many)
+par_ctx = libfoolang.AnalysisContext()
+par_units = par_ctx.get_from_files(many + many[:5], jobs=4)
+print 'Concurrent parsing: {} units, same results: {}'.format(
+    len(par_units), texts(seq_units) == texts(par_units[:50])
+)
+print 'Duplicates give the same units: {}'.format(
+    all(u == v for u, v in zip(par_units[:5], par_units[50:]))
+)
+par_units = par_ctx.get_from_files(many, reparse=True, jobs=4)
+print 'Concurrent reparsing, same results: {}'.format(
+    texts(seq_units) == texts(par_units)
+)
+print 'main.py: Done.'
@@ -0,0 +1,22 @@
+print 'main.py: Running...'
+
+
+import json
+import sys
+
+import libfoolang
+
+
+ctx = libfoolang.AnalysisContext()
+for text in ('(main 1, 2)', '(3)'):
+    u = ctx.get_from_buffer('main.txt', text)
+    if u.diagnostics:
+        for d in u.diagnostics:
+            print(d)
+        sys.exit(1)
+
+    print '{}:'.format(text)
+    print '  {}'.format(json.dumps(json.loads(u.root.to_json()),
+                                   sort_keys=True))
+    print '  {}'.format(json.dumps(u.root.to_data(), sort_keys=True))
+print 'main.py: Done.'